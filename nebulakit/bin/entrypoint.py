@@ -8,7 +8,7 @@ import signal
 import subprocess
 import tempfile
 import traceback as _traceback
-from typing import List, Optional
+from typing import Dict, List, Optional, cast
 
 import click as _click
 from nebulaidl.core import literals_pb2 as _literals_pb2
@@ -21,12 +21,13 @@ from nebulakit.configuration import (
 )
 from nebulakit.core import constants as _constants
 from nebulakit.core import utils
-from nebulakit.core.array_node_map_task import ArrayNodeMapTaskResolver
+from nebulakit.core.array_node_map_task import ArrayNodeMapTask, ArrayNodeMapTaskResolver
 from nebulakit.core.base_task import IgnoreOutputs, PythonTask
 from nebulakit.core.checkpointer import SyncCheckpoint
 from nebulakit.core.context_manager import ExecutionParameters, ExecutionState, NebulaContext, NebulaContextManager
 from nebulakit.core.data_persistence import FileAccessProvider
-from nebulakit.core.map_task import MapTaskResolver
+from nebulakit.core.local_executor import POOL_KINDS, ContextPool
+from nebulakit.core.map_task import MapPythonTask, MapTaskResolver, map_element
 from nebulakit.core.promise import VoidPromise
 from nebulakit.deck.deck import _output_deck
 from nebulakit.exceptions import scopes as _scoped_exceptions
@@ -41,6 +42,7 @@ from nebulakit.models.core import execution as _execution_models
 from nebulakit.models.core import identifier as _identifier
 from nebulakit.tools.fast_registration import download_distribution as _download_distribution
 from nebulakit.tools.module_loader import load_object_from_module
+from nebulakit.types.file.file import get_streaming
 
 
 def get_version_message():
@@ -65,29 +67,61 @@ def _compute_array_job_index():
     return offset
 
 
+def _prefetch_inputs(ctx: NebulaContext, task_def: PythonTask, input_literals: _literal_models.LiteralMap):
+    """
+    Downloads the files and directories referenced by the inputs concurrently, so that the type transformers find
+    them on local disk instead of downloading them one at a time.
+    """
+    if not ctx.file_access.data_config.prefetch_inputs:
+        return
+    # Map tasks receive the inputs of every element but only consume one of them
+    if isinstance(task_def, (MapPythonTask, ArrayNodeMapTask)):
+        return
+    paths: Dict[str, bool] = {}
+    input_types = task_def.python_interface.inputs
+    for name, literal in input_literals.literals.items():
+        # Streaming files are read in ranges when opened, downloading them would defeat the purpose
+        if name in input_types and get_streaming(input_types[name]) is not None:
+            continue
+        FileAccessProvider.collect_remote_paths(literal, paths)
+    if paths:
+        ctx.file_access.prefetch(paths)
+
+
+def _load_input_literals(ctx: NebulaContext, inputs_path: str) -> _literal_models.LiteralMap:
+    local_inputs_file = os.path.join(ctx.execution_state.working_dir, "inputs.pb")
+    ctx.file_access.get_data(inputs_path, local_inputs_file)
+    input_proto = utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
+    return _literal_models.LiteralMap.from_nebula_idl(input_proto)
+
+
 def _dispatch_execute(
     ctx: NebulaContext,
     task_def: PythonTask,
     inputs_path: str,
     output_prefix: str,
-):
+    input_literals: Optional[_literal_models.LiteralMap] = None,
+    exit_on_error: bool = True,
+) -> bool:
     """
     Dispatches execute to PythonTask
-        Step1: Download inputs and load into a literal map
+        Step1: Download inputs and load into a literal map, unless input_literals are already provided
         Step2: Invoke task - dispatch_execute
         Step3:
             a: [Optional] Record outputs to output_prefix
             b: OR if IgnoreOutputs is raised, then ignore uploading outputs
             c: OR if an unhandled exception is retrieved - record it as an errors.pb
+
+    Returns whether an error was recorded.
     """
     output_file_dict = {}
     logger.debug(f"Starting _dispatch_execute for {task_def.name}")
     try:
         # Step1
-        local_inputs_file = os.path.join(ctx.execution_state.working_dir, "inputs.pb")
-        ctx.file_access.get_data(inputs_path, local_inputs_file)
-        input_proto = utils.load_proto_from_file(_literals_pb2.LiteralMap, local_inputs_file)
-        idl_input_literals = _literal_models.LiteralMap.from_nebula_idl(input_proto)
+        idl_input_literals = input_literals
+        if idl_input_literals is None:
+            idl_input_literals = _load_input_literals(ctx, inputs_path)
+            _prefetch_inputs(ctx, task_def, idl_input_literals)
 
         # Step2
         # Decorate the dispatch execute function before calling it, this wraps all exceptions into one
@@ -121,7 +155,7 @@ def _dispatch_execute(
     except _scoped_exceptions.NebulaScopedUserException as e:
         if isinstance(e.value, IgnoreOutputs):
             logger.warning(f"User-scoped IgnoreOutputs received! Outputs.pb will not be uploaded. reason {e}!!")
-            return
+            return False
         output_file_dict[_constants.ERROR_FILE_NAME] = _error_models.ErrorDocument(
             _error_models.ContainerError(
                 e.error_code, e.verbose_message, e.kind, _execution_models.ExecutionError.ErrorKind.USER
@@ -135,7 +169,7 @@ def _dispatch_execute(
     except _scoped_exceptions.NebulaScopedSystemException as e:
         if isinstance(e.value, IgnoreOutputs):
             logger.warning(f"System-scoped IgnoreOutputs received! Outputs.pb will not be uploaded. reason {e}!!")
-            return
+            return False
         output_file_dict[_constants.ERROR_FILE_NAME] = _error_models.ErrorDocument(
             _error_models.ContainerError(
                 e.error_code, e.verbose_message, e.kind, _execution_models.ExecutionError.ErrorKind.SYSTEM
@@ -174,11 +208,56 @@ def _dispatch_execute(
 
     logger.debug("Finished _dispatch_execute")
 
-    if os.environ.get("NEBULA_FAIL_ON_ERROR", "").lower() == "true" and _constants.ERROR_FILE_NAME in output_file_dict:
+    has_error = _constants.ERROR_FILE_NAME in output_file_dict
+    if exit_on_error and has_error and os.environ.get("NEBULA_FAIL_ON_ERROR", "").lower() == "true":
         # This env is set by the nebulapropeller
         # AWS batch job get the status from the exit code, so once we catch the error,
         # we should return the error code here
         exit(1)
+    return has_error
+
+
+def _dispatch_execute_map_chunk(
+    ctx: NebulaContext,
+    task_def: MapPythonTask,
+    inputs_path: str,
+    output_prefix: str,
+    chunk_index: int,
+):
+    """
+    Dispatches execute for the contiguous chunk of map task elements assigned to the array job ``chunk_index``.
+    Inputs are downloaded once and the elements run concurrently, each with its own working directory, writing its
+    outputs to ``output_prefix/<element index>`` exactly as if it had run in an array job of its own.
+    """
+    input_literals = _load_input_literals(ctx, inputs_path)
+    n_elements = 0
+    for k, lit in input_literals.literals.items():
+        if k not in task_def.bound_inputs and lit.collection is not None:
+            n_elements = len(lit.collection.literals)
+            break
+    chunk_size = cast(int, task_def.chunk_size)
+    element_indices = range(chunk_index * chunk_size, min((chunk_index + 1) * chunk_size, n_elements))
+    logger.info(f"Executing elements {list(element_indices)} of map task {task_def.name}")
+
+    def _run_element(element_index: int) -> bool:
+        working_dir = ctx.file_access.get_random_local_directory()
+        engine_dir = os.path.join(working_dir, "engine_dir")
+        es = ctx.execution_state.with_params(working_dir=working_dir, engine_dir=engine_dir)
+        with NebulaContextManager.with_context(ctx.with_execution_state(es)) as element_ctx, map_element(element_index):
+            return _dispatch_execute(
+                element_ctx,
+                task_def,
+                inputs_path,
+                os.path.join(output_prefix, str(element_index)),
+                input_literals=input_literals,
+                exit_on_error=False,
+            )
+
+    with ContextPool(_run_element, kind=task_def.chunk_executor) as pool:
+        errors = pool.map(element_indices)
+
+    if any(errors) and os.environ.get("NEBULA_FAIL_ON_ERROR", "").lower() == "true":
+        exit(1)
 
 
 def get_one_of(*args) -> str:
@@ -385,6 +464,8 @@ def _execute_map_task(
     dynamic_addl_distro: Optional[str] = None,
     dynamic_dest_dir: Optional[str] = None,
     experimental: Optional[bool] = False,
+    chunk_size: Optional[int] = None,
+    chunk_executor: str = "thread",
 ):
     """
     This function should be called by map task and aws-batch task
@@ -401,6 +482,8 @@ def _execute_map_task(
     :param resolver: The task resolver to use. This needs to be loadable directly from importlib (and thus cannot be
       nested).
     :param resolver_args: Args that will be passed to the aforementioned resolver's load_task function
+    :param chunk_size: If set, the array job processes this many contiguous elements instead of a single one
+    :param chunk_executor: Either "thread" or "process", the pool used to run the elements of a chunk
     :return:
     """
     if len(resolver_args) < 1:
@@ -413,8 +496,10 @@ def _execute_map_task(
         if experimental:
             mtr = ArrayNodeMapTaskResolver()
         else:
-            mtr = MapTaskResolver()
-            output_prefix = os.path.join(output_prefix, str(task_index))
+            mtr = MapTaskResolver(chunk_size=chunk_size, chunk_executor=chunk_executor)
+            # When chunked, every element of the chunk writes to its own index under the output prefix
+            if not chunk_size:
+                output_prefix = os.path.join(output_prefix, str(task_index))
 
         map_task = mtr.load_task(loader_args=resolver_args, max_concurrency=max_concurrency)
 
@@ -426,7 +511,10 @@ def _execute_map_task(
             )
             return
 
-        _handle_annotated_task(ctx, map_task, inputs, output_prefix)
+        if chunk_size and not experimental:
+            _dispatch_execute_map_chunk(ctx, map_task, inputs, output_prefix, task_index)
+        else:
+            _handle_annotated_task(ctx, map_task, inputs, output_prefix)
 
 
 def normalize_inputs(
@@ -550,6 +638,8 @@ def fast_execute_task_cmd(additional_distribution: str, dest_dir: str, task_exec
 @_click.option("--checkpoint-path", required=False)
 @_click.option("--prev-checkpoint", required=False)
 @_click.option("--experimental", is_flag=True, default=False, required=False)
+@_click.option("--chunk-size", type=int, required=False)
+@_click.option("--chunk-executor", type=_click.Choice(POOL_KINDS), default="thread", required=False)
 @_click.argument(
     "resolver-args",
     type=_click.UNPROCESSED,
@@ -568,6 +658,8 @@ def map_execute_task_cmd(
     prev_checkpoint,
     experimental,
     checkpoint_path,
+    chunk_size,
+    chunk_executor,
 ):
     logger.info(get_version_message())
 
@@ -588,6 +680,8 @@ def map_execute_task_cmd(
         checkpoint_path=checkpoint_path,
         prev_checkpoint=prev_checkpoint,
         experimental=experimental,
+        chunk_size=chunk_size,
+        chunk_executor=chunk_executor,
     )
 
 
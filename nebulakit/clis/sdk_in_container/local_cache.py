@@ -19,4 +19,17 @@ def clear_local_cache():
     LocalTaskCache.clear()
 
 
+@click.command("stats")
+def local_cache_stats():
+    """
+    This command will print the number of entries, the size and the hits and misses of the local cache.
+    """
+    stats = LocalTaskCache.stats()
+    click.echo(f"Entries: {stats.entries}")
+    click.echo(f"Size: {stats.size_bytes} bytes")
+    click.echo(f"Hits: {stats.hits}")
+    click.echo(f"Misses: {stats.misses}")
+
+
 local_cache.add_command(clear_local_cache)
+local_cache.add_command(local_cache_stats)
@@ -117,6 +117,35 @@ the root of your project, it finds the first folder that does not have a ``__ini
     callback=key_value_callback,
     help="Environment variables to set in the container, of the format `ENV_NAME=ENV_VALUE`",
 )
+@click.option(
+    "--concurrency",
+    required=False,
+    type=int,
+    default=16,
+    help="Maximum number of entities registered at the same time. Entities are registered after their dependencies",
+)
+@click.option(
+    "--retries",
+    required=False,
+    type=int,
+    default=3,
+    help="Number of times the registration of an entity is retried after a transient failure",
+)
+@click.option(
+    "--skip-unchanged",
+    default=False,
+    is_flag=True,
+    help="Skip the entities registered from this machine with the same version whose spec did not change since, and "
+    "the modules whose source did not change. Mostly useful with an explicit --version",
+)
+@click.option(
+    "--manifest-dir",
+    required=False,
+    type=click.Path(file_okay=False),
+    default=None,
+    help="Directory of the manifests of the entities registered, used by --skip-unchanged. Defaults to "
+    "~/.nebula/registrations",
+)
 @click.argument("package-or-module", type=click.Path(exists=True, readable=True, resolve_path=True), nargs=-1)
 @click.pass_context
 def register(
@@ -135,6 +164,10 @@ def register(
     dry_run: bool,
     activate_launchplans: bool,
     env: typing.Optional[typing.Dict[str, str]],
+    concurrency: int,
+    retries: int,
+    skip_unchanged: bool,
+    manifest_dir: typing.Optional[str],
 ):
     """
     see help
@@ -187,6 +220,10 @@ def register(
             env=env,
             dry_run=dry_run,
             activate_launchplans=activate_launchplans,
+            concurrency=concurrency,
+            retries=retries,
+            skip_unchanged=skip_unchanged,
+            manifest_dir=manifest_dir,
         )
     except Exception as e:
         raise e
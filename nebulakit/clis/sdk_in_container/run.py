@@ -6,7 +6,7 @@ import os
 import pathlib
 import tempfile
 import typing
-from dataclasses import dataclass, field, fields
+from dataclasses import dataclass, field, fields, replace
 from typing import cast, get_args
 
 import rich_click as click
@@ -23,10 +23,17 @@ from nebulakit.clis.sdk_in_container.utils import (
     pretty_print_exception,
     project_option,
 )
-from nebulakit.configuration import DefaultImages, FastSerializationSettings, ImageConfig, SerializationSettings
+from nebulakit.configuration import (
+    DefaultImages,
+    FastSerializationSettings,
+    ImageConfig,
+    LocalExecutionConfig,
+    SerializationSettings,
+)
 from nebulakit.core import context_manager
 from nebulakit.core.base_task import PythonTask
 from nebulakit.core.data_persistence import FileAccessProvider
+from nebulakit.core.local_executor import POOL_KINDS, LocalExecutor
 from nebulakit.core.type_engine import TypeEngine
 from nebulakit.core.workflow import PythonFunctionWorkflow, WorkflowBase
 from nebulakit.exceptions.system import NebulaSystemException
@@ -133,6 +140,25 @@ class RunLevelParams(PyNebulaParams):
             help="Whether to overwrite the cache if it already exists",
         )
     )
+    local_executor: typing.Optional[str] = make_click_option_field(
+        click.Option(
+            param_decls=["--local-executor", "local_executor"],
+            required=False,
+            type=click.Choice(["serial", *POOL_KINDS]),
+            default=None,
+            help="For local executions, whether to run the elements of map tasks and the independent nodes of"
+            " workflows concurrently in threads or processes. Defaults to the local_execution configuration.",
+        )
+    )
+    local_max_workers: typing.Optional[int] = make_click_option_field(
+        click.Option(
+            param_decls=["--local-max-workers", "local_max_workers"],
+            required=False,
+            type=int,
+            default=None,
+            help="For local executions, the maximum number of map task elements or workflow nodes run concurrently.",
+        )
+    )
     envvars: typing.Dict[str, str] = make_click_option_field(
         click.Option(
             param_decls=["--envvars", "--env"],
@@ -488,6 +514,16 @@ def _update_nebula_context(params: RunLevelParams) -> NebulaContext.Builder:
         return ctx_builder.with_file_access(file_access)
 
 
+def _initialize_local_executor(params: RunLevelParams):
+    overrides: typing.Dict[str, typing.Any] = {}
+    if params.local_executor is not None:
+        overrides["executor"] = params.local_executor
+    if params.local_max_workers is not None:
+        overrides["max_workers"] = params.local_max_workers
+    if overrides:
+        LocalExecutor.initialize(replace(LocalExecutionConfig.auto(), **overrides))
+
+
 def run_command(ctx: click.Context, entity: typing.Union[PythonFunctionWorkflow, PythonTask]):
     """
     Returns a function that is used to implement WorkflowCommand and execute a nebula workflow.
@@ -510,6 +546,7 @@ def run_command(ctx: click.Context, entity: typing.Union[PythonFunctionWorkflow,
                 inputs[input_name] = kwargs.get(input_name)
 
             if not run_level_params.is_remote:
+                _initialize_local_executor(run_level_params)
                 with NebulaContextManager.with_context(_update_nebula_context(run_level_params)):
                     output = entity(**inputs)
                     if inspect.iscoroutine(output):
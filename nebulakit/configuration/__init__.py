@@ -126,6 +126,8 @@ credentials, secrets, and statsd metrics.
    ~S3Config
    ~GCSConfig
    ~DataConfig
+   ~LocalCacheConfig
+   ~LocalExecutionConfig
 
 """
 from __future__ import annotations
@@ -518,6 +520,76 @@ class SecretsConfig(object):
         return SecretsConfig(**kwargs)
 
 
+@dataclass(init=True, repr=True, eq=True, frozen=True)
+class LocalCacheConfig(object):
+    """
+    Configuration of the cache used by local executions of tasks marked with ``cache=True``.
+
+    :param backend: "disk" to persist results across runs under ``location``, or "memory" to keep them in-process
+    :param location: Directory used by the disk backend
+    :param max_size_bytes: Size of the cache above which entries are evicted
+    :param eviction_policy: One of "least-recently-stored", "least-recently-used", "least-frequently-used" or "none"
+    :param ttl_seconds: If set, entries expire this many seconds after being stored
+    :param prune_old_versions: Whether storing a result for a new cache version of a task evicts the entries of the
+      version it replaces
+    :param content_addressed: Whether inputs referencing offloaded data (files, directories, structured datasets,
+      pickles) contribute the digest of that data to cache keys, instead of its uri
+    """
+
+    backend: str = "disk"
+    location: str = "~/.nebula/local-cache"
+    max_size_bytes: int = 2**30
+    eviction_policy: str = "least-recently-used"
+    ttl_seconds: typing.Optional[int] = None
+    prune_old_versions: bool = True
+    content_addressed: bool = False
+
+    @classmethod
+    def auto(cls, config_file: typing.Union[str, ConfigFile] = None) -> LocalCacheConfig:
+        """
+        Reads from environment variable or from config file
+        :param config_file:
+        :return:
+        """
+        config_file = get_config_file(config_file)
+        kwargs = {}
+        kwargs = set_if_exists(kwargs, "backend", _internal.LocalCache.BACKEND.read(config_file))
+        kwargs = set_if_exists(kwargs, "location", _internal.LocalCache.LOCATION.read(config_file))
+        kwargs = set_if_exists(kwargs, "max_size_bytes", _internal.LocalCache.MAX_SIZE_BYTES.read(config_file))
+        kwargs = set_if_exists(kwargs, "eviction_policy", _internal.LocalCache.EVICTION_POLICY.read(config_file))
+        kwargs = set_if_exists(kwargs, "ttl_seconds", _internal.LocalCache.TTL_SECONDS.read(config_file))
+        kwargs = set_if_exists(kwargs, "prune_old_versions", _internal.LocalCache.PRUNE_OLD_VERSIONS.read(config_file))
+        kwargs = set_if_exists(kwargs, "content_addressed", _internal.LocalCache.CONTENT_ADDRESSED.read(config_file))
+        return LocalCacheConfig(**kwargs)
+
+
+@dataclass(init=True, repr=True, eq=True, frozen=True)
+class LocalExecutionConfig(object):
+    """
+    Configuration of local executions of workflows and map tasks.
+
+    :param executor: "serial" to run everything in program order, "thread" or "process" to run the elements of map
+      tasks and the independent nodes of workflows concurrently in a pool of threads or of forked processes
+    :param max_workers: Size of the pool, defaults to the number of CPUs
+    """
+
+    executor: str = "serial"
+    max_workers: typing.Optional[int] = None
+
+    @classmethod
+    def auto(cls, config_file: typing.Union[str, ConfigFile] = None) -> LocalExecutionConfig:
+        """
+        Reads from environment variable or from config file
+        :param config_file:
+        :return:
+        """
+        config_file = get_config_file(config_file)
+        kwargs = {}
+        kwargs = set_if_exists(kwargs, "executor", _internal.LocalExecution.EXECUTOR.read(config_file))
+        kwargs = set_if_exists(kwargs, "max_workers", _internal.LocalExecution.MAX_WORKERS.read(config_file))
+        return LocalExecutionConfig(**kwargs)
+
+
 @dataclass(init=True, repr=True, eq=True, frozen=True)
 class S3Config(object):
     """
@@ -530,6 +602,7 @@ class S3Config(object):
     backoff: datetime.timedelta = datetime.timedelta(seconds=5)
     access_key_id: typing.Optional[str] = None
     secret_access_key: typing.Optional[str] = None
+    max_pool_connections: typing.Optional[int] = None
 
     @classmethod
     def auto(cls, config_file: typing.Union[str, ConfigFile] = None) -> S3Config:
@@ -546,6 +619,7 @@ class S3Config(object):
         kwargs = set_if_exists(kwargs, "backoff", _internal.AWS.BACKOFF_SECONDS.read(config_file))
         kwargs = set_if_exists(kwargs, "access_key_id", _internal.AWS.S3_ACCESS_KEY_ID.read(config_file))
         kwargs = set_if_exists(kwargs, "secret_access_key", _internal.AWS.S3_SECRET_ACCESS_KEY.read(config_file))
+        kwargs = set_if_exists(kwargs, "max_pool_connections", _internal.AWS.MAX_POOL_CONNECTIONS.read(config_file))
         return S3Config(**kwargs)
 
 
@@ -600,14 +674,48 @@ class DataConfig(object):
     s3: S3Config = S3Config()
     gcs: GCSConfig = GCSConfig()
     azure: AzureBlobStorageConfig = AzureBlobStorageConfig()
+    max_concurrent_transfers: int = 8
+    prefetch_inputs: bool = False
+    iterator_read_ahead: int = 0
+    part_size: int = 64 * 1024 * 1024
+    max_parts_in_flight: int = 8
+    max_bandwidth: int = 0
+    shared_cache_dir: typing.Optional[str] = None
+    shared_cache_size_limit: int = 10 * 1024 * 1024 * 1024
+    directory_batch_size: int = 128
+    streaming_block_size: int = 1024 * 1024
+    streaming_cache_type: str = "readahead"
+    structured_dataset_format: str = ""
+    pack_pickles: bool = False
 
     @classmethod
     def auto(cls, config_file: typing.Union[str, ConfigFile] = None) -> DataConfig:
         config_file = get_config_file(config_file)
+        kwargs = {}
+        kwargs = set_if_exists(
+            kwargs, "max_concurrent_transfers", _internal.Data.MAX_CONCURRENT_TRANSFERS.read(config_file)
+        )
+        kwargs = set_if_exists(kwargs, "prefetch_inputs", _internal.Data.PREFETCH_INPUTS.read(config_file))
+        kwargs = set_if_exists(kwargs, "iterator_read_ahead", _internal.Data.ITERATOR_READ_AHEAD.read(config_file))
+        kwargs = set_if_exists(kwargs, "part_size", _internal.Data.PART_SIZE.read(config_file))
+        kwargs = set_if_exists(kwargs, "max_parts_in_flight", _internal.Data.MAX_PARTS_IN_FLIGHT.read(config_file))
+        kwargs = set_if_exists(kwargs, "max_bandwidth", _internal.Data.MAX_BANDWIDTH.read(config_file))
+        kwargs = set_if_exists(kwargs, "shared_cache_dir", _internal.Data.SHARED_CACHE_DIR.read(config_file))
+        kwargs = set_if_exists(
+            kwargs, "shared_cache_size_limit", _internal.Data.SHARED_CACHE_SIZE_LIMIT.read(config_file)
+        )
+        kwargs = set_if_exists(kwargs, "directory_batch_size", _internal.Data.DIRECTORY_BATCH_SIZE.read(config_file))
+        kwargs = set_if_exists(kwargs, "streaming_block_size", _internal.Data.STREAMING_BLOCK_SIZE.read(config_file))
+        kwargs = set_if_exists(kwargs, "streaming_cache_type", _internal.Data.STREAMING_CACHE_TYPE.read(config_file))
+        kwargs = set_if_exists(
+            kwargs, "structured_dataset_format", _internal.Data.STRUCTURED_DATASET_FORMAT.read(config_file)
+        )
+        kwargs = set_if_exists(kwargs, "pack_pickles", _internal.Data.PACK_PICKLES.read(config_file))
         return DataConfig(
             azure=AzureBlobStorageConfig.auto(config_file),
             s3=S3Config.auto(config_file),
             gcs=GCSConfig.auto(config_file),
+            **kwargs,
         )
 
 
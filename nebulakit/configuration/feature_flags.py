@@ -14,3 +14,10 @@ class FeatureFlags:
      "." -> Assuming current directory as the root
      or an actual path -> path to the root, this will be used to locate the root.
     """
+
+    NEBULA_PROTO_BACKED_LITERALS = _get("NEBULA_PROTO_BACKED_LITERALS", "false").lower() == "true"
+    """
+    If true, literal models parsed from protobuf (Literal, Scalar, Primitive, LiteralCollection and LiteralMap) are
+    lazy views over the original message instead of eagerly decoded copies. Untouched values are then handed back to
+    protobuf without being rebuilt.
+    """
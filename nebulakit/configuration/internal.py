@@ -50,6 +50,7 @@ class AWS(object):
         LegacyConfigEntry(SECTION, "backoff_seconds", datetime.timedelta),
         transform=lambda x: datetime.timedelta(seconds=int(x)),
     )
+    MAX_POOL_CONNECTIONS = ConfigEntry(LegacyConfigEntry(SECTION, "max_pool_connections", int))
 
 
 class GCP(object):
@@ -66,6 +67,83 @@ class AZURE(object):
     CLIENT_SECRET = ConfigEntry(LegacyConfigEntry(SECTION, "client_secret"))
 
 
+class Data(object):
+    SECTION = "data"
+    MAX_CONCURRENT_TRANSFERS = ConfigEntry(LegacyConfigEntry(SECTION, "max_concurrent_transfers", int))
+    """
+    Maximum number of blobs that are downloaded or uploaded concurrently when a task prefetches its inputs or offloads
+    its outputs.
+    """
+
+    PREFETCH_INPUTS = ConfigEntry(LegacyConfigEntry(SECTION, "prefetch_inputs", bool))
+    """
+    If true, all files and directories referenced by the inputs of a task are downloaded concurrently before the task
+    runs, instead of lazily and one at a time when they are first accessed.
+    """
+
+    PART_SIZE = ConfigEntry(LegacyConfigEntry(SECTION, "part_size", int))
+    """
+    Size in bytes of the parts that single files larger than this are split into when downloaded from or uploaded to
+    the object store. 0 disables splitting.
+    """
+
+    MAX_PARTS_IN_FLIGHT = ConfigEntry(LegacyConfigEntry(SECTION, "max_parts_in_flight", int))
+    """
+    Maximum number of parts of a single file that are transferred concurrently.
+    """
+
+    MAX_BANDWIDTH = ConfigEntry(LegacyConfigEntry(SECTION, "max_bandwidth", int))
+    """
+    Maximum throughput in bytes per second of the files transferred in parts. 0 means unlimited.
+    """
+
+    SHARED_CACHE_DIR = ConfigEntry(LegacyConfigEntry(SECTION, "shared_cache_dir"))
+    """
+    Directory of a read-through cache of the remote files and directories downloaded by tasks, e.g. a hostPath volume
+    shared by all the pods of a node. Unset disables the cache.
+    """
+
+    SHARED_CACHE_SIZE_LIMIT = ConfigEntry(LegacyConfigEntry(SECTION, "shared_cache_size_limit", int))
+    """
+    Size in bytes past which the least recently used entries of the shared cache are evicted. 0 means unlimited.
+    """
+
+    DIRECTORY_BATCH_SIZE = ConfigEntry(LegacyConfigEntry(SECTION, "directory_batch_size", int))
+    """
+    Maximum number of files of a directory that are downloaded or uploaded concurrently, unless the directory type is
+    annotated with a BatchSize.
+    """
+
+    STREAMING_BLOCK_SIZE = ConfigEntry(LegacyConfigEntry(SECTION, "streaming_block_size", int))
+    """
+    Size in bytes of the ranges read from the object store by files opened for streaming.
+    """
+
+    STREAMING_CACHE_TYPE = ConfigEntry(LegacyConfigEntry(SECTION, "streaming_cache_type"))
+    """
+    fsspec cache of the files opened for streaming, e.g. ``readahead`` for mostly sequential reads or ``blockcache``
+    for reads at scattered offsets.
+    """
+
+    ITERATOR_READ_AHEAD = ConfigEntry(LegacyConfigEntry(SECTION, "iterator_read_ahead", int))
+    """
+    Number of upcoming elements of an iterator input whose files and directories are downloaded in the background
+    while the current element is consumed. 0 disables read-ahead.
+    """
+
+    STRUCTURED_DATASET_FORMAT = ConfigEntry(LegacyConfigEntry(SECTION, "structured_dataset_format"))
+    """
+    Format that dataframes are written in when their type does not specify one, e.g. ``arrow_ipc`` for fast handoff
+    of intermediate results. Dataframe types without an encoder for it keep their default format.
+    """
+
+    PACK_PICKLES = ConfigEntry(LegacyConfigEntry(SECTION, "pack_pickles", bool))
+    """
+    Packs the pickled elements of lists and dicts into a single blob per collection, referenced as
+    ``<blob>#segment=<index>``. Such references can only be read by versions of nebulakit that support them.
+    """
+
+
 class Credentials(object):
     SECTION = "credentials"
     COMMAND = ConfigEntry(LegacyConfigEntry(SECTION, "command", list), YamlConfigEntry("admin.command", list))
@@ -166,6 +244,59 @@ class LocalSDK(object):
     """
 
 
+class LocalCache(object):
+    SECTION = "local_cache"
+    BACKEND = ConfigEntry(LegacyConfigEntry(SECTION, "backend"))
+    """
+    Either "disk", to persist cached results of local executions across runs, or "memory" to keep them in-process.
+    """
+
+    LOCATION = ConfigEntry(LegacyConfigEntry(SECTION, "location"))
+    """
+    Directory where the disk backend stores the cached results.
+    """
+
+    MAX_SIZE_BYTES = ConfigEntry(LegacyConfigEntry(SECTION, "max_size_bytes", int))
+    """
+    Size of the cache above which entries are evicted according to the eviction policy.
+    """
+
+    EVICTION_POLICY = ConfigEntry(LegacyConfigEntry(SECTION, "eviction_policy"))
+    """
+    One of "least-recently-stored", "least-recently-used", "least-frequently-used" or "none".
+    """
+
+    TTL_SECONDS = ConfigEntry(LegacyConfigEntry(SECTION, "ttl_seconds", int))
+    """
+    If set, cached results expire this many seconds after being stored.
+    """
+
+    PRUNE_OLD_VERSIONS = ConfigEntry(LegacyConfigEntry(SECTION, "prune_old_versions", bool))
+    """
+    Whether caching a result for a new cache_version of a task drops the results cached for its previous version.
+    """
+
+    CONTENT_ADDRESSED = ConfigEntry(LegacyConfigEntry(SECTION, "content_addressed", bool))
+    """
+    If true, cache keys of inputs that reference files, directories, structured datasets or pickles are computed from
+    the contents of the referenced data instead of its uri.
+    """
+
+
+class LocalExecution(object):
+    SECTION = "local_execution"
+    EXECUTOR = ConfigEntry(LegacyConfigEntry(SECTION, "executor"))
+    """
+    One of "serial", "thread" or "process". With "thread" or "process", local executions run the elements of map tasks
+    and the independent nodes of workflows concurrently.
+    """
+
+    MAX_WORKERS = ConfigEntry(LegacyConfigEntry(SECTION, "max_workers", int))
+    """
+    Maximum number of map task elements or workflow nodes executed concurrently, defaults to the number of CPUs.
+    """
+
+
 class Secrets(object):
     SECTION = "secrets"
     # Secrets management
@@ -12,6 +12,7 @@ from nebulakit.core import tracker
 from nebulakit.core.base_task import PythonTask, TaskResolverMixin
 from nebulakit.core.context_manager import ExecutionState, NebulaContext, NebulaContextManager
 from nebulakit.core.interface import transform_interface_to_list_interface
+from nebulakit.core.local_executor import LocalExecutor
 from nebulakit.core.python_function_task import PythonFunctionTask, PythonInstanceTask
 from nebulakit.core.utils import timeit
 from nebulakit.exceptions import scopes as exception_scopes
@@ -284,6 +285,7 @@ class ArrayNodeMapTask(PythonTask):
         elif self._min_success_ratio:
             min_successes = math.ceil(min_successes * self._min_success_ratio)
 
+        instances_inputs = []
         for i in range(mapped_tasks_count):
             single_instance_inputs = {}
             for k in self.interface.inputs.keys():
@@ -292,8 +294,13 @@ class ArrayNodeMapTask(PythonTask):
                     single_instance_inputs[k] = kwargs[k][i]
                 else:
                     single_instance_inputs[k] = kwargs[k]
+            instances_inputs.append(single_instance_inputs)
+
+        # The instances run concurrently if local executions are configured to be parallel, see LocalExecutor
+        run_task = exception_scopes.user_entry_point(self._run_task.execute)
+        for get_output in LocalExecutor.map_kwargs(run_task, instances_inputs):
             try:
-                o = exception_scopes.user_entry_point(self._run_task.execute)(**single_instance_inputs)
+                o = get_output()
                 if outputs_expected:
                     outputs.append(o)
             except Exception as exc:
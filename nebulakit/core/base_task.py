@@ -19,9 +19,11 @@
 import asyncio
 import collections
 import datetime
+import functools
 import inspect
 import warnings
 from abc import abstractmethod
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from typing import Any, Coroutine, Dict, Generic, List, Optional, OrderedDict, Tuple, Type, TypeVar, Union, cast
 
@@ -58,6 +60,7 @@ from nebulakit.models.core import workflow as _workflow_model
 from nebulakit.models.documentation import Description, Documentation
 from nebulakit.models.interface import Variable
 from nebulakit.models.security import SecurityContext
+from nebulakit.models.types import LiteralType
 
 
 def kwtypes(**kwargs) -> OrderedDict[str, Type]:
@@ -74,6 +77,20 @@ def kwtypes(**kwargs) -> OrderedDict[str, Type]:
     return d
 
 
+def _is_offloaded(literal_type: Optional[LiteralType]) -> bool:
+    """
+    Returns True if values of literal_type are written to the blob store when converted to literals, i.e. files,
+    directories, structured datasets and pickles, or collections of them.
+    """
+    if literal_type is None:
+        return False
+    if literal_type.blob is not None or literal_type.structured_dataset_type is not None:
+        return True
+    if literal_type.union_type is not None:
+        return any(_is_offloaded(v) for v in literal_type.union_type.variants)
+    return _is_offloaded(literal_type.collection_type) or _is_offloaded(literal_type.map_value_type)
+
+
 @dataclass
 class TaskMetadata(object):
     """
@@ -548,15 +565,34 @@ class PythonTask(TrackedInstance, Task, Generic[T]):
         # We manually construct a LiteralMap here because task inputs and outputs actually violate the assumption
         # built into the IDL that all the values of a literal map are of the same type.
         with timeit("Translate the output to literals"):
-            literals = {}
-            for i, (k, v) in enumerate(native_outputs_as_map.items()):
+            conversions = {}
+            for k, v in native_outputs_as_map.items():
                 literal_type = self._outputs_interface[k].type
                 py_type = self.get_type_for_output_var(k, v)
 
                 if isinstance(v, tuple):
                     raise TypeError(f"Output({k}) in task '{self.name}' received a tuple {v}, instead of {py_type}")
+                conversions[k] = (v, py_type, literal_type)
+
+            # Converting an output may upload it (files, directories, dataframes...), so those outputs are converted
+            # concurrently, bounded by the configured number of concurrent transfers. Other outputs are converted
+            # serially, as they only serialize in memory and a thread pool would only add overhead.
+            n_offloaded = sum(1 for _, _, literal_type in conversions.values() if _is_offloaded(literal_type))
+            max_workers = min(n_offloaded, exec_ctx.file_access.data_config.max_concurrent_transfers)
+            if max_workers > 1:
+                to_literal = NebulaContextManager.bind_context(TypeEngine.to_literal)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {k: executor.submit(to_literal, exec_ctx, *args) for k, args in conversions.items()}
+                pending = {k: f.result for k, f in futures.items()}
+            else:
+                pending = {
+                    k: functools.partial(TypeEngine.to_literal, exec_ctx, *args) for k, args in conversions.items()
+                }
+
+            literals = {}
+            for i, (k, get_literal) in enumerate(pending.items()):
                 try:
-                    literals[k] = TypeEngine.to_literal(exec_ctx, v, py_type, literal_type)
+                    literals[k] = get_literal()
                 except Exception as e:
                     # only show the name of output key if it's user-defined (by default Nebula names these as "o<n>")
                     key = k if k != f"o{i}" else i
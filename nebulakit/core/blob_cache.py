@@ -0,0 +1,237 @@
+"""
+Read-through disk cache of remote files and directories, that can be shared by all the tasks running on a node, e.g.
+through a hostPath volume. Entries are keyed by remote uri and version (ETag or generation), filled atomically under a
+file lock so that concurrent tasks download each entry once, and evicted least recently used first once the cache
+grows past its size limit. Entries are handed out by reflink where the file system supports it and copied otherwise,
+so that tasks never share writable storage with the cache. Cached files are read-only.
+"""
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import stat
+import typing
+import uuid
+
+import fsspec
+
+from nebulakit.core.chunked_transfer import object_version
+from nebulakit.loggers import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from nebulakit.core.data_persistence import FileAccessProvider
+
+# ioctl cloning a file into another on file systems that support reflinks (btrfs, xfs), see ioctl_ficlone(2)
+_FICLONE = 0x40049409
+
+
+def _clone_file(src: str, dst: str):
+    """
+    Copies src to dst, sharing their blocks copy-on-write where the file system supports it. The copy is writable.
+    """
+    if os.path.lexists(dst):
+        os.remove(dst)
+    cloned = False
+    if fcntl is not None:
+        try:
+            with open(src, "rb") as s, open(dst, "wb") as d:
+                fcntl.ioctl(d.fileno(), _FICLONE, s.fileno())
+            cloned = True
+        except OSError:
+            os.remove(dst)
+    if not cloned:
+        shutil.copyfile(src, dst)
+    os.chmod(dst, stat.S_IMODE(os.stat(src).st_mode) | stat.S_IWUSR)
+
+
+def _clone_tree(src: str, dst: str):
+    """
+    Clones the files of src into dst, replacing whatever is in their way. Symlinks are copied as is.
+    """
+    for root, dirs, files in os.walk(src):
+        target_dir = os.path.normpath(os.path.join(dst, os.path.relpath(root, src)))
+        if os.path.lexists(target_dir) and not os.path.isdir(target_dir):
+            os.remove(target_dir)
+        os.makedirs(target_dir, exist_ok=True)
+        for name in files + [d for d in dirs if os.path.islink(os.path.join(root, d))]:
+            source, target = os.path.join(root, name), os.path.join(target_dir, name)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            if os.path.islink(source):
+                if os.path.lexists(target):
+                    os.remove(target)
+                os.symlink(os.readlink(source), target)
+            else:
+                _clone_file(source, target)
+
+
+def _tree_size(path: str) -> int:
+    if not os.path.isdir(path):
+        return os.lstat(path).st_size
+    return sum(os.lstat(os.path.join(root, f)).st_size for root, _, files in os.walk(path) for f in files)
+
+
+class SharedBlobCache(object):
+    """
+    Cache of remote files and directories in ``directory``, limited to ``size_limit`` bytes (0 means unlimited).
+    """
+
+    def __init__(self, directory: str, size_limit: int):
+        if fcntl is None:
+            raise OSError("The shared blob cache requires fcntl file locks")
+        self._entries = os.path.join(directory, "entries")
+        self._locks = os.path.join(directory, "locks")
+        self._tmp = os.path.join(directory, "tmp")
+        for d in (self._entries, self._locks, self._tmp):
+            os.makedirs(d, exist_ok=True)
+        self._size_limit = size_limit
+
+    @contextlib.contextmanager
+    def _lock(self, key: str, blocking: bool = True) -> typing.Generator[bool, None, None]:
+        with open(os.path.join(self._locks, f"{key}.lock"), "a") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _version(fs: fsspec.AbstractFileSystem, remote_path: str, is_multipart: bool) -> typing.Optional[str]:
+        """
+        Returns the version of the remote file, or a digest of the versions of all the files in the remote directory,
+        or None if the version of any of them is unknown.
+        """
+        if not is_multipart:
+            info = fs.info(remote_path)
+            return (info.get("type") == "file" and object_version(info)) or None
+        files = fs.find(remote_path, detail=True)
+        if not files:
+            return None
+        h = hashlib.sha256()
+        for path, info in sorted(files.items()):
+            version = object_version(info)
+            if not version:
+                return None
+            h.update(f"{path}\n{version}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def get(
+        self, file_access: "FileAccessProvider", remote_path: str, local_path: str, is_multipart: bool = False
+    ) -> bool:
+        """
+        Places the remote file or directory at local_path out of the cache, downloading it into the cache first if
+        needed. Returns False if the remote path cannot be cached, because its version is unknown.
+        """
+        fs = file_access.get_filesystem_for_path(remote_path)
+        version = self._version(fs, remote_path, is_multipart)
+        if version is None:
+            return False
+        uri = fs.unstrip_protocol(remote_path.rstrip("/"))
+
+        def _download(data: str):
+            file_access.get(remote_path, data, recursive=is_multipart)
+
+        try:
+            data = self._entry(uri, version, _download, is_multipart)
+            if not is_multipart:
+                if local_path.endswith(os.sep) or os.path.isdir(local_path):
+                    local_path = os.path.join(local_path, os.path.basename(uri))
+                os.makedirs(os.path.dirname(os.path.abspath(local_path)), exist_ok=True)
+                _clone_file(data, local_path)
+            else:
+                _clone_tree(data, local_path)
+        except FileNotFoundError:
+            # Evicted in the meantime
+            return False
+        logger.debug(f"Served {uri} from the shared blob cache")
+        return True
+
+    def get_tree(self, name: str, version: str, fill: typing.Callable[[str], None], local_path: str) -> bool:
+        """
+        Places the directory that ``fill(directory)`` produces for name at version into local_path, out of the cache,
+        calling fill first if needed. Files already in local_path are overwritten. Returns False if the entry was
+        evicted before it could be copied out.
+        """
+        try:
+            _clone_tree(self._entry(name, version, fill, is_multipart=True), local_path)
+        except FileNotFoundError:
+            return False
+        logger.debug(f"Served {name} from the shared blob cache")
+        return True
+
+    def _entry(self, uri: str, version: str, fill: typing.Callable[[str], None], is_multipart: bool) -> str:
+        """
+        Returns the path of the data of the entry for uri at version, filling it with fill first if it is not cached.
+        """
+        key = hashlib.sha256(f"{uri}\n{version}".encode("utf-8")).hexdigest()
+        entry = os.path.join(self._entries, key)
+        if not os.path.exists(entry):
+            with self._lock(key):
+                if not os.path.exists(entry):
+                    self._fill(fill, uri, version, entry, is_multipart)
+            self._evict()
+        # The modification time of the entry records when it was last used
+        os.utime(entry)
+        return os.path.join(entry, "data")
+
+    def _fill(self, fill: typing.Callable[[str], None], uri: str, version: str, entry: str, is_multipart: bool):
+        tmp_entry = os.path.join(self._tmp, f"{os.path.basename(entry)}.{uuid.uuid4().hex}")
+        data = os.path.join(tmp_entry, "data")
+        os.makedirs(tmp_entry)
+        try:
+            if is_multipart:
+                os.makedirs(data)
+            fill(data)
+            for root, _, files in os.walk(tmp_entry):
+                for f in files:
+                    f = os.path.join(root, f)
+                    mode = os.lstat(f).st_mode
+                    if not stat.S_ISLNK(mode):
+                        os.chmod(f, stat.S_IMODE(mode) & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH))
+            with open(os.path.join(tmp_entry, "meta.json"), "w") as meta:
+                json.dump({"uri": uri, "version": version, "size": _tree_size(data)}, meta)
+            # Entries appear in the cache complete or not at all
+            os.rename(tmp_entry, entry)
+        finally:
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+    def _evict(self):
+        """
+        Removes the least recently used entries until the cache fits its size limit. Entries that are being filled are
+        skipped.
+        """
+        if self._size_limit <= 0:
+            return
+        entries = []
+        for key in os.listdir(self._entries):
+            entry = os.path.join(self._entries, key)
+            try:
+                with open(os.path.join(entry, "meta.json")) as f:
+                    size = json.load(f)["size"]
+                entries.append((os.stat(entry).st_mtime, key, size))
+            except (OSError, ValueError, KeyError):
+                continue
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self._size_limit:
+                break
+            with self._lock(key, blocking=False) as acquired:
+                if not acquired:
+                    continue
+                evicted = os.path.join(self._tmp, f"{key}.{uuid.uuid4().hex}")
+                try:
+                    os.rename(os.path.join(self._entries, key), evicted)
+                except OSError:
+                    continue
+                shutil.rmtree(evicted, ignore_errors=True)
+                total -= size
@@ -0,0 +1,401 @@
+"""
+Transfers of large single files split into parts that are moved concurrently: ranged GETs for downloads and, for s3,
+multipart uploads. The parts completed so far are recorded in a state file, so that a failed transfer retried with the
+same unchanged source only moves the missing parts. Uploads are only aborted when they fail with an error a retry
+cannot fix, when their source changes, or when their state is not resumed within ``_STATE_TTL_SECONDS``.
+"""
+import hashlib
+import json
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+import typing
+from concurrent.futures import ThreadPoolExecutor
+
+import fsspec
+
+from nebulakit.configuration import DataConfig
+from nebulakit.loggers import logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None  # type: ignore
+
+# Protocols whose file systems implement ranged reads with cat_file(path, start, end)
+RANGED_GET_PROTOCOLS = ("s3", "s3a", "gs", "gcs", "abfs", "abfss")
+# Protocols that support multipart uploads
+MULTIPART_PUT_PROTOCOLS = ("s3", "s3a")
+
+# S3 rejects multipart uploads with parts smaller than 5MiB (except the last one) or more than 10000 parts
+_S3_MIN_PART_SIZE = 5 * 1024 * 1024
+_S3_MAX_PARTS = 10000
+
+_STATE_DIR = os.path.join(tempfile.gettempdir(), "nebula-transfers")
+# Transfers not resumed within this many seconds are discarded, and their multipart uploads aborted
+_STATE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _protocols(fs: fsspec.AbstractFileSystem) -> typing.Tuple[str, ...]:
+    return (fs.protocol,) if isinstance(fs.protocol, str) else tuple(fs.protocol)
+
+
+def object_version(info: typing.Dict[str, typing.Any]) -> str:
+    """
+    Returns the ETag, generation or modification time reported by fsspec for an object, or "" if there is none.
+    """
+    for k in ("ETag", "etag", "md5Hash", "generation", "LastModified", "last_modified", "mtime"):
+        if info.get(k):
+            return str(info[k])
+    return ""
+
+
+def _is_retryable(e: Exception) -> bool:
+    """
+    Whether a transfer that failed with e can succeed if retried: errors of the connection or the object store, as
+    opposed to errors of the request itself such as missing permissions or a missing bucket.
+    """
+    return isinstance(e, OSError) and not isinstance(
+        e, (PermissionError, FileNotFoundError, IsADirectoryError, NotADirectoryError)
+    )
+
+
+def _try_lock(path: str) -> typing.Optional[typing.IO]:
+    """
+    Returns the open lock file of the state at path, locked exclusively, or None if another transfer holds it.
+    """
+    os.makedirs(_STATE_DIR, exist_ok=True)
+    lock_file = open(f"{path}.lock", "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def _discard_stale_states(fs: fsspec.AbstractFileSystem, source: str, current_path: str):
+    """
+    Removes the states of the earlier versions of source, and of the transfers not resumed within
+    ``_STATE_TTL_SECONDS``, aborting their multipart uploads. States in use by other transfers are left alone.
+    """
+    if fcntl is None:
+        return
+    try:
+        names = os.listdir(_STATE_DIR)
+    except OSError:
+        return
+    now = time.time()
+    for name in names:
+        path = os.path.join(_STATE_DIR, name)
+        if not name.endswith(".json") or path == current_path:
+            continue
+        try:
+            stale = now - os.path.getmtime(path) > _STATE_TTL_SECONDS
+            if not stale:
+                with open(path) as f:
+                    stale = json.load(f).get("source") == source
+        except (OSError, ValueError):
+            continue
+        if not stale:
+            continue
+        lock_file = _try_lock(path)
+        if lock_file is None:
+            continue
+        try:
+            with open(path) as f:
+                state = json.load(f)
+            destination, upload_id = state.get("destination"), state.get("upload_id")
+            if upload_id and destination:
+                if fsspec.core.split_protocol(destination)[0] not in _protocols(fs):
+                    # Left for a transfer with a file system that can abort the upload
+                    continue
+                bucket, key, _ = fs.split_path(destination)
+                try:
+                    fs.call_s3("abort_multipart_upload", Bucket=bucket, Key=key, UploadId=upload_id)
+                except Exception as e:
+                    logger.debug(f"Failed to abort the stale multipart upload to {destination}: {e}")
+            os.remove(path)
+            os.remove(f"{path}.lock")
+        except (OSError, ValueError):
+            pass
+        finally:
+            lock_file.close()
+
+
+class RateLimiter(object):
+    """
+    Token bucket limiting the throughput of all the parts moved through it to ``bytes_per_second``.
+    """
+
+    def __init__(self, bytes_per_second: int):
+        self._rate = bytes_per_second
+        self._allowance = float(bytes_per_second)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, nbytes: int):
+        if self._rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(float(self._rate), self._allowance + (now - self._last) * self._rate)
+            self._last = now
+            self._allowance -= nbytes
+            wait = -self._allowance / self._rate if self._allowance < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+
+class _TransferState(object):
+    """
+    Parts completed by a transfer, persisted after each part. The state is keyed by the source and its size and version,
+    so that a transfer of the same unchanged source is resumed even if it is sent to a new destination, as long as it
+    is split the same way. The state is locked while in use, a concurrent transfer of the same source starts afresh
+    without persisting its parts.
+    """
+
+    def __init__(self, source: str, size: int, version: str, part_size: int):
+        key = hashlib.sha256(f"{source}\n{size}\n{version}\n{part_size}".encode("utf-8")).hexdigest()
+        self.path = os.path.join(_STATE_DIR, f"{key}.json")
+        self._lock = threading.Lock()
+        self._lock_file: typing.Optional[typing.IO] = None
+        self.source = source
+        self.destination: typing.Optional[str] = None
+        self.upload_id: typing.Optional[str] = None
+        self.parts: typing.Dict[int, str] = {}
+        if fcntl is None:
+            return
+        self._lock_file = _try_lock(self.path)
+        if self._lock_file is None:
+            return
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+            self.destination = state.get("destination")
+            self.upload_id = state.get("upload_id")
+            self.parts = {int(k): v for k, v in state.get("parts", {}).items()}
+        except (OSError, ValueError):
+            pass
+
+    def complete(self, part: int, value: str = ""):
+        with self._lock:
+            self.parts[part] = value
+            self.save()
+
+    @property
+    def persisted(self) -> bool:
+        return self._lock_file is not None
+
+    def save(self):
+        if self._lock_file is None:
+            return
+        tmp_path = f"{self.path}.{threading.get_ident()}"
+        state = {"source": self.source, "destination": self.destination, "upload_id": self.upload_id}
+        with open(tmp_path, "w") as f:
+            json.dump({**state, "parts": self.parts}, f)
+        os.replace(tmp_path, self.path)
+
+    def reset(self, destination: str):
+        self.destination = destination
+        self.upload_id = None
+        self.parts = {}
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def release(self):
+        if self._lock_file is not None:
+            self._lock_file.close()
+            self._lock_file = None
+
+
+class ChunkedTransfer(object):
+    """
+    Moves single files larger than ``DataConfig.part_size`` in parts of that size, with up to
+    ``DataConfig.max_parts_in_flight`` parts moved concurrently, across all the files moved through the instance, and
+    the overall throughput capped at ``DataConfig.max_bandwidth`` bytes per second. Downloads are supported for the
+    object stores that serve ranged reads, uploads for s3. Other transfers are left to fsspec.
+    """
+
+    def __init__(self, data_config: DataConfig):
+        self._part_size = data_config.part_size
+        self._max_parts_in_flight = max(1, data_config.max_parts_in_flight)
+        # Bounds the parts in flight across all the files moved concurrently through this instance
+        self._parts_in_flight = threading.BoundedSemaphore(self._max_parts_in_flight)
+        self._limiter = RateLimiter(data_config.max_bandwidth)
+
+    @property
+    def part_size(self) -> int:
+        return self._part_size
+
+    def _split(
+        self, size: int, min_part_size: int = 1, max_parts: typing.Optional[int] = None
+    ) -> typing.List[typing.Tuple[int, int]]:
+        part_size = max(self._part_size, min_part_size)
+        if max_parts and math.ceil(size / part_size) > max_parts:
+            part_size = math.ceil(size / max_parts)
+        return [(start, min(start + part_size, size)) for start in range(0, size, part_size)]
+
+    def _run_parts(self, fn: typing.Callable[[int], None], parts: typing.Iterable[int]):
+        def _run_part(part: int):
+            with self._parts_in_flight:
+                fn(part)
+
+        pending = list(parts)
+        if len(pending) <= 1 or self._max_parts_in_flight == 1:
+            for part in pending:
+                _run_part(part)
+            return
+        with ThreadPoolExecutor(max_workers=self._max_parts_in_flight) as executor:
+            # Consume the results to surface the first failure
+            list(executor.map(_run_part, pending))
+
+    def get(self, fs: fsspec.AbstractFileSystem, from_path: str, to_path: str, **kwargs) -> bool:
+        """
+        Downloads from_path to to_path in ranged parts. Returns False, without downloading anything, if from_path is not
+        a single file larger than one part or the file system does not serve ranged reads. kwargs are passed to the
+        ranged reads, except for fsspec's progress ``callback`` which is updated as parts complete.
+        """
+        if self._part_size <= 0 or not set(_protocols(fs)) & set(RANGED_GET_PROTOCOLS):
+            return False
+        info = fs.info(from_path)
+        size = info.get("size") or 0
+        if info.get("type") != "file" or size <= self._part_size:
+            return False
+        if os.path.isdir(to_path):
+            to_path = os.path.join(to_path, os.path.basename(from_path.rstrip("/")))
+        to_path = os.path.abspath(to_path)
+        os.makedirs(os.path.dirname(to_path), exist_ok=True)
+        callback = kwargs.pop("callback", None)
+
+        parts = self._split(size)
+        source = fs.unstrip_protocol(from_path)
+        state = _TransferState(source, size, object_version(info), self._part_size)
+        _discard_stale_states(fs, source, state.path)
+        try:
+            partial = state.destination
+            if not state.parts or not partial or not os.path.isfile(partial) or os.path.getsize(partial) != size:
+                state.reset(to_path)
+                with open(to_path, "wb") as f:
+                    f.truncate(size)
+                state.save()
+            else:
+                logger.info(f"Resuming download of {from_path}, {len(state.parts)}/{len(parts)} parts already done")
+                if partial != to_path:
+                    shutil.move(partial, to_path)
+                    state.destination = to_path
+                    state.save()
+            if callback is not None:
+                callback.set_size(size)
+                callback.relative_update(sum(parts[i][1] - parts[i][0] for i in state.parts))
+
+            def _get_part(i: int):
+                start, end = parts[i]
+                self._limiter.acquire(end - start)
+                data = fs.cat_file(from_path, start=start, end=end, **kwargs)
+                with open(to_path, "r+b") as f:
+                    f.seek(start)
+                    f.write(data)
+                state.complete(i)
+                if callback is not None:
+                    callback.relative_update(end - start)
+
+            logger.debug(f"Downloading {from_path} ({size} bytes) in {len(parts)} parts")
+            self._run_parts(_get_part, (i for i in range(len(parts)) if i not in state.parts))
+            state.remove()
+        finally:
+            state.release()
+        return True
+
+    def put(self, fs: fsspec.AbstractFileSystem, from_path: str, to_path: str, **kwargs) -> bool:
+        """
+        Uploads from_path to to_path as a multipart upload. Returns False, without uploading anything, if from_path is
+        not larger than one part or the file system does not support multipart uploads. kwargs are passed to the
+        creation of the upload, as fsspec does for its own multipart uploads, except for fsspec's progress
+        ``callback`` which is updated as parts complete. If the upload fails with an error that a retry can fix, it is
+        kept for the next upload of the unchanged source, otherwise it is aborted.
+        """
+        if self._part_size <= 0 or not set(_protocols(fs)) & set(MULTIPART_PUT_PROTOCOLS) or os.path.isdir(from_path):
+            return False
+        stat = os.stat(from_path)
+        if stat.st_size <= max(self._part_size, _S3_MIN_PART_SIZE):
+            return False
+        callback = kwargs.pop("callback", None)
+
+        parts = self._split(stat.st_size, min_part_size=_S3_MIN_PART_SIZE, max_parts=_S3_MAX_PARTS)
+        destination = fs.unstrip_protocol(to_path)
+        source = os.path.abspath(from_path)
+        state = _TransferState(source, stat.st_size, str(stat.st_mtime_ns), parts[0][1])
+        _discard_stale_states(fs, source, state.path)
+        try:
+            if state.upload_id is not None and state.destination:
+                try:
+                    bucket, key, _ = fs.split_path(state.destination)
+                    fs.call_s3("list_parts", Bucket=bucket, Key=key, UploadId=state.upload_id)
+                    logger.info(f"Resuming upload of {from_path}, {len(state.parts)}/{len(parts)} parts already done")
+                except Exception:
+                    # The upload was aborted or completed in the meantime
+                    state.reset(destination)
+            if state.upload_id is None:
+                state.reset(destination)
+                bucket, key, _ = fs.split_path(destination)
+                state.upload_id = fs.call_s3("create_multipart_upload", Bucket=bucket, Key=key, **kwargs)["UploadId"]
+                state.save()
+            # A multipart upload cannot be moved, an upload resumed for a new destination is completed where it was
+            # started and then copied to the destination server side
+            upload_path = typing.cast(str, state.destination)
+            bucket, key, _ = fs.split_path(upload_path)
+            if callback is not None:
+                callback.set_size(stat.st_size)
+                callback.relative_update(sum(parts[i][1] - parts[i][0] for i in state.parts))
+
+            def _put_part(i: int):
+                start, end = parts[i]
+                with open(from_path, "rb") as f:
+                    f.seek(start)
+                    data = f.read(end - start)
+                self._limiter.acquire(end - start)
+                response = fs.call_s3(
+                    "upload_part", Bucket=bucket, Key=key, UploadId=state.upload_id, PartNumber=i + 1, Body=data
+                )
+                state.complete(i, response["ETag"])
+                if callback is not None:
+                    callback.relative_update(end - start)
+
+            logger.debug(f"Uploading {from_path} ({stat.st_size} bytes) in {len(parts)} parts")
+            try:
+                self._run_parts(_put_part, (i for i in range(len(parts)) if i not in state.parts))
+                fs.call_s3(
+                    "complete_multipart_upload",
+                    Bucket=bucket,
+                    Key=key,
+                    UploadId=state.upload_id,
+                    MultipartUpload={
+                        "Parts": [{"PartNumber": i + 1, "ETag": state.parts[i]} for i in range(len(parts))]
+                    },
+                )
+            except Exception as e:
+                if state.persisted and _is_retryable(e):
+                    logger.info(f"Keeping the upload of {from_path} to resume it, {len(state.parts)} parts done: {e}")
+                    raise
+                # Parts of an upload that is neither completed nor aborted are kept, and billed, by the object store
+                try:
+                    fs.call_s3("abort_multipart_upload", Bucket=bucket, Key=key, UploadId=state.upload_id)
+                except Exception as e:
+                    logger.warning(f"Failed to abort the multipart upload of {from_path} to {upload_path}: {e}")
+                state.remove()
+                raise
+            state.remove()
+            fs.invalidate_cache(upload_path)
+            if upload_path != destination:
+                fs.mv(upload_path, destination)
+        finally:
+            state.release()
+        return True
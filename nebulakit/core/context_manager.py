@@ -21,11 +21,11 @@ import tempfile
 import traceback
 import typing
 from contextlib import contextmanager
-from contextvars import ContextVar
+from contextvars import ContextVar, copy_context
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Generator, List, Optional, Union
+from typing import Callable, Generator, List, Optional, TypeVar, Union
 
 from nebulakit.configuration import Config, SecretsConfig, SerializationSettings
 from nebulakit.core import mock_stats, utils
@@ -47,6 +47,8 @@ if typing.TYPE_CHECKING:
 
 nebula_context_Var: ContextVar[typing.List[NebulaContext]] = ContextVar("", default=[])
 
+T = TypeVar("T")
+
 if typing.TYPE_CHECKING:
     from nebulakit.core.base_task import Task, TaskResolverMixin
 
@@ -844,6 +846,26 @@ class NebulaContextManager(object):
     def size() -> int:
         return len(nebula_context_Var.get())
 
+    @staticmethod
+    def bind_context(fn: Callable[..., T]) -> Callable[..., T]:
+        """
+        Returns a callable that runs ``fn`` against a snapshot of the current context stack, and of the other context
+        variables of the caller. New threads start with an empty context, so functions submitted to a thread pool should
+        be wrapped with this to see the NebulaContext of the caller instead of a freshly initialized one. Each call gets
+        its own copy of the stack, so contexts pushed by ``fn`` do not leak into the caller or into other calls.
+        """
+        caller_context = copy_context()
+        context_list = list(nebula_context_Var.get())
+
+        def _run(*args, **kwargs) -> T:
+            def _in_context() -> T:
+                nebula_context_Var.set(list(context_list))
+                return fn(*args, **kwargs)
+
+            return caller_context.copy().run(_in_context)
+
+        return _run
+
     @staticmethod
     def initialize():
         """
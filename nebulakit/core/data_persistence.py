@@ -20,9 +20,12 @@ simple implementation that ships with the core.
 import io
 import os
 import pathlib
+import shutil
 import tempfile
+import threading
 import typing
-from typing import Any, Dict, Optional, Union, cast
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Union, cast
 from uuid import UUID
 
 import fsspec
@@ -31,11 +34,22 @@ from typing_extensions import Unpack
 
 from nebulakit import configuration
 from nebulakit.configuration import DataConfig
+from nebulakit.core.blob_cache import SharedBlobCache
+from nebulakit.core.chunked_transfer import ChunkedTransfer
+from nebulakit.core.directory_transfer import DirectoryTransfer
 from nebulakit.core.local_fsspec import NebulaLocalFileSystem
 from nebulakit.core.utils import timeit
 from nebulakit.exceptions.user import NebulaAssertion
 from nebulakit.interfaces.random import random
 from nebulakit.loggers import logger
+from nebulakit.models import literals as _literal_models
+from nebulakit.models.core.types import BlobType
+
+# Chunk size used to read the buffers passed to put_raw_data when DataConfig.part_size is 0
+_DEFAULT_READ_CHUNK_SIZE = 1024 * 1024
+
+# Separates the path of a segmented blob, holding many objects packed together, from the index of one of its segments
+SEGMENT_URI_SEPARATOR = "#segment="
 
 # Refer to https://github.com/fsspec/s3fs/blob/50bafe4d8766c3b2a4e1fc09669cf02fb2d71454/s3fs/core.py#L198
 # for key and secret
@@ -60,6 +74,10 @@ def s3_setup_args(s3_cfg: configuration.S3Config, anonymous: bool = False) -> Di
     if s3_cfg.endpoint is not None:
         kwargs["client_kwargs"] = {"endpoint_url": s3_cfg.endpoint}
 
+    # Size of the HTTP connection pool of the botocore client
+    if s3_cfg.max_pool_connections:
+        kwargs["config_kwargs"] = {"max_pool_connections": s3_cfg.max_pool_connections}
+
     if anonymous:
         kwargs[_ANON] = True
 
@@ -137,6 +155,19 @@ class FileAccessProvider(object):
             if raw_output_prefix.endswith(self.sep(self._default_remote))
             else raw_output_prefix + self.sep(self._default_remote)
         )
+        self._chunked_transfer = ChunkedTransfer(self._data_config)
+        self._directory_transfer = DirectoryTransfer(self._data_config, self._chunked_transfer)
+        self._blob_cache: Optional[SharedBlobCache] = None
+        if self._data_config.shared_cache_dir:
+            try:
+                self._blob_cache = SharedBlobCache(
+                    self._data_config.shared_cache_dir, self._data_config.shared_cache_size_limit
+                )
+            except OSError as e:
+                logger.warning(f"Shared blob cache {self._data_config.shared_cache_dir} is unavailable: {e}")
+        # Remote paths that were downloaded ahead of time by prefetch, mapped to where they were downloaded to
+        self._prefetched: Dict[str, str] = {}
+        self._prefetched_lock = threading.Lock()
 
     @property
     def raw_output_prefix(self) -> str:
@@ -158,22 +189,12 @@ class FileAccessProvider(object):
     ) -> fsspec.AbstractFileSystem:
         if not protocol:
             return self._default_remote
-        if protocol == "file":
-            kwargs["auto_mkdir"] = True
-            return NebulaLocalFileSystem(**kwargs)
-        elif protocol == "s3":
-            s3kwargs = s3_setup_args(self._data_config.s3, anonymous=anonymous)
-            s3kwargs.update(kwargs)
-            return fsspec.filesystem(protocol, **s3kwargs)  # type: ignore
-        elif protocol == "gs":
-            if anonymous:
-                kwargs["token"] = _ANON
-            return fsspec.filesystem(protocol, **kwargs)  # type: ignore
-
         storage_options = get_fsspec_storage_options(
             protocol=protocol, anonymous=anonymous, data_config=self._data_config, **kwargs
         )
-
+        # fsspec caches instances per class and storage options, so sessions and connection pools are reused
+        if protocol == "file":
+            return NebulaLocalFileSystem(**storage_options)
         return fsspec.filesystem(protocol, **storage_options)
 
     def get_filesystem_for_path(self, path: str = "", anonymous: bool = False, **kwargs) -> fsspec.AbstractFileSystem:
@@ -248,6 +269,14 @@ class FileAccessProvider(object):
                     self.strip_file_header(from_path), self.strip_file_header(to_path), dirs_exist_ok=True
                 )
             print(f"Getting {from_path} to {to_path}")
+            if not recursive and self._chunked_transfer.get(
+                file_system, from_path, self.strip_file_header(to_path), **kwargs
+            ):
+                return to_path
+            if recursive and self._directory_transfer.get(
+                file_system, from_path, self.strip_file_header(to_path), **kwargs
+            ):
+                return to_path
             dst = file_system.get(from_path, to_path, recursive=recursive, **kwargs)
             if isinstance(dst, (str, pathlib.Path)):
                 return dst
@@ -274,6 +303,10 @@ class FileAccessProvider(object):
                     self.strip_file_header(from_path), self.strip_file_header(to_path), dirs_exist_ok=True
                 )
             from_path, to_path = self.recursive_paths(from_path, to_path)
+            if self._directory_transfer.put(file_system, from_path, to_path, **kwargs):
+                return to_path
+        elif self._chunked_transfer.put(file_system, from_path, to_path, **kwargs):
+            return to_path
         dst = file_system.put(from_path, to_path, recursive=recursive, **kwargs)
         if isinstance(dst, (str, pathlib.Path)):
             return dst
@@ -285,7 +318,7 @@ class FileAccessProvider(object):
         lpath: Uploadable,
         upload_prefix: Optional[str] = None,
         file_name: Optional[str] = None,
-        read_chunk_size_bytes: int = 1024,
+        read_chunk_size_bytes: Optional[int] = None,
         encoding: str = "utf-8",
         **kwargs,
     ) -> str:
@@ -307,7 +340,8 @@ class FileAccessProvider(object):
             string will be generated
         :param file_name: A file name to add to the path. If None, then the file name will be the tail of the path if
             lpath is a file, or a random string if lpath is a buffer
-        :param read_chunk_size_bytes: If lpath is a buffer, this is the chunk size to read from it
+        :param read_chunk_size_bytes: If lpath is a buffer, this is the chunk size to read from it. Defaults to
+            DataConfig.part_size, or 1MiB if parts are disabled
         :param encoding: If lpath is a io.StringIO, this is the encoding to use to encode it to binary.
         :param kwargs: Additional kwargs are passed into the the fsspec put() call or the open() call
         :return: Returns the final path data was written to.
@@ -339,6 +373,8 @@ class FileAccessProvider(object):
                 r = self.put(from_path, to_path, **kwargs)
             return r or to_path
 
+        read_chunk_size_bytes = read_chunk_size_bytes or self._data_config.part_size or _DEFAULT_READ_CHUNK_SIZE
+
         # raw bytes
         if isinstance(lpath, bytes):
             fs = self.get_filesystem_for_path(to_path)
@@ -461,6 +497,112 @@ class FileAccessProvider(object):
         """
         return self.put_data(local_path, remote_path, is_multipart=True, **kwargs)
 
+    @staticmethod
+    def collect_remote_paths(literal: _literal_models.Literal, paths: Dict[str, bool]):
+        """
+        Walks a literal and records the remote path of every file, directory and schema it references, mapped to
+        whether the path is multipart.
+        """
+        if literal.collection is not None:
+            for lit in literal.collection.literals:
+                FileAccessProvider.collect_remote_paths(lit, paths)
+        elif literal.map is not None:
+            for lit in literal.map.literals.values():
+                FileAccessProvider.collect_remote_paths(lit, paths)
+        elif literal.scalar is not None:
+            scalar = literal.scalar
+            if scalar.blob is not None and FileAccessProvider.is_remote(scalar.blob.uri):
+                dimensionality = scalar.blob.metadata.type.dimensionality
+                uri = scalar.blob.uri.split(SEGMENT_URI_SEPARATOR, 1)[0]
+                paths[uri] = dimensionality == BlobType.BlobDimensionality.MULTIPART
+            elif scalar.schema is not None and FileAccessProvider.is_remote(scalar.schema.uri):
+                paths[scalar.schema.uri] = True
+            elif scalar.union is not None:
+                FileAccessProvider.collect_remote_paths(scalar.union.value, paths)
+
+    def prefetch(self, remote_paths: Dict[str, bool], max_workers: Optional[int] = None):
+        """
+        Downloads the given remote paths concurrently into the local sandbox, so that later calls to get_data for the
+        same paths are served from local disk instead of the remote store. Paths that fail to download are skipped,
+        get_data will download them again and surface the error.
+
+        :param remote_paths: Mapping of remote path to whether it is multipart (a directory)
+        :param max_workers: Maximum number of concurrent downloads, defaults to DataConfig.max_concurrent_transfers
+        """
+        max_workers = max_workers or self._data_config.max_concurrent_transfers
+        with self._prefetched_lock:
+            pending = {p: m for p, m in remote_paths.items() if p not in self._prefetched}
+        if not pending:
+            return
+
+        def _prefetch(remote_path: str, is_multipart: bool):
+            local_path = self.get_random_local_path(remote_path)
+            try:
+                pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+                self.get(remote_path, to_path=local_path, recursive=is_multipart)
+            except Exception as e:
+                logger.warning(f"Failed to prefetch {remote_path}, it will be downloaded when accessed: {e}")
+                return
+            with self._prefetched_lock:
+                self._prefetched[remote_path] = local_path
+
+        with timeit(f"Prefetch {len(pending)} inputs"):
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                list(executor.map(_prefetch, pending.keys(), pending.values()))
+
+    def _consume_prefetched(self, remote_path: str, local_path: str, is_multipart: bool) -> bool:
+        """
+        Moves a prefetched copy of remote_path to local_path. Returns False if remote_path was not prefetched.
+        """
+        with self._prefetched_lock:
+            prefetched_path = self._prefetched.pop(remote_path, None)
+        if prefetched_path is None or not os.path.exists(prefetched_path):
+            return False
+        local_path = self.strip_file_header(local_path)
+        if is_multipart:
+            pathlib.Path(local_path).mkdir(parents=True, exist_ok=True)
+            for entry in os.listdir(prefetched_path):
+                shutil.move(os.path.join(prefetched_path, entry), os.path.join(local_path, entry))
+        else:
+            pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(prefetched_path, local_path)
+        logger.debug(f"Using prefetched copy of {remote_path} for {local_path}")
+        return True
+
+    def _get_from_blob_cache(self, remote_path: str, local_path: str, is_multipart: bool) -> bool:
+        if self._blob_cache is None or not self.is_remote(remote_path):
+            return False
+        try:
+            return self._blob_cache.get(self, remote_path, local_path, is_multipart)
+        except Exception as e:
+            logger.warning(f"Failed to get {remote_path} through the shared blob cache, downloading it directly: {e}")
+            return False
+
+    def get_cached_copy(self, remote_path: str, is_multipart: bool = False) -> Optional[str]:
+        """
+        Returns a local copy of the remote path served from the shared blob cache, or None if the cache is disabled or
+        cannot serve it. Used by readers that would otherwise stream the remote data directly.
+        """
+        if self._blob_cache is None or not self.is_remote(remote_path):
+            return None
+        local_path = self.get_random_local_path(remote_path.rstrip("/"))
+        if self._get_from_blob_cache(remote_path, local_path, is_multipart):
+            return local_path
+        return None
+
+    def get_cached_tree(self, name: str, version: str, fill: Callable[[str], None], local_path: str) -> bool:
+        """
+        Places the directory that ``fill(directory)`` produces for name at version into local_path, out of the shared
+        blob cache so that fill runs once per node. Returns False if the cache is disabled or cannot serve it.
+        """
+        if self._blob_cache is None:
+            return False
+        try:
+            return self._blob_cache.get_tree(name, version, fill, local_path)
+        except Exception as e:
+            logger.warning(f"Failed to get {name} through the shared blob cache: {e}")
+            return False
+
     def get_data(self, remote_path: str, local_path: str, is_multipart: bool = False, **kwargs):
         """
         :param remote_path:
@@ -468,9 +610,12 @@ class FileAccessProvider(object):
         :param is_multipart:
         """
         try:
+            if self._prefetched and self._consume_prefetched(remote_path, local_path, is_multipart):
+                return
             pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
             with timeit(f"Download data to local from {remote_path}"):
-                self.get(remote_path, to_path=local_path, recursive=is_multipart, **kwargs)
+                if not self._get_from_blob_cache(remote_path, local_path, is_multipart):
+                    self.get(remote_path, to_path=local_path, recursive=is_multipart, **kwargs)
         except Exception as ex:
             raise NebulaAssertion(
                 f"Failed to get data from {remote_path} to {local_path} (recursive={is_multipart}).\n\n"
@@ -0,0 +1,270 @@
+"""
+Transfers of directories between the local file system and object stores. The source and the destination are listed
+once, and the files are moved by a pool of at most ``batch_size`` workers, so that directories of many small files
+neither run serially nor open a file per file at once. The workers skip files whose size and checksum already match at
+the destination. Files larger than ``DataConfig.part_size`` are moved in parts by
+:py:class:`nebulakit.core.chunked_transfer.ChunkedTransfer`, which bounds the parts in flight across all of them to
+``DataConfig.max_parts_in_flight``.
+"""
+import base64
+import collections
+import hashlib
+import os
+import time
+import typing
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import fsspec
+
+from nebulakit.configuration import DataConfig
+from nebulakit.core.chunked_transfer import ChunkedTransfer
+from nebulakit.loggers import logger
+
+# Seconds between two progress reports of a transfer
+_PROGRESS_INTERVAL = 10.0
+
+_MiB = 1024 * 1024
+
+# Protocols of file systems that are not object stores: the local file system, and http and NebulaFS (nebula://),
+# which cannot be listed and whose uploads are resolved by the file system itself
+_UNSUPPORTED_PROTOCOLS = ("file", "http", "https", "nebula")
+
+# A file to move: its source, destination, size, and the fsspec info of the remote copy if there is one
+_File = typing.Tuple[str, str, int, typing.Optional[typing.Dict[str, typing.Any]]]
+
+
+def _is_supported(fs: fsspec.AbstractFileSystem) -> bool:
+    protocols = (fs.protocol,) if isinstance(fs.protocol, str) else tuple(fs.protocol)
+    return not set(protocols) & set(_UNSUPPORTED_PROTOCOLS)
+
+
+def _remote_checksum(info: typing.Dict[str, typing.Any]) -> typing.Optional[typing.Tuple[str, str]]:
+    """
+    Returns the digest algorithm and value of the md5 checksum reported by fsspec for an object, or None if there is
+    none. The ETags of multipart uploads are not checksums of the content and are ignored.
+    """
+    etag = info.get("ETag") or info.get("etag")
+    if isinstance(etag, str):
+        etag = etag.strip('"')
+        if len(etag) == 32 and "-" not in etag:
+            return "hex", etag.lower()
+    if info.get("md5Hash"):
+        return "base64", str(info["md5Hash"])
+    content_md5 = (info.get("content_settings") or {}).get("content_md5")
+    if content_md5:
+        return "base64", base64.b64encode(bytes(content_md5)).decode("ascii")
+    return None
+
+
+def _local_checksum(path: str, encoding: str) -> str:
+    h = hashlib.md5()
+    with open(path, "rb") as f:
+        while chunk := f.read(_MiB):
+            h.update(chunk)
+    return h.hexdigest() if encoding == "hex" else base64.b64encode(h.digest()).decode("ascii")
+
+
+def _is_up_to_date(local_path: str, remote_info: typing.Optional[typing.Dict[str, typing.Any]]) -> bool:
+    if remote_info is None or not os.path.isfile(local_path):
+        return False
+    if os.path.getsize(local_path) != (remote_info.get("size") or 0):
+        return False
+    checksum = _remote_checksum(remote_info)
+    if checksum is None:
+        return False
+    encoding, value = checksum
+    return _local_checksum(local_path, encoding) == value
+
+
+def _list_remote(fs: fsspec.AbstractFileSystem, path: str) -> typing.Dict[str, typing.Dict[str, typing.Any]]:
+    """
+    Lists the files under the remote path, keyed by their path relative to it.
+    """
+    root = fs._strip_protocol(path).rstrip("/")
+    try:
+        files = fs.find(root, detail=True)
+    except FileNotFoundError:
+        return {}
+    listing = {}
+    for p, info in files.items():
+        if info.get("type", "file") != "file":
+            continue
+        rel = p[len(root) :].lstrip("/") if p.startswith(root) else ""
+        listing[rel or os.path.basename(p)] = info
+    return listing
+
+
+def _list_local(path: str) -> typing.Dict[str, int]:
+    """
+    Lists the files under the local path with their size, keyed by their path relative to it, using ``/`` as
+    separator.
+    """
+    listing = {}
+    for root, _, files in os.walk(path):
+        for f in files:
+            local_path = os.path.join(root, f)
+            rel = os.path.relpath(local_path, path).replace(os.sep, "/")
+            listing[rel] = os.path.getsize(local_path)
+    return listing
+
+
+class _Progress(object):
+    """
+    Logs the number of files and bytes moved by a transfer and its throughput, every ``_PROGRESS_INTERVAL`` seconds
+    and once done.
+    """
+
+    def __init__(self, description: str, total_files: int, total_bytes: int):
+        self._description = description
+        self._total_files = total_files
+        self._total_bytes = total_bytes
+        self._files = 0
+        self._bytes = 0
+        self._skipped = 0
+        self._start = time.monotonic()
+        self._last_report = self._start
+
+    @property
+    def moved(self) -> int:
+        return self._files
+
+    def _report(self, now: float) -> str:
+        elapsed = max(now - self._start, 1e-6)
+        return (
+            f"{self._description}: {self._files}/{self._total_files} files, "
+            f"{self._bytes / _MiB:.1f}/{self._total_bytes / _MiB:.1f} MiB in {elapsed:.1f}s "
+            f"({self._bytes / _MiB / elapsed:.1f} MiB/s, {self._files / elapsed:.1f} files/s)"
+        )
+
+    def advance(self, nbytes: int):
+        self._files += 1
+        self._bytes += nbytes
+        now = time.monotonic()
+        if now - self._last_report >= _PROGRESS_INTERVAL:
+            self._last_report = now
+            logger.info(self._report(now))
+
+    def skip(self, nbytes: int):
+        self._total_files -= 1
+        self._total_bytes -= nbytes
+        self._skipped += 1
+
+    def done(self):
+        logger.info(f"{self._report(time.monotonic())}, {self._skipped} files already up to date")
+
+
+class DirectoryTransfer(object):
+    """
+    Moves directories between the local file system and a remote file system, with up to ``batch_size`` files, by
+    default ``DataConfig.directory_batch_size``, moved concurrently.
+    """
+
+    def __init__(self, data_config: DataConfig, chunked_transfer: typing.Optional[ChunkedTransfer] = None):
+        self._batch_size = max(1, data_config.directory_batch_size)
+        self._chunked_transfer = chunked_transfer or ChunkedTransfer(data_config)
+
+    def _run(
+        self,
+        fn: typing.Callable[[str, str, typing.Optional[typing.Dict[str, typing.Any]]], bool],
+        files: typing.Sequence[_File],
+        progress: _Progress,
+        batch_size: typing.Optional[int],
+    ):
+        """
+        Calls fn on each (source, destination, size, remote info) of files with at most batch_size calls in flight.
+        fn returns False if it skipped the file as up to date.
+        """
+
+        def _advance(moved: bool, size: int):
+            if moved:
+                progress.advance(size)
+            else:
+                progress.skip(size)
+
+        workers = max(1, batch_size or self._batch_size)
+        if workers == 1 or len(files) <= 1:
+            for src, dst, size, info in files:
+                _advance(fn(src, dst, info), size)
+            return
+        # Only submit up to the number of workers at a time, so that listings of many files do not turn into as many
+        # pending futures
+        pending: typing.Deque[typing.Tuple[Future, int]] = collections.deque()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for src, dst, size, info in files:
+                if len(pending) >= workers:
+                    future, done_size = pending.popleft()
+                    _advance(future.result(), done_size)
+                pending.append((executor.submit(fn, src, dst, info), size))
+            while pending:
+                future, done_size = pending.popleft()
+                _advance(future.result(), done_size)
+
+    def get(
+        self,
+        fs: fsspec.AbstractFileSystem,
+        from_path: str,
+        to_path: str,
+        batch_size: typing.Optional[int] = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Downloads the remote directory from_path into the local directory to_path. Returns False, without downloading
+        anything, if fs is not an object store.
+        """
+        if not _is_supported(fs):
+            return False
+        remote = _list_remote(fs, from_path)
+        os.makedirs(to_path, exist_ok=True)
+        files: typing.List[_File] = []
+        for rel, info in sorted(remote.items()):
+            local_path = os.path.join(to_path, *rel.split("/"))
+            files.append((f"{from_path.rstrip('/')}/{rel}", local_path, info.get("size") or 0, info))
+        for local_dir in {os.path.dirname(local_path) for _, local_path, _, _ in files}:
+            os.makedirs(local_dir, exist_ok=True)
+
+        def _get_file(src: str, dst: str, info: typing.Optional[typing.Dict[str, typing.Any]]) -> bool:
+            if _is_up_to_date(dst, info):
+                return False
+            if not self._chunked_transfer.get(fs, src, dst):
+                fs.get_file(src, dst, **kwargs)
+            return True
+
+        progress = _Progress(f"Downloading {from_path}", len(files), sum(size for _, _, size, _ in files))
+        self._run(_get_file, files, progress, batch_size)
+        progress.done()
+        return True
+
+    def put(
+        self,
+        fs: fsspec.AbstractFileSystem,
+        from_path: str,
+        to_path: str,
+        batch_size: typing.Optional[int] = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Uploads the local directory from_path into the remote directory to_path. Returns False, without uploading
+        anything, if fs is not an object store or from_path is not a directory.
+        """
+        if not _is_supported(fs) or not os.path.isdir(from_path):
+            return False
+        local = _list_local(from_path)
+        remote = _list_remote(fs, to_path) if local else {}
+        files: typing.List[_File] = []
+        for rel, size in sorted(local.items()):
+            local_path = os.path.join(from_path, *rel.split("/"))
+            files.append((local_path, f"{to_path.rstrip('/')}/{rel}", size, remote.get(rel)))
+
+        def _put_file(src: str, dst: str, info: typing.Optional[typing.Dict[str, typing.Any]]) -> bool:
+            if _is_up_to_date(src, info):
+                return False
+            if not self._chunked_transfer.put(fs, src, dst):
+                fs.put_file(src, dst, **kwargs)
+            return True
+
+        progress = _Progress(f"Uploading {from_path}", len(files), sum(size for _, _, size, _ in files))
+        self._run(_put_file, files, progress, batch_size)
+        progress.done()
+        if progress.moved:
+            fs.invalidate_cache(to_path)
+        return True
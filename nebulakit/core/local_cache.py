@@ -1,38 +1,152 @@
+import hashlib
+import os
+import pickle
+import threading
+import time
+import typing
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
 from typing import Optional
 
 from diskcache import Cache
 
 from nebulakit import lazy_module
-from nebulakit.models.literals import Literal, LiteralCollection, LiteralMap
+from nebulakit.configuration import LocalCacheConfig
+from nebulakit.core.context_manager import NebulaContextManager
+from nebulakit.core.data_persistence import SEGMENT_URI_SEPARATOR
+from nebulakit.loggers import logger
+from nebulakit.models.literals import (
+    Blob,
+    Literal,
+    LiteralCollection,
+    LiteralMap,
+    Scalar,
+    Schema,
+    StructuredDataset,
+    Union,
+)
 
 joblib = lazy_module("joblib")
 
-# Location on the filesystem where serialized objects will be stored
-# TODO: read from config
-CACHE_LOCATION = "~/.nebula/local-cache"
+# Default location on the filesystem where serialized objects will be stored, see LocalCacheConfig.location
+CACHE_LOCATION = LocalCacheConfig.location
 
+# Directory, within the cache location, of the disk store recording the latest cache version of each task. It is kept
+# apart from the cached outputs so that the records are never evicted with them.
+_CACHE_VERSIONS_DIR = "versions"
 
-def _recursive_hash_placement(literal: Literal) -> Literal:
+# Checksums reported by the fsspec implementations of the object stores, reused instead of reading the object
+_REMOTE_CHECKSUM_KEYS = ("ETag", "etag", "md5Hash", "crc32c", "content_md5")
+_DIGEST_READ_CHUNK_SIZE = 1024 * 1024
+
+# Memoized content digests of the files read so far, keyed by (path, size, modification time)
+_content_digests: typing.Dict[typing.Tuple[str, typing.Any, typing.Any], str] = {}
+
+
+def _file_digest(fs, path: str, info: typing.Dict[str, typing.Any]) -> str:
+    for k in _REMOTE_CHECKSUM_KEYS:
+        if info.get(k):
+            return str(info[k]).strip('"')
+
+    memo_key = (fs.unstrip_protocol(path), info.get("size"), info.get("mtime"))
+    digest = _content_digests.get(memo_key)
+    if digest is None:
+        h = hashlib.sha256()
+        with fs.open(path, "rb") as f:
+            while chunk := f.read(_DIGEST_READ_CHUNK_SIZE):
+                h.update(chunk)
+        digest = h.hexdigest()
+        _content_digests[memo_key] = digest
+    return digest
+
+
+def _content_digest(uri: str) -> Optional[str]:
+    """
+    Returns a digest of the contents of the file or directory at the uri, or None if it cannot be read.
+    """
+    try:
+        pickled = _pickled_object(uri)
+        if pickled is not None:
+            return hashlib.sha256(pickled).hexdigest()
+        fs = NebulaContextManager.current_context().file_access.get_filesystem_for_path(uri)
+        if not fs.isdir(uri):
+            return _file_digest(fs, uri, fs.info(uri))
+        # Directories digest the relative paths and digests of all the files they contain
+        root = fs._strip_protocol(uri).rstrip(fs.sep)
+        h = hashlib.sha256()
+        for path, info in sorted(fs.find(uri, detail=True).items()):
+            h.update(path[len(root) :].encode("utf-8"))
+            h.update(_file_digest(fs, path, info).encode("utf-8"))
+        return h.hexdigest()
+    except Exception as e:
+        logger.warning(f"Failed to compute the content digest of {uri}, the cache key will use the uri instead: {e}")
+        return None
+
+
+def _pickled_object(uri: str) -> Optional[bytes]:
+    """
+    Returns the pickled object at the uri if it is held in memory or packed in a segmented blob, None otherwise.
+    """
+    from nebulakit.types.pickle.pickle import LocalPickleCache, PickleStore
+
+    pickled = LocalPickleCache.get(uri)
+    if pickled is None and SEGMENT_URI_SEPARATOR in uri:
+        pickled = PickleStore.read(NebulaContextManager.current_context(), uri)
+    return pickled
+
+
+def _content_addressed_placement(literal: Literal) -> Literal:
+    """
+    Replaces the uris of offloaded scalars by the digest of the data they point to.
+    """
+    scalar = literal.scalar
+    if scalar.blob is not None:
+        digest = _content_digest(scalar.blob.uri)
+        if digest is not None:
+            return Literal(scalar=Scalar(blob=Blob(metadata=scalar.blob.metadata, uri=digest)))
+    elif scalar.structured_dataset is not None and scalar.structured_dataset.uri:
+        digest = _content_digest(scalar.structured_dataset.uri)
+        if digest is not None:
+            return Literal(
+                scalar=Scalar(
+                    structured_dataset=StructuredDataset(uri=digest, metadata=scalar.structured_dataset.metadata)
+                )
+            )
+    elif scalar.schema is not None:
+        digest = _content_digest(scalar.schema.uri)
+        if digest is not None:
+            return Literal(scalar=Scalar(schema=Schema(uri=digest, type=scalar.schema.type)))
+    elif scalar.union is not None:
+        value = _recursive_hash_placement(scalar.union.value, content_addressed=True)
+        return Literal(scalar=Scalar(union=Union(value=value, stored_type=scalar.union.stored_type)))
+    return literal
+
+
+def _recursive_hash_placement(literal: Literal, content_addressed: bool = False) -> Literal:
     # Base case, hash gets passed through always if set
     if literal.hash is not None:
         return Literal(hash=literal.hash)
     elif literal.collection is not None:
-        literals = [_recursive_hash_placement(lit) for lit in literal.collection.literals]
+        literals = [_recursive_hash_placement(lit, content_addressed) for lit in literal.collection.literals]
         return Literal(collection=LiteralCollection(literals=literals))
     elif literal.map is not None:
         literal_map = {}
         for key, literal_value in literal.map.literals.items():
-            literal_map[key] = _recursive_hash_placement(literal_value)
+            literal_map[key] = _recursive_hash_placement(literal_value, content_addressed)
         return Literal(map=LiteralMap(literal_map))
+    elif content_addressed and literal.scalar is not None:
+        return _content_addressed_placement(literal)
     else:
         return literal
 
 
-def _calculate_cache_key(task_name: str, cache_version: str, input_literal_map: LiteralMap) -> str:
+def _calculate_cache_key(
+    task_name: str, cache_version: str, input_literal_map: LiteralMap, content_addressed: bool = False
+) -> str:
     # Traverse the literals and replace the literal with a new literal that only contains the hash
     literal_map_overridden = {}
     for key, literal in input_literal_map.literals.items():
-        literal_map_overridden[key] = _recursive_hash_placement(literal)
+        literal_map_overridden[key] = _recursive_hash_placement(literal, content_addressed)
 
     # Generate a stable representation of the underlying protobuf by passing `deterministic=True` to the
     # protobuf library.
@@ -41,17 +155,169 @@ def _calculate_cache_key(task_name: str, cache_version: str, input_literal_map:
     return f"{task_name}-{cache_version}-{joblib.hash(hashed_inputs)}"
 
 
+def _cache_version_tag(task_name: str, cache_version: str) -> str:
+    return f"{task_name}::{cache_version}"
+
+
+@dataclass
+class LocalCacheStats(object):
+    """
+    Counters of the local task cache. Hits and misses are counted since the cache was last cleared, by all the
+    processes using it for the disk backend and by the current process for the memory backend.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    size_bytes: int = 0
+    entries: int = 0
+
+
+class InMemoryCache(object):
+    """
+    In-process implementation of the subset of the ``diskcache.Cache`` interface used by ``LocalTaskCache``. Values are
+    kept pickled, so that callers never share objects with the cache, and are evicted following the same policies as
+    diskcache once ``size_limit`` bytes are exceeded.
+    """
+
+    def __init__(self, size_limit: int, eviction_policy: str):
+        if eviction_policy not in ("least-recently-stored", "least-recently-used", "least-frequently-used", "none"):
+            raise ValueError(f"Unknown eviction policy {eviction_policy}")
+        self._size_limit = size_limit
+        self._eviction_policy = eviction_policy
+        # key -> (pickled value, tag, expire time)
+        self._entries: typing.OrderedDict[str, typing.Tuple[bytes, Optional[str], Optional[float]]] = OrderedDict()
+        self._access_counts: typing.Dict[str, int] = defaultdict(int)
+        self._volume = 0
+        self._statistics = False
+        self._hits = 0
+        self._misses = 0
+        # Parallel local executions access the cache from several threads
+        self._lock = threading.RLock()
+
+    def get(self, key: str, default: typing.Any = None) -> typing.Any:
+        with self._lock:
+            if not self._contains(key):
+                if self._statistics:
+                    self._misses += 1
+                return default
+            if self._statistics:
+                self._hits += 1
+            data, _, _ = self._entries[key]
+            if self._eviction_policy == "least-recently-used":
+                self._entries.move_to_end(key)
+            self._access_counts[key] += 1
+        return pickle.loads(data)
+
+    def set(self, key: str, value: typing.Any, expire: Optional[float] = None, tag: Optional[str] = None) -> bool:
+        data = pickle.dumps(value)
+        with self._lock:
+            if key in self._entries:
+                self._delete(key)
+            self._entries[key] = (data, tag, time.time() + expire if expire is not None else None)
+            self._volume += len(data)
+            self._cull()
+        return True
+
+    def add(self, key: str, value: typing.Any, expire: Optional[float] = None, tag: Optional[str] = None) -> bool:
+        with self._lock:
+            if self._contains(key):
+                return False
+            return self.set(key, value, expire=expire, tag=tag)
+
+    def evict(self, tag: str) -> int:
+        with self._lock:
+            keys = [k for k, (_, t, _) in self._entries.items() if t == tag]
+            for k in keys:
+                self._delete(k)
+        return len(keys)
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+            self._access_counts.clear()
+            self._volume = 0
+        return count
+
+    def stats(self, enable: bool = True, reset: bool = False) -> typing.Tuple[int, int]:
+        """
+        Returns the hits and misses counted so far, and enables or disables counting them, like diskcache.
+        """
+        with self._lock:
+            counts = (self._hits, self._misses)
+            if reset:
+                self._hits = self._misses = 0
+            self._statistics = enable
+        return counts
+
+    def volume(self) -> int:
+        return self._volume
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _contains(self, key: str) -> bool:
+        """
+        Whether the key is present and not expired, expired entries are dropped on access.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return False
+        expire_time = entry[2]
+        if expire_time is not None and expire_time < time.time():
+            self._delete(key)
+            return False
+        return True
+
+    def _delete(self, key: str):
+        data, _, _ = self._entries.pop(key)
+        self._access_counts.pop(key, None)
+        self._volume -= len(data)
+
+    def _cull(self):
+        if self._eviction_policy == "none":
+            return
+        while self._volume > self._size_limit and self._entries:
+            if self._eviction_policy == "least-frequently-used":
+                victim = min(self._entries, key=lambda k: self._access_counts.get(k, 0))
+            else:
+                victim = next(iter(self._entries))
+            self._delete(victim)
+
+
 class LocalTaskCache(object):
     """
-    This class implements a persistent store able to cache the result of local task executions.
+    This class implements a store able to cache the result of local task executions. The backend, its size limit and
+    eviction policy are read from :py:class:`nebulakit.configuration.LocalCacheConfig`.
     """
 
-    _cache: Cache
+    _cache: typing.Union[Cache, InMemoryCache]
+    # Latest cache version of each task, by task name
+    _versions: typing.Union[Cache, typing.Dict[str, str]]
+    _config: LocalCacheConfig
     _initialized: bool = False
 
     @staticmethod
-    def initialize():
-        LocalTaskCache._cache = Cache(CACHE_LOCATION)
+    def initialize(config: Optional[LocalCacheConfig] = None):
+        config = config or LocalCacheConfig.auto()
+        if config.backend == "disk":
+            LocalTaskCache._cache = Cache(
+                config.location,
+                size_limit=config.max_size_bytes,
+                eviction_policy=config.eviction_policy,
+                tag_index=True,
+            )
+            LocalTaskCache._versions = Cache(os.path.join(config.location, _CACHE_VERSIONS_DIR), eviction_policy="none")
+        elif config.backend == "memory":
+            LocalTaskCache._cache = InMemoryCache(
+                size_limit=config.max_size_bytes, eviction_policy=config.eviction_policy
+            )
+            LocalTaskCache._versions = {}
+        else:
+            raise ValueError(f"Unknown local cache backend {config.backend}, expected one of 'disk' or 'memory'")
+        # Hits and misses are counted by the cache itself, in the cache directory for the disk backend
+        LocalTaskCache._cache.stats(enable=True)
+        LocalTaskCache._config = config
         LocalTaskCache._initialized = True
 
     @staticmethod
@@ -59,15 +325,60 @@ class LocalTaskCache(object):
         if not LocalTaskCache._initialized:
             LocalTaskCache.initialize()
         LocalTaskCache._cache.clear()
+        LocalTaskCache._cache.stats(enable=True, reset=True)
+        LocalTaskCache._versions.clear()
 
     @staticmethod
     def get(task_name: str, cache_version: str, input_literal_map: LiteralMap) -> Optional[LiteralMap]:
         if not LocalTaskCache._initialized:
             LocalTaskCache.initialize()
-        return LocalTaskCache._cache.get(_calculate_cache_key(task_name, cache_version, input_literal_map))
+        return LocalTaskCache._cache.get(
+            _calculate_cache_key(
+                task_name, cache_version, input_literal_map, content_addressed=LocalTaskCache._config.content_addressed
+            )
+        )
 
     @staticmethod
     def set(task_name: str, cache_version: str, input_literal_map: LiteralMap, value: LiteralMap) -> None:
         if not LocalTaskCache._initialized:
             LocalTaskCache.initialize()
-        LocalTaskCache._cache.add(_calculate_cache_key(task_name, cache_version, input_literal_map), value)
+        if LocalTaskCache._config.prune_old_versions:
+            LocalTaskCache._prune_old_versions(task_name, cache_version)
+        from nebulakit.types.pickle.pickle import LocalPickleCache
+
+        # Cached outputs outlive the objects pickled in memory by this process
+        for literal in value.literals.values():
+            LocalPickleCache.persist(literal)
+        LocalTaskCache._cache.add(
+            _calculate_cache_key(
+                task_name, cache_version, input_literal_map, content_addressed=LocalTaskCache._config.content_addressed
+            ),
+            value,
+            expire=LocalTaskCache._config.ttl_seconds,
+            tag=_cache_version_tag(task_name, cache_version),
+        )
+
+    @staticmethod
+    def stats() -> LocalCacheStats:
+        if not LocalTaskCache._initialized:
+            LocalTaskCache.initialize()
+        hits, misses = LocalTaskCache._cache.stats(enable=True)
+        return LocalCacheStats(
+            hits=hits,
+            misses=misses,
+            size_bytes=LocalTaskCache._cache.volume(),
+            entries=len(LocalTaskCache._cache),
+        )
+
+    @staticmethod
+    def _prune_old_versions(task_name: str, cache_version: str):
+        """
+        Evicts the entries cached for the previously recorded cache version of the task, if it differs from the current
+        one, and records the current version.
+        """
+        previous_version = LocalTaskCache._versions.get(task_name)
+        if previous_version == cache_version:
+            return
+        if previous_version is not None:
+            LocalTaskCache._cache.evict(_cache_version_tag(task_name, previous_version))
+        LocalTaskCache._versions[task_name] = cache_version
@@ -0,0 +1,127 @@
+"""
+Pools used to run the elements of map tasks and the independent nodes of workflows concurrently, configured by
+:py:class:`nebulakit.configuration.LocalExecutionConfig`.
+"""
+import functools
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+from nebulakit.configuration import LocalExecutionConfig
+from nebulakit.core.context_manager import NebulaContextManager
+
+POOL_KINDS = ("thread", "process")
+
+T = TypeVar("T")
+
+# Functions run by process pools, keyed by pool. They are registered before the workers are forked so that the workers
+# inherit them, as the tasks and contexts they close over usually cannot be pickled.
+_process_pool_functions: Dict[int, Callable] = {}
+
+# Set while running in a pool, so that nested map tasks and workflows run serially instead of multiplying the workers
+_in_context_pool: ContextVar[bool] = ContextVar("in_context_pool", default=False)
+
+
+def _call_process_pool_function(key: int, *args) -> Any:
+    return _process_pool_functions[key](*args)
+
+
+class ContextPool(Generic[T]):
+    """
+    Pool of threads or forked processes running ``fn`` against the NebulaContext of the code that created the pool.
+    Process pools use the ``fork`` start method, so that the workers inherit ``fn`` instead of receiving it pickled.
+    The arguments and the results of ``fn`` still have to be picklable.
+    """
+
+    def __init__(self, fn: Callable[..., T], kind: str = "thread", max_workers: Optional[int] = None):
+        if kind not in POOL_KINDS:
+            raise ValueError(f"Unknown pool kind {kind}, expected one of {POOL_KINDS}")
+        self._kind = kind
+        self._key = id(self)
+
+        def _run(*args) -> T:
+            token = _in_context_pool.set(True)
+            try:
+                return fn(*args)
+            finally:
+                _in_context_pool.reset(token)
+
+        self._fn = NebulaContextManager.bind_context(_run)
+        self._executor: Executor
+        if kind == "process":
+            _process_pool_functions[self._key] = self._fn
+            mp_context = multiprocessing.get_context("fork")
+            self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=mp_context)
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def submit(self, *args) -> Future:
+        if self._kind == "process":
+            return self._executor.submit(_call_process_pool_function, self._key, *args)
+        return self._executor.submit(self._fn, *args)
+
+    def map(self, *iterables) -> List[T]:
+        futures = [self.submit(*args) for args in zip(*iterables)]
+        return [f.result() for f in futures]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+        _process_pool_functions.pop(self._key, None)
+
+    def __enter__(self) -> "ContextPool[T]":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.shutdown()
+
+
+class LocalExecutor(object):
+    """
+    Decides whether local executions run map task elements and workflow nodes concurrently, following
+    :py:class:`nebulakit.configuration.LocalExecutionConfig`.
+    """
+
+    _config: Optional[LocalExecutionConfig] = None
+
+    @staticmethod
+    def initialize(config: Optional[LocalExecutionConfig] = None):
+        config = config or LocalExecutionConfig.auto()
+        if config.executor not in ("serial", *POOL_KINDS):
+            raise ValueError(f"Unknown local executor {config.executor}, expected one of 'serial', {POOL_KINDS}")
+        LocalExecutor._config = config
+
+    @staticmethod
+    def config() -> LocalExecutionConfig:
+        if LocalExecutor._config is None:
+            LocalExecutor.initialize()
+        return LocalExecutor._config  # type: ignore
+
+    @staticmethod
+    def is_parallel() -> bool:
+        config = LocalExecutor.config()
+        return config.executor != "serial" and config.max_workers != 1 and not _in_context_pool.get()
+
+    @staticmethod
+    def pool(fn: Callable[..., T]) -> Optional[ContextPool[T]]:
+        """
+        Returns a pool running ``fn`` as configured, or None if local executions are serial.
+        """
+        if not LocalExecutor.is_parallel():
+            return None
+        config = LocalExecutor.config()
+        return ContextPool(fn, kind=config.executor, max_workers=config.max_workers)
+
+    @staticmethod
+    def map_kwargs(fn: Callable[..., T], kwargs_list: List[Dict[str, Any]]) -> List[Callable[[], T]]:
+        """
+        Calls ``fn`` with each of the given kwargs, concurrently if local executions are parallel. Returns, in order, a
+        callable per call that returns its result or raises its exception. When serial, calls are only made when these
+        callables are invoked, so callers can stop early.
+        """
+        pool = LocalExecutor.pool(lambda kwargs: fn(**kwargs)) if len(kwargs_list) > 1 else None
+        if pool is None:
+            return [functools.partial(fn, **kwargs) for kwargs in kwargs_list]
+        with pool:
+            futures = [pool.submit(kwargs) for kwargs in kwargs_list]
+        return [f.result for f in futures]
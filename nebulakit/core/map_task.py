@@ -9,7 +9,8 @@ import math
 import os
 import typing
 from contextlib import contextmanager
-from typing import Any, Dict, List, Optional, Set
+from contextvars import ContextVar
+from typing import Any, Dict, Generator, List, Optional, Set
 
 from nebulakit.configuration import SerializationSettings
 from nebulakit.core import tracker
@@ -17,6 +18,7 @@ from nebulakit.core.base_task import PythonTask, Task, TaskResolverMixin
 from nebulakit.core.constants import CONTAINER_ARRAY_TASK
 from nebulakit.core.context_manager import ExecutionState, NebulaContext, NebulaContextManager
 from nebulakit.core.interface import transform_interface_to_list_interface
+from nebulakit.core.local_executor import POOL_KINDS, LocalExecutor
 from nebulakit.core.python_function_task import PythonFunctionTask, PythonInstanceTask
 from nebulakit.core.tracker import TrackedInstance
 from nebulakit.core.utils import timeit
@@ -27,6 +29,21 @@ from nebulakit.models.interface import Variable
 from nebulakit.models.task import Container, K8sPod, Sql
 from nebulakit.tools.module_loader import load_object_from_module
 
+_map_element_index: ContextVar[Optional[int]] = ContextVar("map_element_index", default=None)
+
+
+@contextmanager
+def map_element(index: int) -> Generator[None, None, None]:
+    """
+    Makes map tasks executed within this context process the element at ``index`` instead of the one selected by the
+    array job index. This is used to run a chunk of elements within a single array job.
+    """
+    token = _map_element_index.set(index)
+    try:
+        yield
+    finally:
+        _map_element_index.reset(token)
+
 
 class MapPythonTask(PythonTask):
     """
@@ -40,6 +57,8 @@ class MapPythonTask(PythonTask):
         concurrency: Optional[int] = None,
         min_success_ratio: Optional[float] = None,
         bound_inputs: Optional[Set[str]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_executor: str = "thread",
         **kwargs,
     ):
         """
@@ -54,7 +73,16 @@ class MapPythonTask(PythonTask):
               that are already bound and should not be considered as list inputs, but scalar values. This is mostly
               useful at runtime and is passed in by MapTaskResolver. This field is not required when a `partial` method
               is specified. The bound_vars will be auto-deduced from the `partial.keywords`.
+        :param chunk_size: If specified, every array job processes this many contiguous elements of the input instead
+              of a single one. Outputs are still written per element, so they are collected exactly as without chunking.
+        :param chunk_executor: Either "thread" or "process", the pool used to run the elements of a chunk concurrently
+              within the array job.
         """
+        if chunk_size is not None and chunk_size < 1:
+            raise ValueError(f"chunk_size must be a positive integer, got {chunk_size}")
+        if chunk_executor not in POOL_KINDS:
+            raise ValueError(f"chunk_executor must be one of {POOL_KINDS}, got {chunk_executor}")
+
         self._partial = None
         if isinstance(python_function_task, functools.partial):
             # TODO: We should be able to support partial tasks with lists as inputs
@@ -98,6 +126,8 @@ class MapPythonTask(PythonTask):
         self._cmd_prefix: typing.Optional[typing.List[str]] = None
         self._max_concurrency: typing.Optional[int] = concurrency
         self._min_success_ratio: typing.Optional[float] = min_success_ratio
+        self._chunk_size: typing.Optional[int] = chunk_size
+        self._chunk_executor: str = chunk_executor
         self._array_task_interface = actual_task.python_interface
         if "metadata" not in kwargs and actual_task.metadata:
             kwargs["metadata"] = actual_task.metadata
@@ -116,6 +146,14 @@ class MapPythonTask(PythonTask):
     def bound_inputs(self) -> Set[str]:
         return self._bound_inputs
 
+    @property
+    def chunk_size(self) -> Optional[int]:
+        return self._chunk_size
+
+    @property
+    def chunk_executor(self) -> str:
+        return self._chunk_executor
+
     def get_command(self, settings: SerializationSettings) -> List[str]:
         """
         TODO ADD bound variables to the resolver. Maybe we need a different resolver?
@@ -133,11 +171,10 @@ class MapPythonTask(PythonTask):
             "{{.checkpointOutputPrefix}}",
             "--prev-checkpoint",
             "{{.prevCheckpointPrefix}}",
-            "--resolver",
-            mt.name(),
-            "--",
-            *mt.loader_args(settings, self),
         ]
+        if self._chunk_size:
+            container_args.extend(["--chunk-size", str(self._chunk_size), "--chunk-executor", self._chunk_executor])
+        container_args.extend(["--resolver", mt.name(), "--", *mt.loader_args(settings, self)])
 
         if self._cmd_prefix:
             return self._cmd_prefix + container_args
@@ -171,6 +208,13 @@ class MapPythonTask(PythonTask):
             return self._run_task.get_sql(settings)
 
     def get_custom(self, settings: SerializationSettings) -> Dict[str, Any]:
+        if self._chunk_size:
+            # The array plugin launches one job per element and collects the outputs of each job from its own index,
+            # so the jobs of a chunked map task would run overlapping chunks, or none, until it sizes jobs by chunk
+            raise ValueError(
+                f"Map task {self.name} is chunked, which the array plugin does not support yet. Chunked map tasks can "
+                f"only run through pynebula-map-execute --chunk-size, remove chunk_size to register it."
+            )
         return ArrayJob(parallelism=self._max_concurrency, min_success_ratio=self._min_success_ratio).to_dict()
 
     def get_config(self, settings: SerializationSettings) -> Optional[Dict[str, str]]:
@@ -205,7 +249,11 @@ class MapPythonTask(PythonTask):
         Computes the absolute index of the current array job. This is determined by summing the compute-environment-specific
         environment variable and the offset (if one's set). The offset will be set and used when the user request that the
         job runs in a number of slots less than the size of the input.
+        When running a chunk of elements, this is the index of the element being processed instead.
         """
+        element_index = _map_element_index.get()
+        if element_index is not None:
+            return element_index
         return int(os.environ.get("BATCH_JOB_ARRAY_INDEX_OFFSET", "0")) + int(
             os.environ.get(os.environ.get("BATCH_JOB_ARRAY_INDEX_VAR_NAME", "0"), "0")
         )
@@ -278,6 +326,7 @@ class MapPythonTask(PythonTask):
         if self._min_success_ratio:
             min_successes = math.ceil(min_successes * self._min_success_ratio)
 
+        instances_inputs = []
         for i in range(mapped_tasks_count):
             single_instance_inputs = {}
             for k in self.interface.inputs.keys():
@@ -286,8 +335,13 @@ class MapPythonTask(PythonTask):
                     single_instance_inputs[k] = kwargs[k][i]
                 else:
                     single_instance_inputs[k] = kwargs[k]
+            instances_inputs.append(single_instance_inputs)
+
+        # The instances run concurrently if local executions are configured to be parallel, see LocalExecutor
+        run_task = exception_scopes.user_entry_point(self._run_task.execute)
+        for get_output in LocalExecutor.map_kwargs(run_task, instances_inputs):
             try:
-                o = exception_scopes.user_entry_point(self._run_task.execute)(**single_instance_inputs)
+                o = get_output()
                 if outputs_expected:
                     outputs.append(o)
             except Exception as exc:
@@ -304,6 +358,8 @@ def map_task(
     task_function: typing.Union[PythonFunctionTask, PythonInstanceTask, functools.partial],
     concurrency: int = 0,
     min_success_ratio: float = 1.0,
+    chunk_size: Optional[int] = None,
+    chunk_executor: str = "thread",
     **kwargs,
 ):
     """
@@ -349,9 +405,20 @@ def map_task(
         all inputs are processed. If left unspecified, this means unbounded concurrency.
     :param min_success_ratio: If specified, this determines the minimum fraction of total jobs which can complete
         successfully before terminating this task and marking it successful.
+    :param chunk_size: If specified, every array job runs this many contiguous elements of the input, amortizing the
+        container startup, imports and input download over the chunk. Useful when the individual elements are short.
+        Chunked map tasks cannot be registered until the array plugin launches one job per chunk.
+    :param chunk_executor: Either "thread" or "process", the pool used to run the elements of a chunk concurrently.
 
     """
-    return MapPythonTask(task_function, concurrency=concurrency, min_success_ratio=min_success_ratio, **kwargs)
+    return MapPythonTask(
+        task_function,
+        concurrency=concurrency,
+        min_success_ratio=min_success_ratio,
+        chunk_size=chunk_size,
+        chunk_executor=chunk_executor,
+        **kwargs,
+    )
 
 
 class MapTaskResolver(TrackedInstance, TaskResolverMixin):
@@ -384,6 +451,11 @@ class MapTaskResolver(TrackedInstance, TaskResolverMixin):
     and then at runtime reconstructs the interface with this knowledge
     """
 
+    def __init__(self, chunk_size: Optional[int] = None, chunk_executor: str = "thread"):
+        super().__init__()
+        self._chunk_size: Optional[int] = chunk_size
+        self._chunk_executor: str = chunk_executor
+
     def name(self) -> str:
         return "MapTaskResolver"
 
@@ -399,7 +471,13 @@ class MapTaskResolver(TrackedInstance, TaskResolverMixin):
         # Use the resolver to load the actual task object
         _task_def = resolver_obj.load_task(loader_args=resolver_args)
         bound_inputs = set(bound_vars.split(","))
-        return MapPythonTask(python_function_task=_task_def, max_concurrency=max_concurrency, bound_inputs=bound_inputs)
+        return MapPythonTask(
+            python_function_task=_task_def,
+            max_concurrency=max_concurrency,
+            bound_inputs=bound_inputs,
+            chunk_size=self._chunk_size,
+            chunk_executor=self._chunk_executor,
+        )
 
     def loader_args(self, settings: SerializationSettings, t: MapPythonTask) -> List[str]:  # type:ignore
         return [
@@ -1190,30 +1190,36 @@ def nebula_entity_call_handler(
                     return None
             return cast(LocallyExecutable, entity).local_execute(ctx, **kwargs)
     else:
-        mode = cast(LocallyExecutable, entity).local_execution_mode()
-        with NebulaContextManager.with_context(
-            ctx.with_execution_state(ctx.new_execution_state().with_params(mode=mode))
-        ) as child_ctx:
-            cast(ExecutionParameters, child_ctx.user_space_params)._decks = []
-            result = cast(LocallyExecutable, entity).local_execute(child_ctx, **kwargs)
-
-        expected_outputs = len(cast(SupportsNodeCreation, entity).python_interface.outputs)
-        if expected_outputs == 0:
-            if result is None or isinstance(result, VoidPromise):
-                return None
-            else:
-                raise Exception(f"Received an output when workflow local execution expected None. Received: {result}")
+        from nebulakit.types.pickle.pickle import LocalPickleCache
+
+        # Objects pickled in memory by this local execution are released once it returns
+        with LocalPickleCache.execution():
+            mode = cast(LocallyExecutable, entity).local_execution_mode()
+            with NebulaContextManager.with_context(
+                ctx.with_execution_state(ctx.new_execution_state().with_params(mode=mode))
+            ) as child_ctx:
+                cast(ExecutionParameters, child_ctx.user_space_params)._decks = []
+                result = cast(LocallyExecutable, entity).local_execute(child_ctx, **kwargs)
+
+            expected_outputs = len(cast(SupportsNodeCreation, entity).python_interface.outputs)
+            if expected_outputs == 0:
+                if result is None or isinstance(result, VoidPromise):
+                    return None
+                else:
+                    raise Exception(
+                        f"Received an output when workflow local execution expected None. Received: {result}"
+                    )
 
-        if inspect.iscoroutine(result):
-            return result
+            if inspect.iscoroutine(result):
+                return result
 
-        if (1 < expected_outputs == len(cast(Tuple[Promise], result))) or (
-            result is not None and expected_outputs == 1
-        ):
-            return create_native_named_tuple(ctx, result, cast(SupportsNodeCreation, entity).python_interface)
+            if (1 < expected_outputs == len(cast(Tuple[Promise], result))) or (
+                result is not None and expected_outputs == 1
+            ):
+                return create_native_named_tuple(ctx, result, cast(SupportsNodeCreation, entity).python_interface)
 
-        raise ValueError(
-            f"Expected outputs and actual outputs do not match."
-            f"Result {result}. "
-            f"Python interface: {cast(SupportsNodeCreation, entity).python_interface}"
-        )
+            raise ValueError(
+                f"Expected outputs and actual outputs do not match."
+                f"Result {result}. "
+                f"Python interface: {cast(SupportsNodeCreation, entity).python_interface}"
+            )
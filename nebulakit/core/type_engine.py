@@ -12,6 +12,7 @@ import textwrap
 import typing
 from abc import ABC, abstractmethod
 from functools import lru_cache
+from operator import attrgetter
 from typing import Dict, List, NamedTuple, Optional, Type, cast
 
 from dataclasses_json import DataClassJsonMixin, dataclass_json
@@ -842,6 +843,8 @@ class TypeEngine(typing.Generic[T]):
     """
 
     _REGISTRY: typing.Dict[type, TypeTransformer[T]] = {}
+    # Memoized results of get_transformer, keyed by the (hashable) python type. Invalidated on every registration.
+    _TRANSFORMER_CACHE: typing.Dict[Type, TypeTransformer[T]] = {}
     _RESTRICTED_TYPES: typing.List[type] = []
     _DATACLASS_TRANSFORMER: TypeTransformer = DataclassTransformer()  # type: ignore
     _ENUM_TRANSFORMER: TypeTransformer = EnumTransformer()  # type: ignore
@@ -865,6 +868,7 @@ class TypeEngine(typing.Generic[T]):
                     f" Cannot override with {transformer.name}"
                 )
             cls._REGISTRY[t] = transformer
+        cls._TRANSFORMER_CACHE.clear()
 
     @classmethod
     def register_restricted_type(
@@ -879,6 +883,7 @@ class TypeEngine(typing.Generic[T]):
     def register_additional_type(cls, transformer: TypeTransformer, additional_type: Type, override=False):
         if additional_type not in cls._REGISTRY or override:
             cls._REGISTRY[additional_type] = transformer
+            cls._TRANSFORMER_CACHE.clear()
 
     @classmethod
     def get_transformer(cls, python_type: Type) -> TypeTransformer[T]:
@@ -908,8 +913,31 @@ class TypeEngine(typing.Generic[T]):
 
         Step 5:
             if v is of type data class, use the dataclass transformer
+
+        The result is memoized per python type until the next call to ``register`` or ``register_additional_type``.
+        Unhashable typing constructs (e.g. ``Annotated[StructuredDataset, kwtypes(a=int)]``) bypass the cache.
         """
         cls.lazy_import_transformers()
+        try:
+            return cls._TRANSFORMER_CACHE[python_type]
+        except KeyError:
+            pass
+        except TypeError:
+            return cls._get_transformer(python_type)
+
+        transformer = cls._get_transformer(python_type)
+        cls._TRANSFORMER_CACHE[python_type] = transformer
+        return transformer
+
+    @classmethod
+    def clear_transformer_cache(cls):
+        """
+        Drops all memoized ``get_transformer`` results. Call this after mutating ``_REGISTRY`` directly.
+        """
+        cls._TRANSFORMER_CACHE.clear()
+
+    @classmethod
+    def _get_transformer(cls, python_type: Type) -> TypeTransformer[T]:
         # Step 1
         if is_annotated(python_type):
             args = get_args(python_type)
@@ -1197,6 +1225,21 @@ class TypeEngine(typing.Generic[T]):
         raise ValueError(f"No transformers could reverse Nebula literal type {nebula_type}")
 
 
+# Element types for which ListTransformer builds and reads the collection literals directly.
+_PRIMITIVE_LITERAL_BUILDERS: typing.Dict[Type, typing.Callable[[typing.Any], Primitive]] = {
+    int: lambda x: Primitive(integer=x),
+    float: lambda x: Primitive(float_value=x),
+    str: lambda x: Primitive(string_value=x),
+    bool: lambda x: Primitive(boolean=x),
+}
+_PRIMITIVE_VALUE_GETTERS: typing.Dict[Type, typing.Callable[[Literal], typing.Any]] = {
+    int: attrgetter("scalar.primitive.integer"),
+    float: attrgetter("scalar.primitive.float_value"),
+    str: attrgetter("scalar.primitive.string_value"),
+    bool: attrgetter("scalar.primitive.boolean"),
+}
+
+
 class ListTransformer(TypeTransformer[T]):
     """
     Transformer that handles a univariate typing.List[T]
@@ -1257,10 +1300,41 @@ class ListTransformer(TypeTransformer[T]):
                 return True
         return False
 
+    @staticmethod
+    def is_primitive_sub_type(t: Optional[Type]) -> bool:
+        """
+        Whether the list element type is one of the primitives handled by the single-pass fast path.
+        """
+        # The isinstance check avoids hashing typing constructs, some of which (e.g. Annotated with a dict) are unhashable
+        return isinstance(t, type) and t in _PRIMITIVE_LITERAL_BUILDERS
+
     def to_literal(self, ctx: NebulaContext, python_val: T, python_type: Type[T], expected: LiteralType) -> Literal:
+        if is_imported("numpy") and self.is_primitive_sub_type(self.get_sub_type_or_none(python_type)):
+            import numpy as np
+
+            # One-dimensional numpy arrays are accepted for lists of primitives, tolist() yields native python scalars
+            if isinstance(python_val, np.ndarray) and python_val.ndim == 1:
+                python_val = python_val.tolist()
+
         if type(python_val) != list:
             raise TypeTransformerFailedError("Expected a list")
 
+        t = self.get_sub_type(python_type)
+        # Only lists made entirely of native primitives take the fast path, anything else (e.g. promises in local
+        # workflow executions) is converted element by element
+        if self.is_primitive_sub_type(t) and all(type(x) is t for x in python_val):  # type: ignore
+            lit_list = self._primitives_to_literals(python_val, t)  # type: ignore
+        else:
+            from nebulakit.types.pickle.pickle import PickleStore
+
+            # Elements that are pickled are packed into a single blob
+            with PickleStore.batch():
+                lit_list = self._to_literals(ctx, python_val, python_type, expected)  # type: ignore
+        return Literal(collection=LiteralCollection(literals=lit_list))
+
+    def _to_literals(
+        self, ctx: NebulaContext, python_val: typing.List[typing.Any], python_type: Type, expected: LiteralType
+    ) -> typing.List[Literal]:
         if ListTransformer.is_batchable(python_type):
             from nebulakit.types.pickle.pickle import BatchSize, NebulaPickle
 
@@ -1281,7 +1355,35 @@ class ListTransformer(TypeTransformer[T]):
         else:
             t = self.get_sub_type(python_type)
             lit_list = [TypeEngine.to_literal(ctx, x, t, expected.collection_type) for x in python_val]  # type: ignore
-        return Literal(collection=LiteralCollection(literals=lit_list))
+        return lit_list
+
+    @staticmethod
+    def _primitives_to_literals(python_val: typing.List[typing.Any], t: Type) -> typing.List[Literal]:
+        """
+        Fast path for lists of int, float, str and bool whose elements are all of type t. Builds the element literals
+        in a single pass instead of dispatching every element through the TypeEngine; primitives carry no hash
+        annotations nor uris to rewrite.
+        """
+        build = _PRIMITIVE_LITERAL_BUILDERS[t]
+        return [Literal(scalar=Scalar(primitive=build(x))) for x in python_val]
+
+    @staticmethod
+    def _literals_to_primitives(ctx: NebulaContext, lits: typing.List[Literal], t: Type) -> typing.List[typing.Any]:
+        """
+        Fast path counterpart of _primitives_to_literals. Elements that don't hold the expected primitive (e.g. an
+        integer in a list of floats) fall back to the regular TypeEngine conversion.
+        """
+        get = _PRIMITIVE_VALUE_GETTERS[t]
+        values = []
+        for lv in lits:
+            try:
+                v = get(lv)
+            except AttributeError:
+                v = None
+            if type(v) is not t:
+                v = TypeEngine.to_python_value(ctx, lv, t)
+            values.append(v)
+        return values
 
     def to_python_value(self, ctx: NebulaContext, lv: Literal, expected_python_type: Type[T]) -> typing.List[typing.Any]:  # type: ignore
         try:
@@ -1304,6 +1406,8 @@ class ListTransformer(TypeTransformer[T]):
             return batch_list
         else:
             st = self.get_sub_type(expected_python_type)
+            if self.is_primitive_sub_type(st):
+                return self._literals_to_primitives(ctx, lits, st)
             return [TypeEngine.to_python_value(ctx, x, st) for x in lits]
 
     def guess_python_type(self, literal_type: LiteralType) -> list:  # type: ignore
@@ -1589,13 +1693,17 @@ class DictTransformer(TypeTransformer[dict]):
         if expected and expected.simple and expected.simple == SimpleType.STRUCT:
             return self.dict_to_generic_literal(python_val)
 
+        from nebulakit.types.pickle.pickle import PickleStore
+
         lit_map = {}
-        for k, v in python_val.items():
-            if type(k) != str:
-                raise ValueError("Nebula MapType expects all keys to be strings")
-            # TODO: log a warning for Annotated objects that contain HashMethod
-            k_type, v_type = self.get_dict_types(python_type)
-            lit_map[k] = TypeEngine.to_literal(ctx, v, cast(type, v_type), expected.map_value_type)
+        # Values that are pickled are packed into a single blob
+        with PickleStore.batch():
+            for k, v in python_val.items():
+                if type(k) != str:
+                    raise ValueError("Nebula MapType expects all keys to be strings")
+                # TODO: log a warning for Annotated objects that contain HashMethod
+                k_type, v_type = self.get_dict_types(python_type)
+                lit_map[k] = TypeEngine.to_literal(ctx, v, cast(type, v_type), expected.map_value_type)
         return Literal(map=LiteralMap(literals=lit_map))
 
     def to_python_value(self, ctx: NebulaContext, lv: Literal, expected_python_type: Type[dict]) -> dict:
@@ -3,6 +3,8 @@ from __future__ import annotations
 import asyncio
 import inspect
 import typing
+from concurrent.futures import FIRST_COMPLETED, Future
+from concurrent.futures import wait as wait_futures
 from dataclasses import dataclass
 from enum import Enum
 from functools import update_wrapper
@@ -27,6 +29,7 @@ from nebulakit.core.interface import (
     transform_interface_to_typed_interface,
 )
 from nebulakit.core.launch_plan import LaunchPlan
+from nebulakit.core.local_executor import ContextPool, LocalExecutor
 from nebulakit.core.node import Node
 from nebulakit.core.promise import (
     NodeOutput,
@@ -174,6 +177,48 @@ def get_promise_map(
     return entity_kwargs
 
 
+def _binding_upstream_nodes(binding_data: _literal_models.BindingData, upstream: List[Node]) -> bool:
+    """
+    Appends the nodes whose outputs the binding reads to ``upstream``. Returns False if the binding cannot be resolved
+    from the outputs of upstream nodes alone, i.e. if it reads an attribute of an output.
+    """
+    if binding_data.promise is not None:
+        if binding_data.promise.attr_path:
+            return False
+        upstream.append(binding_data.promise.node)
+    elif binding_data.collection is not None:
+        return all(_binding_upstream_nodes(bd, upstream) for bd in binding_data.collection.bindings)
+    elif binding_data.map is not None:
+        return all(_binding_upstream_nodes(bd, upstream) for bd in binding_data.map.bindings.values())
+    return True
+
+
+def execute_node(node: Node, entity_kwargs: Dict[str, Promise]) -> Dict[str, Promise]:
+    """
+    Locally executes the entity of a node with the given inputs, returning its outputs by name.
+    """
+    entity = node.nebula_entity
+    results = entity(**entity_kwargs)
+    expected_output_names = list(entity.python_interface.outputs.keys())
+
+    if isinstance(results, VoidPromise) or results is None:
+        return {}  # Move along, nothing to assign
+
+    # Because we should've already returned in the above check, we just raise an Exception here.
+    if len(entity.python_interface.outputs) == 0:
+        raise NebulaValueException(results, "Interface output should've been VoidPromise or None.")
+
+    # if there's only one output,
+    if len(expected_output_names) == 1:
+        if entity.python_interface.output_tuple_name and isinstance(results, tuple):
+            return {expected_output_names[0]: results[0]}
+        return {expected_output_names[0]: results}
+
+    if len(results) != len(expected_output_names):
+        raise NebulaValueException(results, f"Different lengths {results} {expected_output_names}")
+    return {expected_output_names[idx]: r for idx, r in enumerate(results)}
+
+
 class WorkflowBase(object):
     def __init__(
         self,
@@ -351,6 +396,81 @@ class WorkflowBase(object):
         """ """
         return ExecutionState.Mode.LOCAL_WORKFLOW_EXECUTION
 
+    def _node_dependencies(self) -> Optional[Dict[Node, List[Node]]]:
+        """
+        Returns the nodes of the workflow each node depends on, or None if the nodes cannot be executed out of order,
+        because some of them are not plain task, workflow or launch plan nodes (conditionals, gates, ...), or read
+        attributes of the outputs of other nodes.
+        """
+        dependencies = {}
+        for node in self.nodes:
+            if not isinstance(node.nebula_entity, (PythonTask, WorkflowBase, LaunchPlan)):
+                return None
+            upstream = list(node.upstream_nodes)
+            if not all(_binding_upstream_nodes(b.binding, upstream) for b in node.bindings):
+                return None
+            dependencies[node] = [n for n in upstream if n.id != _common_constants.GLOBAL_INPUT_NODE_ID]
+        return dependencies
+
+    def _execute_nodes(self, intermediate_node_outputs: Dict[Node, Dict[str, Promise]]):
+        """
+        Executes the nodes of the workflow in order, filling in intermediate_node_outputs. If local executions are
+        configured to be parallel (see LocalExecutor), nodes run concurrently as soon as their upstream nodes are done.
+        """
+        dependencies = self._node_dependencies() if LocalExecutor.is_parallel() and len(self.nodes) > 1 else None
+        if dependencies is None:
+            for node in self.nodes:
+                # Retrieve the entity from the node, and call it by looking up the promises the node's bindings
+                # require, and then fill them in using the node output tracker map we have.
+                entity_kwargs = get_promise_map(node.bindings, intermediate_node_outputs)
+                intermediate_node_outputs[node] = execute_node(node, entity_kwargs)
+            return
+
+        nodes = self.nodes
+
+        # Literals rather than promises go in and out of the pool, as they can be pickled for process pools
+        def _execute(index: int, input_literals: Dict[str, _literal_models.Literal]) -> Dict[str, Any]:
+            entity_kwargs = {k: Promise(var=k, val=v) for k, v in input_literals.items()}
+            return {k: p.val for k, p in execute_node(nodes[index], entity_kwargs).items()}
+
+        pool = cast(ContextPool, LocalExecutor.pool(_execute))
+        with pool:
+            pending = list(range(len(nodes)))
+            running: Dict[Future, int] = {}
+            while pending or running:
+                for i in [i for i in pending if all(n in intermediate_node_outputs for n in dependencies[nodes[i]])]:
+                    pending.remove(i)
+                    entity_kwargs = get_promise_map(nodes[i].bindings, intermediate_node_outputs)
+                    running[pool.submit(i, {k: p.val for k, p in entity_kwargs.items()})] = i
+                if not running:
+                    raise NebulaValidationException(f"Nodes {[nodes[i].id for i in pending]} depend on missing nodes")
+                done, _ = wait_futures(running, return_when=FIRST_COMPLETED)
+                for f in done:
+                    i = running.pop(f)
+                    intermediate_node_outputs[nodes[i]] = {k: Promise(var=k, val=v) for k, v in f.result().items()}
+
+    def _output_promises(self, intermediate_node_outputs: Dict[Node, Dict[str, Promise]]):
+        """
+        Fulfills the output bindings of the workflow from the outputs of its nodes.
+        """
+        if len(self.python_interface.outputs) == 0:
+            return VoidPromise(self.name)
+
+        # The values that we return below from the output have to be pulled by fulfilling all of the
+        # workflow's output bindings.
+        # The return style here has to match what 1) what the workflow would've returned had it been declared
+        # functionally, and 2) what a user would return in mock function. That is, if it's a tuple, then it
+        # should be a tuple here, if it's a one element named tuple, then we do a one-element non-named tuple,
+        # if it's a single element then we return a single element
+        if len(self.output_bindings) == 1:
+            # Again use presence of output_tuple_name to understand that we're dealing with a one-element
+            # named tuple
+            if self.python_interface.output_tuple_name:
+                return (get_promise(self.output_bindings[0].binding, intermediate_node_outputs),)
+            # Just a normal single element
+            return get_promise(self.output_bindings[0].binding, intermediate_node_outputs)
+        return tuple([get_promise(b.binding, intermediate_node_outputs) for b in self.output_bindings])
+
 
 class ImperativeWorkflow(WorkflowBase):
     """
@@ -452,59 +572,12 @@ class ImperativeWorkflow(WorkflowBase):
         for k, v in kwargs.items():
             intermediate_node_outputs[GLOBAL_START_NODE][k] = v
 
-        # Next iterate through the nodes in order.
-        for node in self.compilation_state.nodes:
-            if node not in intermediate_node_outputs.keys():
-                intermediate_node_outputs[node] = {}
-
-            # Retrieve the entity from the node, and call it by looking up the promises the node's bindings require,
-            # and then fill them in using the node output tracker map we have.
-            entity = node.nebula_entity
-            entity_kwargs = get_promise_map(node.bindings, intermediate_node_outputs)
-
-            # Handle the calling and outputs of each node's entity
-            results = entity(**entity_kwargs)
-            expected_output_names = list(entity.python_interface.outputs.keys())
-
-            if isinstance(results, VoidPromise) or results is None:
-                continue  # pragma: no cover # Move along, nothing to assign
-
-            # Because we should've already returned in the above check, we just raise an Exception here.
-            if len(entity.python_interface.outputs) == 0:
-                raise NebulaValueException(results, "Interface output should've been VoidPromise or None.")
-
-            # if there's only one output,
-            if len(expected_output_names) == 1:
-                if entity.python_interface.output_tuple_name and isinstance(results, tuple):
-                    intermediate_node_outputs[node][expected_output_names[0]] = results[0]
-                else:
-                    intermediate_node_outputs[node][expected_output_names[0]] = results
-
-            else:
-                if len(results) != len(expected_output_names):
-                    raise NebulaValueException(results, f"Different lengths {results} {expected_output_names}")
-                for idx, r in enumerate(results):
-                    intermediate_node_outputs[node][expected_output_names[idx]] = r
+        # Next run the nodes, in order or concurrently if local executions are parallel.
+        self._execute_nodes(intermediate_node_outputs)
 
         # The rest of this function looks like the above but now we're doing it for the workflow as a whole rather
         # than just one node at a time.
-        if len(self.python_interface.outputs) == 0:
-            return VoidPromise(self.name)
-
-        # The values that we return below from the output have to be pulled by fulfilling all of the
-        # workflow's output bindings.
-        # The return style here has to match what 1) what the workflow would've returned had it been declared
-        # functionally, and 2) what a user would return in mock function. That is, if it's a tuple, then it
-        # should be a tuple here, if it's a one element named tuple, then we do a one-element non-named tuple,
-        # if it's a single element then we return a single element
-        if len(self.output_bindings) == 1:
-            # Again use presence of output_tuple_name to understand that we're dealing with a one-element
-            # named tuple
-            if self.python_interface.output_tuple_name:
-                return (get_promise(self.output_bindings[0].binding, intermediate_node_outputs),)
-            # Just a normal single element
-            return get_promise(self.output_bindings[0].binding, intermediate_node_outputs)
-        return tuple([get_promise(b.binding, intermediate_node_outputs) for b in self.output_bindings])
+        return self._output_promises(intermediate_node_outputs)
 
     def create_conditional(self, name: str) -> ConditionalSection:
         ctx = NebulaContext.current_context()
@@ -749,7 +822,14 @@ class PythonFunctionWorkflow(WorkflowBase, ClassStorageTaskResolver):
         This function is here only to try to streamline the pattern between workflows and tasks. Since tasks
         call execute from dispatch_execute which is in local_execute, workflows should also call an execute inside
         local_execute. This makes mocking cleaner.
+
+        If local executions are parallel (see LocalExecutor), the compiled nodes are executed instead of the function,
+        so that nodes without dependencies between them run concurrently.
         """
+        if LocalExecutor.is_parallel() and len(self.nodes) > 1 and self._node_dependencies() is not None:
+            intermediate_node_outputs: Dict[Node, Dict[str, Promise]] = {GLOBAL_START_NODE: kwargs}
+            self._execute_nodes(intermediate_node_outputs)
+            return self._output_promises(intermediate_node_outputs)
         return exception_scopes.user_entry_point(self._workflow_function)(**kwargs)
 
 
@@ -1,6 +1,8 @@
+from contextvars import ContextVar
 from functools import wraps as _wraps
 from sys import exc_info as _exc_info
 from traceback import format_tb as _format_tb
+from typing import Tuple
 
 from nebulakit.exceptions import base as _base_exceptions
 from nebulakit.exceptions import system as _system_exceptions
@@ -125,12 +127,14 @@ _NULL_CONTEXT = 0
 _USER_CONTEXT = 1
 _SYSTEM_CONTEXT = 2
 
-# Keep the stack with a null-context so we never have to range check when peeking back.
-_CONTEXT_STACK = [_NULL_CONTEXT]
+# Keep the stack with a null-context so we never have to range check when peeking back. The stack is kept in a context
+# variable so that code running concurrently in several threads, such as the elements of a map task, does not
+# interleave its scopes.
+_CONTEXT_STACK: ContextVar[Tuple[int, ...]] = ContextVar("nebula_scope_stack", default=(_NULL_CONTEXT,))
 
 
 def _is_base_context():
-    return _CONTEXT_STACK[-2] == _NULL_CONTEXT
+    return _CONTEXT_STACK.get()[-2] == _NULL_CONTEXT
 
 
 def _decorator(outer_f):
@@ -163,8 +167,9 @@ def system_entry_point(wrapped, args, kwargs):
     user -- allowing them to know if they should take action themselves or pass on to the platform owners.
     We will dispatch metrics and such appropriately.
     """
+    parent_stack = _CONTEXT_STACK.get()
     try:
-        _CONTEXT_STACK.append(_SYSTEM_CONTEXT)
+        _CONTEXT_STACK.set(parent_stack + (_SYSTEM_CONTEXT,))
         if _is_base_context():
             # If this is the first time either of this decorator, or the one below is called, then we unwrap the
             # exception. The first time these decorators are used is currently in the entrypoint.py file. The scoped
@@ -187,7 +192,7 @@ def system_entry_point(wrapped, args, kwargs):
                 # System error, raise full stack-trace all the way up the chain.
                 raise NebulaScopedSystemException(*_exc_info(), kind=_error_model.ContainerError.Kind.RECOVERABLE)
     finally:
-        _CONTEXT_STACK.pop()
+        _CONTEXT_STACK.set(parent_stack)
 
 
 @_decorator
@@ -203,8 +208,9 @@ def user_entry_point(wrapped, args, kwargs):
     we create here will only be handled within our system code so we don't need to worry about leaking weird exceptions
     to the user.
     """
+    parent_stack = _CONTEXT_STACK.get()
     try:
-        _CONTEXT_STACK.append(_USER_CONTEXT)
+        _CONTEXT_STACK.set(parent_stack + (_USER_CONTEXT,))
         if _is_base_context():
             # See comment at this location for system_entry_point
             fn_name = wrapped.__name__
@@ -229,4 +235,4 @@ def user_entry_point(wrapped, args, kwargs):
                 # This will also catch NebulaUserException re-raised by the system_entry_point handler
                 raise NebulaScopedUserException(*_exc_info())
     finally:
-        _CONTEXT_STACK.pop()
+        _CONTEXT_STACK.set(parent_stack)
@@ -1,13 +1,17 @@
 import abc as _abc
+import functools as _functools
 import json as _json
 import re
-from typing import Dict
+import threading as _threading
+from typing import Any, Callable, Dict, TypeVar
 
 from nebulaidl.admin import common_pb2 as _common_pb2
 from nebulaidl.core import literals_pb2 as _literals_pb2
 from google.protobuf import json_format as _json_format
 from google.protobuf import struct_pb2 as _struct
 
+from nebulakit.configuration.feature_flags import FeatureFlags
+
 
 class NebulaABCMeta(_abc.ABCMeta):
     def __instancecheck__(cls, instance):
@@ -81,6 +85,94 @@ class NebulaIdlEntity(object, metaclass=NebulaType):
         pass
 
 
+# Guards the swap of the attributes of a ProtoBackedIdlEntity, decoding happens outside of it
+_materialize_lock = _threading.Lock()
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def materialized(fn: _F) -> _F:
+    """
+    Decorates the accessors of a :py:class:`ProtoBackedIdlEntity` so that the backing message, if any, is decoded before
+    they run.
+    """
+
+    @_functools.wraps(fn)
+    def wrapper(self, *args, **kwargs):
+        if self._pb is not None:
+            self._materialize()
+        return fn(self, *args, **kwargs)
+
+    return wrapper  # type: ignore
+
+
+class ProtoBackedIdlEntity(NebulaIdlEntity):
+    """
+    A NebulaIdlEntity that can act as a lazy view over the protobuf message it was parsed from. When
+    ``FeatureFlags.NEBULA_PROTO_BACKED_LITERALS`` is enabled, ``from_nebula_idl`` keeps a reference to the message and
+    defers decoding until one of the fields is read. As long as the entity is not decoded, ``to_nebula_idl`` returns
+    that same message (which must then be treated as read-only) and hashing reuses its serialized bytes.
+
+    Subclasses implement ``_fields_from_nebula_idl`` and ``_to_nebula_idl``, and decorate the accessors of their own
+    attributes with :py:func:`materialized`. Views can be shared across threads: the message is decoded into a new
+    entity and its attributes are swapped in at once, so that readers never see a partially decoded entity.
+    """
+
+    _pb = None
+    _pb_bytes = None
+
+    @classmethod
+    def from_nebula_idl(cls, pb2_object):
+        if FeatureFlags.NEBULA_PROTO_BACKED_LITERALS:
+            view = cls.__new__(cls)
+            view._pb = pb2_object
+            return view
+        return cls(**cls._fields_from_nebula_idl(pb2_object))
+
+    @classmethod
+    @_abc.abstractmethod
+    def _fields_from_nebula_idl(cls, pb2_object) -> Dict[str, Any]:
+        """
+        Returns the keyword arguments of ``__init__`` decoded from the given message.
+        """
+        pass
+
+    @_abc.abstractmethod
+    def _to_nebula_idl(self):
+        pass
+
+    def _materialize(self):
+        """
+        Decodes the backing message, if any, into regular attributes. The entity can be mutated afterwards, so it stops
+        being backed by the message.
+        """
+        pb = self._pb
+        if pb is None:
+            return
+        decoded = type(self)(**self._fields_from_nebula_idl(pb))
+        with _materialize_lock:
+            # Another thread may have decoded the message first, and mutated the entity since
+            if self._pb is pb:
+                self.__dict__.update(decoded.__dict__)
+                self._pb = None
+                self._pb_bytes = None
+
+    def to_nebula_idl(self):
+        pb = self._pb
+        if pb is not None:
+            return pb
+        return self._to_nebula_idl()
+
+    def __hash__(self):
+        pb = self._pb
+        if pb is None:
+            return super().__hash__()
+        pb_bytes = self._pb_bytes
+        if pb_bytes is None:
+            pb_bytes = self._pb_bytes = pb.SerializeToString(deterministic=True)
+        return hash(pb_bytes)
+
+
 class NebulaCustomIdlEntity(NebulaIdlEntity):
     @classmethod
     def from_nebula_idl(cls, idl_object):
@@ -45,7 +45,7 @@ class RetryStrategy(_common.NebulaIdlEntity):
         return cls(retries=pb2_object.retries)
 
 
-class Primitive(_common.NebulaIdlEntity):
+class Primitive(_common.ProtoBackedIdlEntity):
     def __init__(
         self,
         integer=None,
@@ -77,6 +77,7 @@ class Primitive(_common.NebulaIdlEntity):
         self._duration = duration
 
     @property
+    @_common.materialized
     def integer(self):
         """
         :rtype: int
@@ -84,6 +85,7 @@ class Primitive(_common.NebulaIdlEntity):
         return self._integer
 
     @property
+    @_common.materialized
     def float_value(self):
         """
         :rtype: float
@@ -91,6 +93,7 @@ class Primitive(_common.NebulaIdlEntity):
         return self._float_value
 
     @property
+    @_common.materialized
     def string_value(self):
         """
         :rtype: Text
@@ -98,6 +101,7 @@ class Primitive(_common.NebulaIdlEntity):
         return self._string_value
 
     @property
+    @_common.materialized
     def boolean(self):
         """
         :rtype: bool
@@ -105,6 +109,7 @@ class Primitive(_common.NebulaIdlEntity):
         return self._boolean
 
     @property
+    @_common.materialized
     def datetime(self):
         """
         :rtype: datetime.datetime
@@ -114,6 +119,7 @@ class Primitive(_common.NebulaIdlEntity):
         return self._datetime.replace(tzinfo=_timezone.utc)
 
     @property
+    @_common.materialized
     def duration(self):
         """
         :rtype: datetime.timedelta
@@ -137,7 +143,7 @@ class Primitive(_common.NebulaIdlEntity):
             if value is not None:
                 return value
 
-    def to_nebula_idl(self):
+    def _to_nebula_idl(self):
         """
         :rtype: nebulaidl.core.literals_pb2.Primitive
         """
@@ -155,12 +161,12 @@ class Primitive(_common.NebulaIdlEntity):
         return primitive
 
     @classmethod
-    def from_nebula_idl(cls, proto):
+    def _fields_from_nebula_idl(cls, proto):
         """
         :param nebulaidl.core.literals_pb2.Primitive proto:
-        :rtype: Primitive
+        :rtype: dict[Text, T]
         """
-        return cls(
+        return dict(
             integer=proto.integer if proto.HasField("integer") else None,
             float_value=proto.float_value if proto.HasField("float_value") else None,
             string_value=proto.string_value if proto.HasField("string_value") else None,
@@ -641,7 +647,7 @@ class StructuredDataset(_common.NebulaIdlEntity):
         return cls(uri=pb2_object.uri, metadata=StructuredDatasetMetadata.from_nebula_idl(pb2_object.metadata))
 
 
-class LiteralCollection(_common.NebulaIdlEntity):
+class LiteralCollection(_common.ProtoBackedIdlEntity):
     def __init__(self, literals):
         """
         :param list[Literal] literals: underlying list of literals in this collection.
@@ -649,28 +655,29 @@ class LiteralCollection(_common.NebulaIdlEntity):
         self._literals = literals
 
     @property
+    @_common.materialized
     def literals(self):
         """
         :rtype: list[Literal]
         """
         return self._literals
 
-    def to_nebula_idl(self):
+    def _to_nebula_idl(self):
         """
         :rtype: nebulaidl.core.literals_pb2.LiteralCollection
         """
         return _literals_pb2.LiteralCollection(literals=[l.to_nebula_idl() for l in self.literals])
 
     @classmethod
-    def from_nebula_idl(cls, pb2_object):
+    def _fields_from_nebula_idl(cls, pb2_object):
         """
         :param nebulaidl.core.literals_pb2.LiteralCollection pb2_object:
-        :rtype: LiteralCollection
+        :rtype: dict[Text, T]
         """
-        return cls([Literal.from_nebula_idl(l) for l in pb2_object.literals])
+        return dict(literals=[Literal.from_nebula_idl(l) for l in pb2_object.literals])
 
 
-class LiteralMap(_common.NebulaIdlEntity):
+class LiteralMap(_common.ProtoBackedIdlEntity):
     def __init__(self, literals):
         """
         :param dict[Text, Literal] literals: A dictionary mapping Text key names to Literal objects.
@@ -678,6 +685,7 @@ class LiteralMap(_common.NebulaIdlEntity):
         self._literals = literals
 
     @property
+    @_common.materialized
     def literals(self):
         """
         A dictionary mapping Text key names to Literal objects.
@@ -685,22 +693,22 @@ class LiteralMap(_common.NebulaIdlEntity):
         """
         return self._literals
 
-    def to_nebula_idl(self):
+    def _to_nebula_idl(self):
         """
         :rtype: nebulaidl.core.literals_pb2.LiteralMap
         """
         return _literals_pb2.LiteralMap(literals={k: v.to_nebula_idl() for k, v in self.literals.items()})
 
     @classmethod
-    def from_nebula_idl(cls, pb2_object):
+    def _fields_from_nebula_idl(cls, pb2_object):
         """
         :param nebulaidl.core.literals_pb2.LiteralMap pb2_object:
-        :rtype: LiteralMap
+        :rtype: dict[Text, T]
         """
-        return cls({k: Literal.from_nebula_idl(v) for k, v in pb2_object.literals.items()})
+        return dict(literals={k: Literal.from_nebula_idl(v) for k, v in pb2_object.literals.items()})
 
 
-class Scalar(_common.NebulaIdlEntity):
+class Scalar(_common.ProtoBackedIdlEntity):
     def __init__(
         self,
         primitive: Primitive = None,
@@ -737,6 +745,7 @@ class Scalar(_common.NebulaIdlEntity):
         self._structured_dataset = structured_dataset
 
     @property
+    @_common.materialized
     def primitive(self):
         """
         :rtype: Primitive
@@ -744,6 +753,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._primitive
 
     @property
+    @_common.materialized
     def blob(self):
         """
         :rtype: Blob
@@ -751,6 +761,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._blob
 
     @property
+    @_common.materialized
     def binary(self):
         """
         :rtype: Binary
@@ -758,6 +769,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._binary
 
     @property
+    @_common.materialized
     def schema(self):
         """
         :rtype: Schema
@@ -765,6 +777,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._schema
 
     @property
+    @_common.materialized
     def union(self):
         """
         :rtype: Union
@@ -772,6 +785,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._union
 
     @property
+    @_common.materialized
     def none_type(self):
         """
         :rtype: Void
@@ -779,6 +793,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._none_type
 
     @property
+    @_common.materialized
     def error(self):
         """
         :rtype: TODO
@@ -786,6 +801,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._error
 
     @property
+    @_common.materialized
     def generic(self):
         """
         :rtype: google.protobuf.struct_pb2.Struct
@@ -793,6 +809,7 @@ class Scalar(_common.NebulaIdlEntity):
         return self._generic
 
     @property
+    @_common.materialized
     def structured_dataset(self) -> StructuredDataset:
         return self._structured_dataset
 
@@ -814,7 +831,7 @@ class Scalar(_common.NebulaIdlEntity):
             or self.structured_dataset
         )
 
-    def to_nebula_idl(self):
+    def _to_nebula_idl(self):
         """
         :rtype: nebulaidl.core.literals_pb2.Scalar
         """
@@ -831,13 +848,13 @@ class Scalar(_common.NebulaIdlEntity):
         )
 
     @classmethod
-    def from_nebula_idl(cls, pb2_object):
+    def _fields_from_nebula_idl(cls, pb2_object):
         """
         :param nebulaidl.core.literals_pb2.Scalar pb2_object:
-        :rtype: nebulakit.models.literals.Scalar
+        :rtype: dict[Text, T]
         """
         # todo finish
-        return cls(
+        return dict(
             primitive=Primitive.from_nebula_idl(pb2_object.primitive) if pb2_object.HasField("primitive") else None,
             blob=Blob.from_nebula_idl(pb2_object.blob) if pb2_object.HasField("blob") else None,
             binary=Binary.from_nebula_idl(pb2_object.binary) if pb2_object.HasField("binary") else None,
@@ -852,7 +869,7 @@ class Scalar(_common.NebulaIdlEntity):
         )
 
 
-class Literal(_common.NebulaIdlEntity):
+class Literal(_common.ProtoBackedIdlEntity):
     def __init__(
         self, scalar: Scalar = None, collection: LiteralCollection = None, map: LiteralMap = None, hash: str = None
     ):
@@ -869,6 +886,7 @@ class Literal(_common.NebulaIdlEntity):
         self._hash = hash
 
     @property
+    @_common.materialized
     def scalar(self):
         """
         If not None, this value holds a scalar value which can be further unpacked.
@@ -877,6 +895,7 @@ class Literal(_common.NebulaIdlEntity):
         return self._scalar
 
     @property
+    @_common.materialized
     def collection(self):
         """
         If not None, this value holds a collection of Literal values which can be further unpacked.
@@ -885,6 +904,7 @@ class Literal(_common.NebulaIdlEntity):
         return self._collection
 
     @property
+    @_common.materialized
     def map(self):
         """
         If not None, this value holds a map of Literal values which can be further unpacked.
@@ -901,6 +921,7 @@ class Literal(_common.NebulaIdlEntity):
         return self.scalar or self.collection or self.map
 
     @property
+    @_common.materialized
     def hash(self):
         """
         If not None, this value holds a hash that represents the literal for caching purposes.
@@ -909,10 +930,11 @@ class Literal(_common.NebulaIdlEntity):
         return self._hash
 
     @hash.setter
+    @_common.materialized
     def hash(self, value):
         self._hash = value
 
-    def to_nebula_idl(self):
+    def _to_nebula_idl(self):
         """
         :rtype: nebulaidl.core.literals_pb2.Literal
         """
@@ -924,16 +946,16 @@ class Literal(_common.NebulaIdlEntity):
         )
 
     @classmethod
-    def from_nebula_idl(cls, pb2_object):
+    def _fields_from_nebula_idl(cls, pb2_object):
         """
         :param nebulaidl.core.literals_pb2.Literal pb2_object:
-        :rtype: Literal
+        :rtype: dict[Text, T]
         """
         collection = None
         if pb2_object.HasField("collection"):
             collection = LiteralCollection.from_nebula_idl(pb2_object.collection)
 
-        return cls(
+        return dict(
             scalar=Scalar.from_nebula_idl(pb2_object.scalar) if pb2_object.HasField("scalar") else None,
             collection=collection,
             map=LiteralMap.from_nebula_idl(pb2_object.map) if pb2_object.HasField("map") else None,
@@ -784,16 +784,19 @@ class NebulaRemote(object):
         fwf._python_interface = entity.python_interface
         return fwf
 
-    def fast_package(self, root: os.PathLike, deref_symlinks: bool = True, output: str = None) -> (bytes, str):
+    def fast_package(
+        self, root: os.PathLike, deref_symlinks: bool = True, output: str = None, compression: str = "gzip"
+    ) -> (bytes, str):
         """
         Packages the given paths into an installable zip and returns the md5_bytes and the URL of the uploaded location
         :param root: path to the root of the package system that should be uploaded
         :param output: output path. Optional, will default to a tempdir
         :param deref_symlinks: if symlinks should be dereferenced. Defaults to True
+        :param compression: gzip, or zstd to compress with all cores, which requires the zstandard package
         :return: md5_bytes, url
         """
         # Create a zip file containing all the entries.
-        zip_file = fast_package(root, output, deref_symlinks)
+        zip_file = fast_package(root, output, deref_symlinks, compression=compression)
         md5_bytes, _, _ = hash_file(pathlib.Path(zip_file))
 
         # Upload zip file to Admin using NebulaRemote.
@@ -824,14 +827,14 @@ class NebulaRemote(object):
 
         extra_headers = self.get_extra_headers_for_protocol(upload_location.native_url)
         encoded_md5 = b64encode(md5_bytes)
-        with open(str(to_upload), "+rb") as local_file:
-            content = local_file.read()
-            content_length = len(content)
+        with open(str(to_upload), "rb") as local_file:
+            content_length = os.fstat(local_file.fileno()).st_size
             headers = {"Content-Length": str(content_length), "Content-MD5": encoded_md5}
             headers.update(extra_headers)
+            # Passing the file streams it, rather than holding the whole file in memory
             rsp = requests.put(
                 upload_location.signed_url,
-                data=content,
+                data=local_file,
                 headers=headers,
                 verify=False
                 if self._config.platform.insecure_skip_verify is True
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
+import asyncio
 import base64
 import hashlib
 import os
 import pathlib
 import random
+import shutil
+import tempfile
 import threading
 import typing
 from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
 
 import fsspec
@@ -32,6 +36,9 @@ REMOTE_PLACEHOLDER = "nebula://data"
 
 HashStructure = typing.Dict[str, typing.Tuple[bytes, int]]
 
+# Files written through NebulaFS.open are kept in memory up to this size, and spooled to a temporary file beyond it
+_SPOOL_MAX_SIZE = 16 * 2**20
+
 
 class NebulaPathResolver:
     protocol = "nebula://"
@@ -62,23 +69,17 @@ class HttpFileWriter(fsspec.spec.AbstractBufferedFile):
         super().__init__(**kwargs)
         self._remote = remote
         self._filename = filename
+        self._spool = tempfile.SpooledTemporaryFile(max_size=_SPOOL_MAX_SIZE)
 
     def _upload_chunk(self, final=False):
-        """Only uploads the file at once from the buffer.
-        Not suitable for large files as the buffer will blow the memory for very large files.
-        Suitable for default values or local dataframes being uploaded all at once.
         """
-        if final is False:
-            return False
+        Moves the buffer to a spool, kept in memory for small files and in a temporary file for large ones, and
+        uploads the spool in a single streamed request once the file is closed.
+        """
         self.buffer.seek(0)
-        data = self.buffer.read()
-
-        # h = hashlib.md5()
-        # h.update(data)
-        # md5 = h.digest()
-        # l = len(data)
-        #
-        # headers = {"Content-Length": str(l), "Content-MD5": md5}
+        shutil.copyfileobj(self.buffer, self._spool)
+        if final is False:
+            return True
 
         try:
             res = self._remote.client.get_upload_signed_url(
@@ -89,11 +90,16 @@ class HttpFileWriter(fsspec.spec.AbstractBufferedFile):
                 filename_root=self._filename,
             )
             NebulaPathResolver.add_mapping(self.path, res.native_url)
-            resp = requests.put(res.signed_url, data=data)
+            content_length = self._spool.tell()
+            self._spool.seek(0)
+            resp = requests.put(res.signed_url, data=self._spool, headers={"Content-Length": str(content_length)})
             if not resp.ok:
                 raise AssertionError(f"Failed to upload file {self._filename} to {res.signed_url} reason {resp.reason}")
         except Exception as e:
             raise AssertionError(f"Failed to upload file {self._filename} reason {e}")
+        finally:
+            self._spool.close()
+        return True
 
 
 def get_nebula_fs(remote: NebulaRemote) -> typing.Type[NebulaFS]:
@@ -120,6 +126,9 @@ class NebulaFS(HTTPFileSystem):
     ):
         super().__init__(asynchronous=asynchronous, **storage_options)
         self._remote = remote
+        # Native urls of the files uploaded by this file system, by project, domain, prefix, md5 and remote path, so
+        # that uploading the same content to the same location again is skipped
+        self._uploaded: typing.Dict[typing.Tuple[str, str, str, bytes, str], str] = {}
 
     @property
     def fsid(self) -> str:
@@ -176,14 +185,25 @@ class NebulaFS(HTTPFileSystem):
         hashes = kwargs.pop(_HASHES_KEY)
         # Parse rpath, strip out everything that doesn't make sense.
         rpath = rpath.replace(f"{REMOTE_PLACEHOLDER}/", "", 1)
-        resp, content_length, md5_bytes = self.get_upload_link(lpath, rpath, p, hashes)
+        k = str(pathlib.Path(typing.cast(str, lpath)).absolute())
+        uploaded_key = (self._remote.default_project, self._remote.default_domain, p, hashes.get(k, (b"",))[0], rpath)
+        if uploaded_key in self._uploaded:
+            logger.debug(f"Skipping upload of {lpath}, already uploaded to {self._uploaded[uploaded_key]}")
+            return self._uploaded[uploaded_key]
+        # Signed urls are requested through the blocking client, off the event loop so that the links of the files of
+        # a batch are requested concurrently
+        resp, content_length, md5_bytes = await asyncio.get_running_loop().run_in_executor(
+            None, self.get_upload_link, lpath, rpath, p, hashes
+        )
 
         headers = {"Content-Length": str(content_length), "Content-MD5": b64encode(md5_bytes).decode("utf-8")}
         kwargs["headers"] = headers
         rpath = resp.signed_url
         NebulaPathResolver.add_mapping(rpath, resp.native_url)
         logger.debug(f"Writing {lpath} to {rpath}")
+        # The parent streams the file in chunks of chunk_size on the file system's aiohttp session
         await super()._put_file(lpath, rpath, chunk_size, callback=callback, method=method, **kwargs)
+        self._uploaded[uploaded_key] = resp.native_url
         return resp.native_url
 
     @staticmethod
@@ -226,17 +246,29 @@ class NebulaFS(HTTPFileSystem):
         If a directory then all the files in the directory will be hashed.
         If a single file then just that file will be hashed.
         Skip symlinks
+        Files are hashed concurrently.
         """
-        if p.is_symlink():
-            return {}
-        if p.is_dir():
-            hashes = {}
-            for f in p.iterdir():
-                hashes.update(self.get_hashes_and_lengths(f))
-            return hashes
-        else:
-            md5_bytes, _, content_length = hash_file(p.resolve())
-            return {str(p.absolute()): (md5_bytes, content_length)}
+        files = []
+
+        def _collect(f: pathlib.Path):
+            if f.is_symlink():
+                return
+            if f.is_dir():
+                for child in f.iterdir():
+                    _collect(child)
+            else:
+                files.append(f)
+
+        _collect(p)
+        if len(files) <= 1:
+            return {str(f.absolute()): self._hash_and_length(f) for f in files}
+        with ThreadPoolExecutor() as executor:
+            return {str(f.absolute()): h for f, h in zip(files, executor.map(self._hash_and_length, files))}
+
+    @staticmethod
+    def _hash_and_length(p: pathlib.Path) -> typing.Tuple[bytes, int]:
+        md5_bytes, _, content_length = hash_file(p.resolve())
+        return md5_bytes, content_length
 
     @staticmethod
     def get_filename_root(file_info: HashStructure) -> str:
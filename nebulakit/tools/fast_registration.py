@@ -2,80 +2,191 @@ from __future__ import annotations
 
 import gzip
 import hashlib
+import json
 import os
 import posixpath
-import subprocess as _subprocess
 import tarfile
 import tempfile
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Dict, Optional, Tuple
 
 import click
+import fsspec
 
 from nebulakit.core.context_manager import NebulaContextManager
 from nebulakit.core.utils import timeit
+from nebulakit.loggers import logger
 from nebulakit.tools.ignore import DockerIgnore, GitIgnore, IgnoreGroup, StandardIgnore
 from nebulakit.tools.script_mode import tar_strip_file_attributes
 
 FAST_PREFIX = "fast"
 FAST_FILEENDING = ".tar.gz"
+FAST_ZSTD_FILEENDING = ".tar.zst"
 
+# Compression level of the gzipped archives. Higher levels are several times slower for a few percent smaller archives
+_GZIP_COMPRESSLEVEL = 6
 
-def fast_package(source: os.PathLike, output_dir: os.PathLike, deref_symlinks: bool = False) -> os.PathLike:
+# Digests of the files packaged, by source directory, reused while the size and modification time of files match
+_DIGEST_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".nebula", "digests")
+# Files modified less than this many nanoseconds before hashing are not cached, as they could be modified again within
+# the resolution of the file system's modification times without it showing
+_RACY_WINDOW_NS = 2 * 10**9
+
+
+def fast_package(
+    source: os.PathLike, output_dir: os.PathLike, deref_symlinks: bool = False, compression: str = "gzip"
+) -> os.PathLike:
     """
     Takes a source directory and packages everything not covered by common ignores into a tarball
     named after a hexdigest of the included files.
     :param os.PathLike source:
     :param os.PathLike output_dir:
     :param bool deref_symlinks: Enables dereferencing symlinks when packaging directory
+    :param str compression: gzip, or zstd to compress with all cores, which requires the zstandard package
     :return os.PathLike:
     """
+    if compression not in ("gzip", "zstd"):
+        raise ValueError(f"Unknown compression {compression}, expected gzip or zstd")
     ignore = IgnoreGroup(source, [GitIgnore, DockerIgnore, StandardIgnore])
     digest = compute_digest(source, ignore.is_ignored)
-    archive_fname = f"{FAST_PREFIX}{digest}{FAST_FILEENDING}"
+    file_ending = FAST_ZSTD_FILEENDING if compression == "zstd" else FAST_FILEENDING
+    archive_fname = f"{FAST_PREFIX}{digest}{file_ending}"
 
     if output_dir is None:
         output_dir = tempfile.mkdtemp()
         click.secho(f"No output path provided, using a temporary directory at {output_dir} instead", fg="yellow")
 
     archive_fname = os.path.join(output_dir, archive_fname)
+    # The archive is written while source is walked, so it must not pack itself when output_dir is inside source
+    archive_arcname = os.path.relpath(os.path.abspath(archive_fname), os.path.abspath(source)).replace(os.sep, "/")
+
+    def _filter(tarinfo: tarfile.TarInfo) -> Optional[tarfile.TarInfo]:
+        if tarinfo.name == archive_arcname:
+            return None
+        return ignore.tar_filter(tar_strip_file_attributes(tarinfo))
+
+    def _add(fileobj: BinaryIO):
+        # Stream the tarball into the compressor, without an intermediate file
+        with tarfile.open(fileobj=fileobj, mode="w|", dereference=deref_symlinks) as tar:
+            tar.add(source, arcname="", filter=_filter)
 
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        tar_path = os.path.join(tmp_dir, "tmp.tar")
-        with tarfile.open(tar_path, "w", dereference=deref_symlinks) as tar:
-            tar.add(source, arcname="", filter=lambda x: ignore.tar_filter(tar_strip_file_attributes(x)))
-        with gzip.GzipFile(filename=archive_fname, mode="wb", mtime=0) as gzipped:
-            with open(tar_path, "rb") as tar_file:
-                gzipped.write(tar_file.read())
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd compression of fast registration packages requires the zstandard package, "
+                "install it with pip install nebulakit[zstd]"
+            ) from e
+        compressor = zstandard.ZstdCompressor(threads=-1, write_checksum=True)
+        with open(archive_fname, "wb") as f, compressor.stream_writer(f, closefd=False) as compressed:
+            _add(compressed)
+    else:
+        with gzip.GzipFile(filename=archive_fname, mode="wb", mtime=0, compresslevel=_GZIP_COMPRESSLEVEL) as gzipped:
+            _add(gzipped)
 
     return archive_fname
 
 
-def compute_digest(source: os.PathLike, filter: Optional[callable] = None) -> str:
+class _DigestCache(object):
+    """
+    Digests of the files under a source directory, keyed by their relative path, along with the size and modification
+    time they had when they were hashed.
+    """
+
+    def __init__(self, source: os.PathLike):
+        key = hashlib.sha256(os.path.abspath(source).encode("utf-8")).hexdigest()
+        self._path = os.path.join(_DIGEST_CACHE_DIR, f"{key}.json")
+        self._entries: Dict[str, list] = {}
+        self._updated: Dict[str, list] = {}
+        try:
+            with open(self._path) as f:
+                self._entries = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    def get(self, relpath: str, st: os.stat_result) -> Optional[str]:
+        entry = self._entries.get(relpath)
+        if entry is not None and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            self._updated[relpath] = entry
+            return entry[2]
+        return None
+
+    def put(self, relpath: str, st: os.stat_result, digest: str):
+        if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            self._updated[relpath] = [st.st_size, st.st_mtime_ns, digest]
+
+    def save(self):
+        # Only the files seen by this walk are kept, so that deleted files do not accumulate
+        if self._updated == self._entries:
+            return
+        try:
+            os.makedirs(_DIGEST_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{self._path}.{os.getpid()}"
+            with open(tmp_path, "w") as f:
+                json.dump(self._updated, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.debug(f"Failed to save the digests of {self._path}: {e}")
+
+
+def compute_digest(
+    source: os.PathLike, filter: Optional[callable] = None, max_workers: Optional[int] = None, cache: bool = True
+) -> str:
     """
-    Walks the entirety of the source dir to compute a deterministic md5 hex digest of the dir contents.
+    Walks the entirety of the source dir to compute a deterministic md5 hex digest of the dir contents. Files are hashed
+    concurrently, and unless cache is False, the digests of files whose size and modification time did not change since
+    the previous walk of source are reused.
     :param os.PathLike source:
     :param Ignore ignore:
+    :param int max_workers: Number of files hashed at the same time, defaults to the executor's default
+    :param bool cache: Whether to reuse and persist the digests of files between walks
     :return Text:
     """
-    hasher = hashlib.md5()
-    for root, _, files in os.walk(source, topdown=True):
-        files.sort()
+    files = []
+    digest_cache_dir = os.path.abspath(_DIGEST_CACHE_DIR)
+    for root, dirs, fnames in os.walk(source, topdown=True):
+        # The digest cache changes on every walk, and must not be hashed if it is inside source
+        dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != digest_cache_dir]
+        dirs.sort()
+        fnames.sort()
 
-        for fname in files:
+        for fname in fnames:
             abspath = os.path.join(root, fname)
             relpath = os.path.relpath(abspath, source)
             if filter:
                 if filter(relpath):
                     continue
+            files.append((abspath, relpath))
+
+    digest_cache = _DigestCache(source) if cache else None
 
-            _filehash_update(abspath, hasher)
+    def _digest(paths: Tuple[str, str]) -> str:
+        abspath, relpath = paths
+        st = os.stat(abspath)
+        digest = digest_cache.get(relpath, st) if digest_cache else None
+        if digest is None:
+            file_hasher = hashlib.md5()
+            _filehash_update(abspath, file_hasher)
+            digest = file_hasher.hexdigest()
+            if digest_cache:
+                digest_cache.put(relpath, st, digest)
+        return digest
+
+    hasher = hashlib.md5()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for (_, relpath), digest in zip(files, executor.map(_digest, files)):
+            hasher.update(digest.encode("utf-8"))
             _pathhash_update(relpath, hasher)
+    if digest_cache:
+        digest_cache.save()
 
     return hasher.hexdigest()
 
 
 def _filehash_update(path: os.PathLike, hasher: hashlib._Hash) -> None:
-    blocksize = 65536
+    blocksize = 1024 * 1024
     with open(path, "rb") as f:
         bytes = f.read(blocksize)
         while bytes:
@@ -97,26 +208,66 @@ def get_additional_distribution_loc(remote_location: str, identifier: str) -> st
     return posixpath.join(remote_location, "{}.{}".format(identifier, "tar.gz"))
 
 
+def _distribution_digest(name: str) -> Optional[str]:
+    """
+    Returns the digest of the sources encoded in the name of a distribution built by :py:func:`fast_package`, or None.
+    """
+    for ending in (FAST_FILEENDING, FAST_ZSTD_FILEENDING):
+        if name.startswith(FAST_PREFIX) and name.endswith(ending):
+            digest = name[len(FAST_PREFIX) : -len(ending)]
+            if digest and all(c in "0123456789abcdef" for c in digest):
+                return digest
+    return None
+
+
+def _extract_distribution(fs: fsspec.AbstractFileSystem, path: str, destination: str):
+    """
+    Extracts the distribution at path into destination, streaming it from the file system without a local copy.
+    """
+    with fs.open(path, "rb") as f:
+        if path.endswith(FAST_ZSTD_FILEENDING):
+            import zstandard
+
+            with zstandard.ZstdDecompressor().stream_reader(f) as decompressed:
+                with tarfile.open(fileobj=decompressed, mode="r|") as tar:
+                    _extract_all(tar, destination)
+        else:
+            with tarfile.open(fileobj=f, mode="r|gz") as tar:
+                _extract_all(tar, destination)
+
+
+def _extract_all(tar: tarfile.TarFile, destination: str):
+    # Distributions are packaged from the user's sources, symlinks included, and trusted as such
+    if hasattr(tarfile, "fully_trusted_filter"):
+        tar.extractall(destination, filter="fully_trusted")
+    else:
+        tar.extractall(destination)
+
+
 @timeit("Download distribution")
 def download_distribution(additional_distribution: str, destination: str):
     """
-    Downloads a remote code distribution and overwrites any local files.
+    Downloads a remote code distribution and overwrites any local files. When ``DataConfig.shared_cache_dir`` is set,
+    distributions built by :py:func:`fast_package` are extracted once per digest into the cache shared by the tasks of
+    the node, and copied into destination from there.
     :param Text additional_distribution:
     :param os.PathLike destination:
     """
     if not os.path.isdir(destination):
         raise ValueError("Destination path is required to download distribution and it should be a directory")
-    # NOTE the os.path.join(destination, ''). This is to ensure that the given path is infact a directory and all
-    # downloaded data should be copied into this directory. We do this to account for a difference in behavior in
-    # fsspec, which requires a trailing slash in case of pre-existing directory.
-    NebulaContextManager.current_context().file_access.get_data(additional_distribution, os.path.join(destination, ""))
     tarfile_name = os.path.basename(additional_distribution)
-    if not tarfile_name.endswith(".tar.gz"):
+    if not tarfile_name.endswith((FAST_FILEENDING, FAST_ZSTD_FILEENDING)):
         raise RuntimeError("Unrecognized additional distribution format for {}".format(additional_distribution))
 
+    file_access = NebulaContextManager.current_context().file_access
+    fs = file_access.get_filesystem_for_path(additional_distribution)
+    digest = _distribution_digest(tarfile_name)
+    if digest is not None and file_access.get_cached_tree(
+        f"{FAST_PREFIX}{digest}",
+        digest,
+        lambda directory: _extract_distribution(fs, additional_distribution, directory),
+        destination,
+    ):
+        return
     # This will overwrite the existing user nebula workflow code in the current working code dir.
-    result = _subprocess.run(
-        ["tar", "-xvf", os.path.join(destination, tarfile_name), "-C", destination],
-        stdout=_subprocess.PIPE,
-    )
-    result.check_returncode()
+    _extract_distribution(fs, additional_distribution, destination)
@@ -0,0 +1,103 @@
+"""
+Local record of the entities registered from this machine, so that registering the same version again only sends the
+entities that changed. A manifest is kept per endpoint, project, domain, version and serialization settings, and holds
+a digest of the serialized spec of each registered entity and the source hash of the modules they were loaded from.
+"""
+import hashlib
+import json
+import os
+import sys
+import typing
+
+from nebulakit.configuration import SerializationSettings
+from nebulakit.loggers import logger
+from nebulakit.models import launch_plan
+from nebulakit.tools.translator import NebulaControlPlaneEntity
+
+DEFAULT_MANIFEST_DIR = os.path.join(os.path.expanduser("~"), ".nebula", "registrations")
+
+
+def spec_digest(cp_entity: NebulaControlPlaneEntity) -> str:
+    """
+    Returns a digest of the serialized spec of cp_entity, that is the same for identical specs across runs.
+    """
+    return hashlib.sha256(cp_entity.to_nebula_idl().SerializeToString(deterministic=True)).hexdigest()
+
+
+def _entity_key(cp_entity: NebulaControlPlaneEntity) -> str:
+    i = cp_entity.id if isinstance(cp_entity, launch_plan.LaunchPlan) else cp_entity.template.id
+    return f"{i.resource_type}/{i.name}"
+
+
+def _module_of(entity: typing.Any) -> typing.Optional[str]:
+    """
+    Returns the name of the module a task, workflow or launch plan was defined in, or None if it is not known.
+    """
+    workflow = getattr(entity, "workflow", None)
+    if workflow is not None:
+        entity = workflow
+    module = getattr(entity, "instantiated_in", None)
+    if not module and getattr(entity, "function", None) is not None:
+        module = getattr(entity.function, "__module__", None)
+    return module or None
+
+
+def _source_hash(module: str) -> typing.Optional[str]:
+    path = getattr(sys.modules.get(module), "__file__", None)
+    if not path or not os.path.isfile(path):
+        return None
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+class RegistrationManifest(object):
+    """
+    The entities registered with ``endpoint`` for a project, domain and version, and the modules they came from.
+    """
+
+    def __init__(self, endpoint: str, settings: SerializationSettings, directory: str = DEFAULT_MANIFEST_DIR):
+        key_parts = [endpoint, settings.project, settings.domain, settings.version, settings.to_json()]
+        key = hashlib.sha256("\n".join(key_parts).encode("utf-8")).hexdigest()
+        self._path = os.path.join(directory, f"{key}.json")
+        self._entities: typing.Dict[str, str] = {}
+        self._modules: typing.Dict[str, str] = {}
+        try:
+            with open(self._path) as f:
+                manifest = json.load(f)
+            self._entities = manifest.get("entities", {})
+            self._modules = manifest.get("modules", {})
+        except (OSError, ValueError):
+            pass
+        self._seen_modules: typing.Dict[str, str] = {}
+
+    def should_serialize(self, entity: typing.Any) -> bool:
+        """
+        Returns False if entity comes from a module whose source did not change since all of its entities were
+        registered, True otherwise.
+        """
+        module = _module_of(entity)
+        source_hash = _source_hash(module) if module else None
+        if source_hash is None:
+            return True
+        self._seen_modules[module] = source_hash
+        return self._modules.get(module) != source_hash
+
+    def is_registered(self, cp_entity: NebulaControlPlaneEntity) -> bool:
+        return self._entities.get(_entity_key(cp_entity)) == spec_digest(cp_entity)
+
+    def record(self, cp_entity: NebulaControlPlaneEntity):
+        self._entities[_entity_key(cp_entity)] = spec_digest(cp_entity)
+
+    def save(self, complete: bool):
+        """
+        Writes the manifest. The source hashes of the modules loaded are only recorded if complete, i.e. if all their
+        entities were registered.
+        """
+        if complete:
+            self._modules.update(self._seen_modules)
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp_path = f"{self._path}.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            json.dump({"entities": self._entities, "modules": self._modules}, f)
+        os.replace(tmp_path, self._path)
+        logger.debug(f"Saved registration manifest {self._path}")
@@ -1,19 +1,26 @@
 import os
 import tarfile
 import tempfile
+import time
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
 
 import click
+import grpc
 
 from nebulakit.configuration import FastSerializationSettings, ImageConfig, SerializationSettings
 from nebulakit.core.context_manager import NebulaContextManager
+from nebulakit.exceptions.system import NebulaSystemException
 from nebulakit.loggers import logger
 from nebulakit.models import launch_plan
+from nebulakit.models.admin.workflow import WorkflowSpec
+from nebulakit.models.core import workflow as workflow_model
 from nebulakit.models.core.identifier import Identifier
 from nebulakit.remote import NebulaRemote
 from nebulakit.remote.remote import RegistrationSkipped, _get_git_repo_url
 from nebulakit.tools import fast_registration, module_loader
+from nebulakit.tools.registration_manifest import RegistrationManifest
 from nebulakit.tools.script_mode import _find_project_root
 from nebulakit.tools.serialize_helpers import get_registrable_entities, persist_registrable_entities
 from nebulakit.tools.translator import NebulaControlPlaneEntity, Options
@@ -23,16 +30,29 @@ class NoSerializableEntitiesError(Exception):
     pass
 
 
+class RegistrationError(Exception):
+    pass
+
+
+# Status codes of the gRPC errors of registration calls that are worth retrying once the client's interceptor gave up
+_TRANSIENT_STATUS_CODES = (grpc.StatusCode.UNAVAILABLE, grpc.StatusCode.DEADLINE_EXCEEDED)
+# Seconds waited before the first retry of a registration call, doubled for each subsequent retry
+_RETRY_BACKOFF = 1.0
+
+
 def serialize(
     pkgs: typing.List[str],
     settings: SerializationSettings,
     local_source_root: typing.Optional[str] = None,
     options: typing.Optional[Options] = None,
+    entity_filter: typing.Optional[typing.Callable[[typing.Any], bool]] = None,
 ) -> typing.List[NebulaControlPlaneEntity]:
     """
     See :py:class:`nebulakit.models.core.identifier.ResourceType` to match the trailing index in the file name with the
     entity type.
     :param options:
+    :param entity_filter: If set, only the tasks, workflows and launch plans it returns True for are serialized, along
+        with the entities they depend on.
     :param settings: SerializationSettings to be used
     :param pkgs: Dot-delimited Python packages/subpackages to look into for serialization.
     :param local_source_root: Where to start looking for the code.
@@ -45,7 +65,7 @@ def serialize(
             click.secho(f"Loading packages {pkgs} under source root {local_source_root}", fg="yellow")
             module_loader.just_load_modules(pkgs=pkgs)
 
-        registrable_entities = get_registrable_entities(ctx, options=options)
+        registrable_entities = get_registrable_entities(ctx, options=options, entity_filter=entity_filter)
         click.secho(f"Successfully serialized {len(registrable_entities)} nebula objects", fg="green")
         return registrable_entities
 
@@ -148,6 +168,7 @@ def load_packages_and_modules(
     project_root: Path,
     pkgs_or_mods: typing.List[str],
     options: typing.Optional[Options] = None,
+    entity_filter: typing.Optional[typing.Callable[[typing.Any], bool]] = None,
 ) -> typing.List[NebulaControlPlaneEntity]:
     """
     The project root is added as the first entry to sys.path, and then all the specified packages and modules
@@ -162,6 +183,7 @@ def load_packages_and_modules(
     :param project_root:
     :param pkgs_or_mods:
     :param options:
+    :param entity_filter: See :py:func:`serialize`
     :return: The common detected root path, the output of _find_project_root
     """
     ss.git_repo = _get_git_repo_url(project_root)
@@ -178,7 +200,7 @@ def load_packages_and_modules(
         )
         pkgs_and_modules.append(dot_delineated)
 
-    registrable_entities = serialize(pkgs_and_modules, ss, str(project_root), options)
+    registrable_entities = serialize(pkgs_and_modules, ss, str(project_root), options, entity_filter=entity_filter)
 
     return registrable_entities
 
@@ -197,6 +219,10 @@ def secho(i: Identifier, state: str = "success", reason: str = None, op: str = "
         fg = "red"
         nl = True
         reason = "skipped!"
+    elif state == "error":
+        state_ind = "[x]"
+        fg = "red"
+        nl = True
     click.secho(
         click.style(f"{state_ind}", fg=fg) + f" {op} {i.name} type {i.resource_type_name()} {reason}",
         dim=True,
@@ -204,6 +230,178 @@ def secho(i: Identifier, state: str = "success", reason: str = None, op: str = "
     )
 
 
+def _entity_id(cp_entity: NebulaControlPlaneEntity) -> Identifier:
+    if isinstance(cp_entity, launch_plan.LaunchPlan):
+        return cp_entity.id
+    return cp_entity.template.id
+
+
+def _entity_key(i: Identifier) -> typing.Tuple[int, str]:
+    # All the entities of a registration share a project, domain and version
+    return i.resource_type, i.name
+
+
+def _walk_nodes(nodes: typing.Iterable[workflow_model.Node]) -> typing.Generator[workflow_model.Node, None, None]:
+    for node in nodes:
+        if node is None:
+            continue
+        yield node
+        if node.branch_node is not None:
+            if_else = node.branch_node.if_else
+            yield from _walk_nodes([if_else.case.then_node, if_else.else_node])
+            yield from _walk_nodes(b.then_node for b in if_else.other or [])
+        if node.array_node is not None:
+            yield from _walk_nodes([node.array_node.node])
+
+
+def _dependencies(cp_entity: NebulaControlPlaneEntity) -> typing.Set[typing.Tuple[int, str]]:
+    """
+    Returns the keys of the tasks, workflows and launch plans that must be registered before cp_entity.
+    """
+    if isinstance(cp_entity, launch_plan.LaunchPlan):
+        return {_entity_key(cp_entity.spec.workflow_id)}
+    if not isinstance(cp_entity, WorkflowSpec):
+        return set()
+    deps = set()
+    for template in [cp_entity.template, *(cp_entity.sub_workflows or [])]:
+        for node in _walk_nodes([*template.nodes, template.failure_node]):
+            if node.task_node is not None:
+                deps.add(_entity_key(node.task_node.reference_id))
+            elif node.workflow_node is not None:
+                deps.add(_entity_key(node.workflow_node.reference))
+    deps.discard(_entity_key(_entity_id(cp_entity)))
+    return deps
+
+
+def registration_levels(
+    entities: typing.List[NebulaControlPlaneEntity],
+) -> typing.List[typing.List[NebulaControlPlaneEntity]]:
+    """
+    Groups entities into levels, such that the entities of a level only depend on entities of earlier levels: tasks
+    first, then the workflows using them, then the launch plans of those workflows and the workflows referencing
+    those launch plans, and so on. The entities of a level can be registered concurrently.
+    """
+    by_key = {_entity_key(_entity_id(e)): e for e in entities}
+    levels: typing.Dict[typing.Tuple[int, str], int] = {}
+
+    def _level(key: typing.Tuple[int, str], visiting: typing.Set[typing.Tuple[int, str]]) -> int:
+        if key not in levels:
+            visiting.add(key)
+            deps = [d for d in _dependencies(by_key[key]) if d in by_key and d not in visiting]
+            levels[key] = 1 + max((_level(d, visiting) for d in deps), default=-1)
+            visiting.discard(key)
+        return levels[key]
+
+    grouped: typing.List[typing.List[NebulaControlPlaneEntity]] = []
+    for key, e in by_key.items():
+        level = _level(key, set())
+        while len(grouped) <= level:
+            grouped.append([])
+        grouped[level].append(e)
+    return grouped
+
+
+def _is_transient(e: Exception) -> bool:
+    """
+    Returns True if e was raised because the backend was unavailable or did not answer in time.
+    """
+    if isinstance(e, (ConnectionError, TimeoutError)):
+        return True
+    cause = e.__cause__
+    return (
+        isinstance(e, NebulaSystemException)
+        and isinstance(cause, grpc.RpcError)
+        and cause.code() in _TRANSIENT_STATUS_CODES
+    )
+
+
+def _with_retries(fn: typing.Callable[[], typing.Any], retries: int) -> typing.Any:
+    for attempt in range(retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == retries or not _is_transient(e):
+                raise
+            wait = _RETRY_BACKOFF * 2**attempt
+            logger.debug(f"Retrying in {wait}s after transient error {e}")
+            time.sleep(wait)
+
+
+def register_entities(
+    remote: NebulaRemote,
+    entities: typing.List[NebulaControlPlaneEntity],
+    serialization_settings: SerializationSettings,
+    version: str,
+    activate_launchplans: bool = False,
+    concurrency: int = 16,
+    retries: int = 3,
+    manifest: typing.Optional[RegistrationManifest] = None,
+) -> typing.Dict[str, typing.List[Identifier]]:
+    """
+    Registers entities level by level, see :py:func:`registration_levels`, with up to ``concurrency`` entities of a
+    level registered at a time and transient failures retried up to ``retries`` times. Entities that depend on an
+    entity that failed to register are not registered. If a manifest is given, entities whose spec is unchanged since
+    they were recorded in it are skipped without calling the backend, and the entities registered are recorded in it.
+    Returns the ids of the entities that were registered, skipped and failed, keyed by outcome.
+    """
+    summary: typing.Dict[str, typing.List[Identifier]] = {"registered": [], "skipped": [], "failed": []}
+    failed_keys = set()
+
+    def _register(cp_entity: NebulaControlPlaneEntity) -> typing.Optional[Identifier]:
+        i = _with_retries(
+            lambda: remote.raw_register(
+                cp_entity, serialization_settings, version=version, create_default_launchplan=False
+            ),
+            retries,
+        )
+        if i is not None and isinstance(cp_entity, launch_plan.LaunchPlan) and activate_launchplans:
+            _with_retries(lambda: remote.activate_launchplan(i), retries)
+        return i
+
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for level in registration_levels(entities):
+            futures: typing.Dict[Future, NebulaControlPlaneEntity] = {}
+            for cp_entity in level:
+                og_id = _entity_id(cp_entity)
+                failed_deps = _dependencies(cp_entity) & failed_keys
+                if failed_deps:
+                    secho(og_id, "error", reason=f"not registered, depends on failed {sorted(failed_deps)[0][1]}")
+                    failed_keys.add(_entity_key(og_id))
+                    summary["failed"].append(og_id)
+                    continue
+                if manifest is not None and manifest.is_registered(cp_entity):
+                    secho(og_id, reason="unchanged, skipped")
+                    summary["skipped"].append(og_id)
+                    continue
+                futures[executor.submit(_register, cp_entity)] = cp_entity
+            for future in as_completed(futures):
+                cp_entity = futures[future]
+                og_id = _entity_id(cp_entity)
+                try:
+                    i = future.result()
+                except RegistrationSkipped:
+                    secho(og_id, "failed")
+                    summary["skipped"].append(og_id)
+                    continue
+                except Exception as e:
+                    secho(og_id, "error", reason=f"failed: {e}")
+                    failed_keys.add(_entity_key(og_id))
+                    summary["failed"].append(og_id)
+                    continue
+                if i is None:
+                    summary["skipped"].append(og_id)
+                    continue
+                secho(i)
+                if isinstance(cp_entity, launch_plan.LaunchPlan) and activate_launchplans:
+                    secho(i, reason="activated", op="Activation")
+                summary["registered"].append(og_id)
+                if manifest is not None:
+                    manifest.record(cp_entity)
+    if manifest is not None:
+        manifest.save(complete=not summary["failed"])
+    return summary
+
+
 def register(
     project: str,
     domain: str,
@@ -220,6 +418,10 @@ def register(
     env: typing.Optional[typing.Dict[str, str]],
     dry_run: bool = False,
     activate_launchplans: bool = False,
+    concurrency: int = 16,
+    retries: int = 3,
+    skip_unchanged: bool = False,
+    manifest_dir: typing.Optional[str] = None,
 ):
     detected_root = find_common_root(package_or_module)
     click.secho(f"Detected Root {detected_root}, using this to create deployable package...", fg="yellow")
@@ -256,36 +458,52 @@ def register(
 
     options = Options.default_from(k8s_service_account=service_account, raw_data_prefix=raw_data_prefix)
 
+    manifest = None
+    if skip_unchanged and not dry_run:
+        kwargs = {"directory": manifest_dir} if manifest_dir else {}
+        manifest = RegistrationManifest(remote.config.platform.endpoint, serialization_settings, **kwargs)
+
     # Load all the entities
     NebulaContextManager.push_context(remote.context)
     registrable_entities = load_packages_and_modules(
-        serialization_settings, detected_root, list(package_or_module), options
+        serialization_settings,
+        detected_root,
+        list(package_or_module),
+        options,
+        entity_filter=manifest.should_serialize if manifest is not None else None,
     )
     NebulaContextManager.pop_context()
     if len(registrable_entities) == 0:
+        if manifest is not None:
+            click.secho("No Nebula entities changed since the last registration of this version", fg="green")
+            return
         click.secho("No Nebula entities were detected. Aborting!", fg="red")
         return
 
-    for cp_entity in registrable_entities:
-        is_lp = False
-        if isinstance(cp_entity, launch_plan.LaunchPlan):
-            og_id = cp_entity.id
-            is_lp = True
-        else:
-            og_id = cp_entity.template.id
-        secho(og_id, "")
-        try:
-            if not dry_run:
-                i = remote.raw_register(
-                    cp_entity, serialization_settings, version=version, create_default_launchplan=False
-                )
-                secho(i)
-                if is_lp and activate_launchplans:
-                    secho(og_id, "", op="Activation")
-                    remote.activate_launchplan(i)
-                    secho(i, reason="activated", op="Activation")
-            else:
-                secho(og_id, reason="Dry run Mode!")
-        except RegistrationSkipped:
-            secho(og_id, "failed")
+    if dry_run:
+        for cp_entity in registrable_entities:
+            secho(_entity_id(cp_entity), reason="Dry run Mode!")
+        click.secho(f"Successfully registered {len(registrable_entities)} entities", fg="green")
+        return
+
+    start = time.monotonic()
+    summary = register_entities(
+        remote,
+        registrable_entities,
+        serialization_settings,
+        version,
+        activate_launchplans=activate_launchplans,
+        concurrency=concurrency,
+        retries=retries,
+        manifest=manifest,
+    )
+    click.secho(
+        f"{len(summary['registered'])} registered, {len(summary['skipped'])} skipped and {len(summary['failed'])} "
+        f"failed in {time.monotonic() - start:.1f}s",
+        dim=True,
+    )
+    if summary["failed"]:
+        raise RegistrationError(
+            f"Failed to register {len(summary['failed'])} entities: {', '.join(i.name for i in summary['failed'])}"
+        )
     click.secho(f"Successfully registered {len(registrable_entities)} entities", fg="green")
@@ -43,17 +43,22 @@ def _should_register_with_admin(entity) -> bool:
 
 
 def get_registrable_entities(
-    ctx: nebula_context.NebulaContext, options: typing.Optional[Options] = None
+    ctx: nebula_context.NebulaContext,
+    options: typing.Optional[Options] = None,
+    entity_filter: typing.Optional[typing.Callable[[typing.Any], bool]] = None,
 ) -> typing.List[NebulaControlPlaneEntity]:
     """
     Returns all entities that can be serialized and should be sent over to Nebula backend. This will filter any entities
-    that are not known to Admin
+    that are not known to Admin. If entity_filter is set, only the tasks, workflows and launch plans it returns True for
+    are serialized, along with the entities they depend on.
     """
     new_api_serializable_entities = OrderedDict()
     # TODO: Clean up the copy() - it's here because we call get_default_launch_plan, which may create a LaunchPlan
     #  object, which gets added to the NebulaEntities.entities list, which we're iterating over.
     for entity in nebula_context.NebulaEntities.entities.copy():
         if isinstance(entity, PythonTask) or isinstance(entity, WorkflowBase) or isinstance(entity, LaunchPlan):
+            if entity_filter is not None and not entity_filter(entity):
+                continue
             get_serializable(new_api_serializable_entities, ctx.serialization_settings, entity, options=options)
 
             if isinstance(entity, WorkflowBase):
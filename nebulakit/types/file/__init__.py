@@ -10,6 +10,7 @@ This list also contains a bunch of pre-formatted :py:class:`nebulakit.types.file
    :template: file_types.rst
 
    NebulaFile
+   Streaming
    HDF5EncodedFile
    HTMLPage
    JoblibSerializedFile
@@ -24,7 +25,7 @@ import typing
 
 from typing_extensions import Annotated, get_args, get_origin
 
-from .file import NebulaFile
+from .file import NebulaFile, Streaming
 
 
 class FileExt:
@@ -10,9 +10,16 @@ from dataclasses import dataclass, field
 from dataclasses_json import config
 from marshmallow import fields
 from mashumaro.mixins.json import DataClassJSONMixin
+from typing_extensions import get_args
 
 from nebulakit.core.context_manager import NebulaContext, NebulaContextManager
-from nebulakit.core.type_engine import TypeEngine, TypeTransformer, TypeTransformerFailedError, get_underlying_type
+from nebulakit.core.type_engine import (
+    TypeEngine,
+    TypeTransformer,
+    TypeTransformerFailedError,
+    get_underlying_type,
+    is_annotated,
+)
 from nebulakit.loggers import logger
 from nebulakit.models.core.types import BlobType
 from nebulakit.models.literals import Blob, BlobMetadata, Literal, Scalar
@@ -27,6 +34,44 @@ def noop():
 T = typing.TypeVar("T")
 
 
+class Streaming(object):
+    """
+    Annotates a NebulaFile input so that ``open`` reads the remote object in ranges, instead of the whole object being
+    downloaded first. For example,
+
+    .. code-block:: python
+
+        @task
+        def read_header(f: Annotated[NebulaFile, Streaming(block_size=64 * 1024)]) -> bytes:
+            with f.open("rb") as r:
+                return r.read(100)
+
+    only reads the first 64KiB of the file. The block size and the fsspec cache default to
+    ``DataConfig.streaming_block_size`` and ``DataConfig.streaming_cache_type``. Inputs annotated this way are not
+    prefetched either. The file is still downloaded if its local path is used.
+    """
+
+    def __init__(self, block_size: typing.Optional[int] = None, cache_type: typing.Optional[str] = None):
+        self._block_size = block_size
+        self._cache_type = cache_type
+
+    @property
+    def block_size(self) -> typing.Optional[int]:
+        return self._block_size
+
+    @property
+    def cache_type(self) -> typing.Optional[str]:
+        return self._cache_type
+
+
+def get_streaming(t: typing.Any) -> typing.Optional[Streaming]:
+    if is_annotated(t):
+        for annotation in get_args(t)[1:]:
+            if isinstance(annotation, Streaming):
+                return annotation
+    return None
+
+
 @dataclass
 class NebulaFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
     path: typing.Union[str, os.PathLike] = field(default=None, metadata=config(mm_field=fields.String()))  # type: ignore
@@ -201,6 +246,7 @@ class NebulaFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
         self._downloaded = False
         self._remote_path = remote_path
         self._remote_source = None
+        self._streaming: typing.Optional[Streaming] = None
 
     def __fspath__(self):
         # This is where a delayed downloading of the file will happen
@@ -245,6 +291,8 @@ class NebulaFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
         mode: str,
         cache_type: typing.Optional[str] = None,
         cache_options: typing.Optional[typing.Dict[str, typing.Any]] = None,
+        streaming: typing.Optional[bool] = None,
+        block_size: typing.Optional[int] = None,
     ):
         """
         Returns a streaming File handle
@@ -278,15 +326,35 @@ class NebulaFile(os.PathLike, typing.Generic[T], DataClassJSONMixin):
             especially useful for large file reads
         :param cache_options: optional Dict[str, Any] Refer to fsspec caching options. This is strongly coupled to the
             cache_protocol
+        :param streaming: optional bool If True, remote files opened for reading are read in ranges of ``block_size``
+            through the cache, defaulting to the ``Streaming`` annotation of the input and then to
+            ``DataConfig.streaming_block_size`` and ``DataConfig.streaming_cache_type``, so that reading a few offsets
+            only transfers the blocks around them. If False, the file is downloaded and the local copy is opened.
+            Defaults to True for inputs annotated with ``Streaming``.
+        :param block_size: optional int Size in bytes of the ranges read when streaming
         """
         ctx = NebulaContextManager.current_context()
+        if streaming is None and self._streaming is not None:
+            streaming = True
+        if streaming is False and "r" in mode:
+            f = open(self.download(), mode)
+            yield f
+            f.close()
+            return
+
         final_path = self.path
         if self.remote_source:
             final_path = self.remote_source
         elif self.remote_path:
             final_path = self.remote_path
         fs = ctx.file_access.get_filesystem_for_path(final_path)
-        f = fs.open(final_path, mode, cache_type=cache_type, cache_options=cache_options)
+        kwargs = {}
+        if streaming and "r" in mode and ctx.file_access.is_remote(final_path):
+            data_config = ctx.file_access.data_config
+            annotation = self._streaming or Streaming()
+            kwargs["block_size"] = block_size or annotation.block_size or data_config.streaming_block_size
+            cache_type = cache_type or annotation.cache_type or data_config.streaming_cache_type
+        f = fs.open(final_path, mode, cache_type=cache_type, cache_options=cache_options, **kwargs)
         yield f
         f.close()
 
@@ -467,6 +535,7 @@ class NebulaFilePathTransformer(TypeTransformer[NebulaFile]):
         if expected_python_type is os.PathLike:
             return NebulaFile(uri)
 
+        streaming = get_streaming(expected_python_type)
         # Correctly handle `Annotated[NebulaFile, ...]` by extracting the origin type
         expected_python_type = get_underlying_type(expected_python_type)
 
@@ -488,6 +557,7 @@ class NebulaFilePathTransformer(TypeTransformer[NebulaFile]):
         expected_format = NebulaFilePathTransformer.get_format(expected_python_type)
         ff = NebulaFile.__class_getitem__(expected_format)(local_path, _downloader)
         ff._remote_source = uri
+        ff._streaming = streaming
 
         return ff
 
@@ -1,9 +1,12 @@
 import collections
 import typing
+from concurrent.futures import Future, ThreadPoolExecutor
 
 from typing_extensions import get_args
 
 from nebulakit import NebulaContext, Literal, LiteralType
+from nebulakit.core.context_manager import NebulaContextManager
+from nebulakit.core.data_persistence import FileAccessProvider
 from nebulakit.core.type_engine import TypeEngine, TypeTransformer, TypeTransformerFailedError
 from nebulakit.models import types as _type_models
 from nebulakit.models.literals import LiteralCollection
@@ -12,31 +15,101 @@ T = typing.TypeVar("T")
 
 
 class NebulaIterator:
-    def __init__(self, ctx: NebulaContext, lv: Literal, expected_python_type: typing.Type[T], length: int):
+    """
+    Lazily decodes the elements of a collection literal as they are iterated over. If ``read_ahead`` is set, defaulting
+    to ``DataConfig.iterator_read_ahead``, the files and directories of the next ``read_ahead`` elements are downloaded
+    in the background while the current element is consumed. The downloads in the background are stopped once the
+    iterator is exhausted, closed, used as a context manager and exited, or garbage collected.
+    """
+
+    def __init__(
+        self,
+        ctx: NebulaContext,
+        lv: Literal,
+        expected_python_type: typing.Type[T],
+        length: int,
+        read_ahead: typing.Optional[int] = None,
+    ):
+        # Set first, for __del__ to find them even if the initialization fails
+        self._executor: typing.Optional[ThreadPoolExecutor] = None
+        self._prefetches: typing.Dict[int, Future] = {}
         self._ctx = ctx
         self._lv = lv
         self._expected_python_type = expected_python_type
         self._length = length
         self._index = 0
+        self._element_type = get_args(expected_python_type)[0]
+        self._transformer: TypeTransformer = TypeEngine.get_transformer(self._element_type)
+        data_config = ctx.file_access.data_config
+        self._read_ahead = data_config.iterator_read_ahead if read_ahead is None else read_ahead
+        self._max_concurrent_transfers = data_config.max_concurrent_transfers
+        self._next_prefetch = 0
 
     def __len__(self):
         return self._length
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __del__(self):
+        self.close()
+
+    def close(self):
+        """
+        Stops reading ahead, for iterations that stop before the last element.
+        """
+        self._shutdown()
+
     def __iter__(self):
         self._index = 0
+        self._next_prefetch = 0
         return self
 
     def __next__(self):
         if self._index < self._length:
-            lits = self._lv.collection.literals
-            st = get_args(self._expected_python_type)[0]
-            lt = TypeEngine.to_python_value(self._ctx, lits[self._index], st)
+            self._prefetch_upcoming()
+            prefetch = self._prefetches.pop(self._index, None)
+            if prefetch is not None:
+                # Wait for the download in flight, so that the element does not download the same paths again
+                prefetch.result()
+            lit = self._lv.collection.literals[self._index]
+            lt = self._transformer.to_python_value(self._ctx, lit, self._element_type)
             self._index += 1
             return lt
 
         else:
+            self._shutdown()
             raise StopIteration
 
+    def _prefetch_upcoming(self):
+        if self._read_ahead <= 0:
+            return
+        if self._executor is None:
+            max_workers = max(1, min(self._read_ahead, self._max_concurrent_transfers))
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        last = min(self._index + self._read_ahead, self._length - 1)
+        self._next_prefetch = max(self._next_prefetch, self._index)
+        while self._next_prefetch <= last:
+            paths: typing.Dict[str, bool] = {}
+            FileAccessProvider.collect_remote_paths(self._lv.collection.literals[self._next_prefetch], paths)
+            if paths:
+                self._prefetches[self._next_prefetch] = self._executor.submit(
+                    self._ctx.file_access.prefetch, paths, max_workers=1
+                )
+            self._next_prefetch += 1
+
+    def _shutdown(self):
+        # Downloads that did not start yet are dropped, those in flight complete in the background
+        for prefetch in self._prefetches.values():
+            prefetch.cancel()
+        self._prefetches.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
 
 class IteratorTransformer(TypeTransformer[typing.Iterator]):
     def __init__(self):
@@ -52,8 +125,27 @@ class IteratorTransformer(TypeTransformer[typing.Iterator]):
     def to_literal(
         self, ctx: NebulaContext, python_val: typing.Iterator[T], python_type: typing.Type[T], expected: LiteralType
     ) -> Literal:
+        """
+        Consumes the iterator one element at a time, converting (and so uploading) up to
+        ``DataConfig.max_concurrent_transfers`` elements concurrently, so that only that many python values are held in
+        memory at once.
+        """
         t = get_args(python_type)[0]
-        lit_list = [TypeEngine.to_literal(ctx, x, t, expected.collection_type) for x in python_val]
+        window = ctx.file_access.data_config.max_concurrent_transfers
+        if window <= 1:
+            lit_list = [TypeEngine.to_literal(ctx, x, t, expected.collection_type) for x in python_val]
+            return Literal(collection=LiteralCollection(literals=lit_list))
+
+        to_literal = NebulaContextManager.bind_context(TypeEngine.to_literal)
+        lit_list = []
+        pending: typing.Deque[Future] = collections.deque()
+        with ThreadPoolExecutor(max_workers=window) as executor:
+            for x in python_val:
+                if len(pending) >= window:
+                    lit_list.append(pending.popleft().result())
+                pending.append(executor.submit(to_literal, ctx, x, t, expected.collection_type))
+            while pending:
+                lit_list.append(pending.popleft().result())
         return Literal(collection=LiteralCollection(literals=lit_list))
 
     def to_python_value(self, ctx: NebulaContext, lv: Literal, expected_python_type: typing.Type[T]) -> NebulaIterator:
@@ -1 +1,2 @@
+from .chunked import LazyArray
 from .ndarray import NumpyArrayTransformer
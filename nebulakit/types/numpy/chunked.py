@@ -0,0 +1,296 @@
+"""
+Chunked layout of numpy arrays, and lazy access to arrays stored in the object store.
+
+A chunked array is stored as a single blob: blocks of ``chunk_rows`` rows along the first axis, each optionally
+compressed, written back to back in C order, followed by a JSON index of the blocks and a footer pointing at the
+index. Uncompressed chunked arrays (and plain ``.npy`` files) can be memory mapped, since their rows are contiguous.
+:py:class:`LazyArray` reads either layout from the object store one block of rows at a time, with ranged reads.
+"""
+import bz2
+import collections
+import io
+import json
+import lzma
+import math
+import struct
+import typing
+import zlib
+
+import fsspec
+import numpy as np
+
+CHUNKED_ARRAY_MAGIC = b"NBNDARR1"
+# Length of the JSON index and magic, at the end of chunked arrays
+_FOOTER = struct.Struct("<Q8s")
+
+# Compressors available without any extra dependency, by name
+COMPRESSORS: typing.Dict[str, typing.Tuple[typing.Callable, typing.Callable]] = {
+    "zlib": (zlib.compress, zlib.decompress),
+    "bz2": (bz2.compress, bz2.decompress),
+    "lzma": (lzma.compress, lzma.decompress),
+}
+
+# Modes that arrays can be memory mapped with, see np.memmap
+MmapMode = typing.Literal["r", "r+", "w+", "c"]
+
+# Size of the blocks of rows that plain .npy files are read in by LazyArray
+_NPY_BLOCK_BYTES = 8 * 1024 * 1024
+
+
+class ChunkedArrayIndex(typing.NamedTuple):
+    dtype: np.dtype
+    shape: typing.Tuple[int, ...]
+    chunk_rows: int
+    compression: typing.Optional[str]
+    # Offset and length in bytes of each block of rows
+    chunks: typing.List[typing.Tuple[int, int]]
+
+    def chunk_shape(self, i: int) -> typing.Tuple[int, ...]:
+        return (min(self.chunk_rows, self.shape[0] - i * self.chunk_rows),) + self.shape[1:]
+
+
+def save_chunked(path: str, arr: np.ndarray, chunk_rows: int, compression: typing.Optional[str] = None):
+    """
+    Writes arr to path in blocks of chunk_rows rows, compressed with one of ``COMPRESSORS`` if compression is set.
+    """
+    if arr.dtype.hasobject:
+        raise ValueError("Arrays of Python objects cannot be chunked")
+    if arr.ndim == 0:
+        raise ValueError("Arrays of zero dimensions cannot be chunked")
+    if compression is not None and compression not in COMPRESSORS:
+        raise ValueError(f"Unknown compression {compression}, expected one of {list(COMPRESSORS)}")
+    arr = np.ascontiguousarray(arr)
+    chunk_rows = max(1, chunk_rows)
+    chunks = []
+    offset = 0
+    with open(path, "wb") as f:
+        for start in range(0, arr.shape[0], chunk_rows):
+            data = arr[start : start + chunk_rows].tobytes()
+            if compression is not None:
+                data = COMPRESSORS[compression][0](data)
+            f.write(data)
+            chunks.append((offset, len(data)))
+            offset += len(data)
+        index = json.dumps(
+            {
+                "descr": np.lib.format.dtype_to_descr(arr.dtype),
+                "shape": list(arr.shape),
+                "chunk_rows": chunk_rows,
+                "compression": compression,
+                "chunks": chunks,
+            }
+        ).encode("utf-8")
+        f.write(index)
+        f.write(_FOOTER.pack(len(index), CHUNKED_ARRAY_MAGIC))
+
+
+def read_chunked_index(read_range: typing.Callable[[int, int], bytes], size: int) -> typing.Optional[ChunkedArrayIndex]:
+    """
+    Returns the index of a chunked array, read through read_range(start, end), or None if the blob of the given size
+    is not a chunked array.
+    """
+    if size < _FOOTER.size:
+        return None
+    index_length, magic = _FOOTER.unpack(read_range(size - _FOOTER.size, size))
+    if magic != CHUNKED_ARRAY_MAGIC:
+        return None
+    index = json.loads(read_range(size - _FOOTER.size - index_length, size - _FOOTER.size))
+    descr = index["descr"]
+    if not isinstance(descr, str):
+        # JSON turns the tuples of structured dtype descriptions into lists
+        descr = [tuple(d) for d in descr]
+    return ChunkedArrayIndex(
+        dtype=np.lib.format.descr_to_dtype(descr),
+        shape=tuple(index["shape"]),
+        chunk_rows=index["chunk_rows"],
+        compression=index["compression"],
+        chunks=[(offset, length) for offset, length in index["chunks"]],
+    )
+
+
+def _read_file_range(path: str) -> typing.Callable[[int, int], bytes]:
+    def _read(start: int, end: int) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(start)
+            return f.read(end - start)
+
+    return _read
+
+
+def load_chunked(path: str, mmap_mode: typing.Optional[MmapMode] = None) -> typing.Optional[np.ndarray]:
+    """
+    Loads the chunked array in the local file at path, memory mapped with mmap_mode if it is not compressed. Returns
+    None if the file is not a chunked array.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, io.SEEK_END)
+        size = f.tell()
+    index = read_chunked_index(_read_file_range(path), size)
+    if index is None:
+        return None
+    data_offset = index.chunks[0][0] if index.chunks else 0
+    if index.compression is None:
+        if mmap_mode is not None and math.prod(index.shape) > 0:
+            return np.memmap(path, dtype=index.dtype, mode=mmap_mode, offset=data_offset, shape=index.shape)
+        return np.fromfile(path, dtype=index.dtype, count=math.prod(index.shape), offset=data_offset).reshape(
+            index.shape
+        )
+    arr = np.empty(index.shape, dtype=index.dtype)
+    decompress = COMPRESSORS[index.compression][1]
+    with open(path, "rb") as f:
+        for i, (offset, length) in enumerate(index.chunks):
+            f.seek(offset)
+            block = np.frombuffer(decompress(f.read(length)), dtype=index.dtype)
+            arr[i * index.chunk_rows : (i + 1) * index.chunk_rows] = block.reshape(index.chunk_shape(i))
+    return arr
+
+
+def _read_npy_index(read_range: typing.Callable[[int, int], bytes], size: int) -> ChunkedArrayIndex:
+    """
+    Describes the rows of a plain .npy file as uncompressed blocks of about ``_NPY_BLOCK_BYTES``.
+    """
+    prefix = read_range(0, min(size, 12))
+    if prefix[:6] != b"\x93NUMPY":
+        raise ValueError("Not a numpy array file")
+    if prefix[6] == 1:
+        data_offset = 10 + struct.unpack("<H", prefix[8:10])[0]
+    else:
+        data_offset = 12 + struct.unpack("<I", prefix[8:12])[0]
+    header = io.BytesIO(read_range(0, data_offset))
+    version = np.lib.format.read_magic(header)
+    if version == (1, 0):
+        shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(header)
+    else:
+        shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(header)
+    if fortran_order or dtype.hasobject or len(shape) == 0:
+        raise ValueError("Only C ordered arrays of at least one dimension without Python objects are read lazily")
+    row_bytes = dtype.itemsize * math.prod(shape[1:])
+    chunk_rows = max(1, _NPY_BLOCK_BYTES // max(1, row_bytes))
+    chunks = [
+        (data_offset + start * row_bytes, min(chunk_rows, shape[0] - start) * row_bytes)
+        for start in range(0, shape[0], chunk_rows)
+    ]
+    return ChunkedArrayIndex(dtype=dtype, shape=tuple(shape), chunk_rows=chunk_rows, compression=None, chunks=chunks)
+
+
+class LazyArray(object):
+    """
+    Read-only proxy to a numpy array in a chunked array or ``.npy`` blob, that only reads the blocks of rows touched
+    by indexing. The most recently used ``max_cached_chunks`` blocks are kept in memory. Indexing returns numpy arrays,
+    and ``np.asarray`` loads the whole array.
+    """
+
+    def __init__(self, fs: fsspec.AbstractFileSystem, path: str, max_cached_chunks: int = 16):
+        self._fs = fs
+        self._path = path
+        size = fs.size(path)
+        self._index = read_chunked_index(self._read_range, size) or _read_npy_index(self._read_range, size)
+        self._max_cached_chunks = max(1, max_cached_chunks)
+        self._cache: typing.OrderedDict[int, np.ndarray] = collections.OrderedDict()
+
+    def _read_range(self, start: int, end: int) -> bytes:
+        return self._fs.cat_file(self._path, start=start, end=end)
+
+    @property
+    def shape(self) -> typing.Tuple[int, ...]:
+        return self._index.shape
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self._index.dtype
+
+    @property
+    def ndim(self) -> int:
+        return len(self.shape)
+
+    @property
+    def size(self) -> int:
+        return math.prod(self.shape)
+
+    @property
+    def nbytes(self) -> int:
+        return self.size * self.dtype.itemsize
+
+    @property
+    def compressed(self) -> bool:
+        return self._index.compression is not None
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __repr__(self) -> str:
+        return f"LazyArray({self._path}, shape={self.shape}, dtype={self.dtype})"
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        arr = self[:]
+        return arr if dtype is None else arr.astype(dtype)
+
+    def _chunks(self, ids: typing.Sequence[int]) -> typing.List[np.ndarray]:
+        """
+        Returns the blocks of rows with the given ids, reading the ones that are not cached concurrently.
+        """
+        missing = [i for i in ids if i not in self._cache]
+        if missing:
+            ranges = [self._index.chunks[i] for i in missing]
+            data = self._fs.cat_ranges(
+                [self._path] * len(missing), [o for o, _ in ranges], [o + n for o, n in ranges], on_error="raise"
+            )
+            for i, d in zip(missing, data):
+                if self._index.compression is not None:
+                    d = COMPRESSORS[self._index.compression][1](d)
+                self._cache[i] = np.frombuffer(d, dtype=self.dtype).reshape(self._index.chunk_shape(i))
+        blocks = []
+        for i in ids:
+            self._cache.move_to_end(i)
+            blocks.append(self._cache[i])
+        while len(self._cache) > self._max_cached_chunks:
+            self._cache.popitem(last=False)
+        return blocks
+
+    def _block(self, first_chunk: int, last_chunk: int) -> np.ndarray:
+        blocks = self._chunks(range(first_chunk, last_chunk + 1))
+        return blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+
+    def __getitem__(self, key) -> np.ndarray:
+        if not isinstance(key, tuple):
+            key = (key,)
+        first, rest = (key[0], key[1:]) if key else (slice(None), ())
+        n = self.shape[0]
+        rows = self._index.chunk_rows
+
+        if isinstance(first, (int, np.integer)):
+            i = int(first) + n if first < 0 else int(first)
+            if not 0 <= i < n:
+                raise IndexError(f"index {first} is out of bounds for axis 0 with size {n}")
+            return self._block(i // rows, i // rows)[(i % rows, *rest)]
+
+        if isinstance(first, slice):
+            selected = range(*first.indices(n))
+            if not selected:
+                return np.empty((0,) + self.shape[1:], dtype=self.dtype)[(slice(None), *rest)]
+            lo, hi = min(selected[0], selected[-1]), max(selected[0], selected[-1])
+            base = (lo // rows) * rows
+            block = self._block(lo // rows, hi // rows)
+            if selected.step > 0:
+                local: typing.Any = slice(selected.start - base, selected.stop - base, selected.step)
+            else:
+                local = np.arange(selected.start - base, selected.stop - base, selected.step)
+            return block[(local, *rest)]
+
+        if first is Ellipsis or first is None:
+            return np.asarray(self)[key]
+
+        indices = np.asarray(first)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        indices = np.where(indices < 0, indices + n, indices)
+        if indices.size and (indices.min() < 0 or indices.max() >= n):
+            raise IndexError(f"index out of bounds for axis 0 with size {n}")
+        chunk_ids = np.unique(indices // rows)
+        if chunk_ids.size == 0:
+            return np.empty((0,) + self.shape[1:], dtype=self.dtype)[(slice(None), *rest)]
+        blocks = self._chunks([int(i) for i in chunk_ids])
+        block = blocks[0] if len(blocks) == 1 else np.concatenate(blocks)
+        # All the blocks but the last one hold chunk_rows rows, so rows keep their offset within their block
+        local_indices = np.searchsorted(chunk_ids, indices // rows) * rows + indices % rows
+        return block[(local_indices, *rest)]
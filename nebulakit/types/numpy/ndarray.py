@@ -8,12 +8,14 @@ from typing_extensions import Annotated, get_args, get_origin
 
 from nebulakit.core.context_manager import NebulaContext
 from nebulakit.core.type_engine import TypeEngine, TypeTransformer, TypeTransformerFailedError
+from nebulakit.loggers import logger
 from nebulakit.models.core import types as _core_types
 from nebulakit.models.literals import Blob, BlobMetadata, Literal, Scalar
 from nebulakit.models.types import LiteralType
+from nebulakit.types.numpy.chunked import LazyArray, MmapMode, load_chunked, save_chunked
 
 
-def extract_metadata(t: Type[np.ndarray]) -> Tuple[Type[np.ndarray], Dict[str, bool]]:
+def extract_metadata(t: Type[np.ndarray]) -> Tuple[Type[np.ndarray], Dict[str, typing.Any]]:
     metadata = {}
     if get_origin(t) is Annotated:
         base_type, metadata = get_args(t)
@@ -24,9 +26,33 @@ def extract_metadata(t: Type[np.ndarray]) -> Tuple[Type[np.ndarray], Dict[str, b
     return t, metadata
 
 
+def _load(path: str, allow_pickle: bool, mmap_mode: typing.Optional[MmapMode]) -> np.ndarray:
+    arr = load_chunked(path, mmap_mode=mmap_mode)
+    if arr is not None:
+        return arr
+    try:
+        return np.load(file=path, allow_pickle=allow_pickle, mmap_mode=mmap_mode)  # type: ignore
+    except ValueError:
+        if mmap_mode is None:
+            raise
+        # Arrays of Python objects cannot be memory mapped
+        return np.load(file=path, allow_pickle=allow_pickle)
+
+
 class NumpyArrayTransformer(TypeTransformer[np.ndarray]):
     """
-    TypeTransformer that supports np.ndarray as a native type.
+    TypeTransformer that supports np.ndarray as a native type. The metadata of ``Annotated[np.ndarray, kwtypes(...)]``
+    configures the transport:
+
+    * ``allow_pickle``: allow arrays of Python objects
+    * ``mmap_mode``: memory map the downloaded array, see ``np.load``
+    * ``chunk_rows``: write the array in blocks of that many rows, see :py:mod:`nebulakit.types.numpy.chunked`
+    * ``compression``: compress the blocks of rows with ``zlib``, ``bz2`` or ``lzma``
+    * ``lazy``: return a :py:class:`nebulakit.types.numpy.chunked.LazyArray` that only reads the rows that are indexed,
+      instead of downloading the whole array
+
+    Arrays written and read on the local file system, as in local executions, are not copied: they are written to their
+    final location and read from there, memory mapped only if ``mmap_mode`` is set.
     """
 
     NUMPY_ARRAY_FORMAT = "NumpyArray"
@@ -52,12 +78,24 @@ class NumpyArrayTransformer(TypeTransformer[np.ndarray]):
             )
         )
 
-        local_path = ctx.file_access.get_random_local_path() + ".npy"
+        is_local = not ctx.file_access.is_remote(ctx.file_access.raw_output_prefix)
+        if is_local:
+            # Write the array straight to its final location instead of copying it there
+            local_path = ctx.file_access.strip_file_header(
+                ctx.file_access.join(ctx.file_access.raw_output_prefix, ctx.file_access.get_random_string(), "arr.npy")
+            )
+        else:
+            local_path = ctx.file_access.get_random_local_path() + ".npy"
         pathlib.Path(local_path).parent.mkdir(parents=True, exist_ok=True)
 
         # save numpy array to file
-        np.save(file=local_path, arr=python_val, allow_pickle=metadata.get("allow_pickle", False))
-        remote_path = ctx.file_access.put_raw_data(local_path)
+        chunk_rows = metadata.get("chunk_rows")
+        compression = metadata.get("compression")
+        if (chunk_rows or compression) and not python_val.dtype.hasobject and python_val.ndim > 0:
+            save_chunked(local_path, python_val, chunk_rows or python_val.shape[0], compression=compression)
+        else:
+            np.save(file=local_path, arr=python_val, allow_pickle=metadata.get("allow_pickle", False))
+        remote_path = local_path if is_local else ctx.file_access.put_raw_data(local_path)
         return Literal(scalar=Scalar(blob=Blob(metadata=meta, uri=remote_path)))
 
     def to_python_value(self, ctx: NebulaContext, lv: Literal, expected_python_type: Type[np.ndarray]) -> np.ndarray:
@@ -67,16 +105,24 @@ class NumpyArrayTransformer(TypeTransformer[np.ndarray]):
             raise TypeTransformerFailedError(f"Cannot convert from {lv} to {expected_python_type}")
 
         expected_python_type, metadata = extract_metadata(expected_python_type)
+        allow_pickle = metadata.get("allow_pickle", False)
+        mmap_mode = metadata.get("mmap_mode")
+
+        if not ctx.file_access.is_remote(uri):
+            # Read local arrays in place instead of copying them first
+            return _load(ctx.file_access.strip_file_header(uri), allow_pickle, mmap_mode)
+
+        if metadata.get("lazy"):
+            try:
+                return LazyArray(ctx.file_access.get_filesystem_for_path(uri), uri)  # type: ignore
+            except ValueError as e:
+                logger.debug(f"Downloading {uri} instead of reading it lazily: {e}")
 
         local_path = ctx.file_access.get_random_local_path()
         ctx.file_access.get_data(uri, local_path, is_multipart=False)
 
         # load numpy array from a file
-        return np.load(
-            file=local_path,
-            allow_pickle=metadata.get("allow_pickle", False),
-            mmap_mode=metadata.get("mmap_mode"),  # type: ignore
-        )
+        return _load(local_path, allow_pickle, mmap_mode)
 
     def guess_python_type(self, literal_type: LiteralType) -> typing.Type[np.ndarray]:
         if (
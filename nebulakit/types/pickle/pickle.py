@@ -1,10 +1,16 @@
+import contextlib
+import io
 import os
+import struct
+import threading
 import typing
+from contextvars import ContextVar
 from typing import Type
 
 import cloudpickle
 
 from nebulakit.core.context_manager import NebulaContext, NebulaContextManager
+from nebulakit.core.data_persistence import SEGMENT_URI_SEPARATOR
 from nebulakit.core.type_engine import TypeEngine, TypeTransformer
 from nebulakit.models.core import types as _core_types
 from nebulakit.models.literals import Blob, BlobMetadata, Literal, Scalar
@@ -26,6 +32,209 @@ class BatchSize:
         return self._val
 
 
+class PickleStore(object):
+    """
+    Packs many pickled objects into a single segmented blob, so that a list of objects is uploaded as one file instead
+    of one file per object. Each object is referenced as ``<blob uri>#segment=<index>``. The blob holds the pickled
+    objects back to back, followed by an index of their offsets and a fixed size footer pointing at the index, so that
+    any one object can be read back without unpickling the others.
+
+    Within :py:meth:`PickleStore.batch`, :py:meth:`NebulaPickle.to_pickle` adds objects to the current store, which is
+    uploaded when the outermost batch exits. Packing is opt-in through ``DataConfig.pack_pickles``, as segment uris
+    cannot be read by older versions of nebulakit.
+    """
+
+    _MAGIC = b"NBPKLSEG"
+    # Offset of the index followed by the magic bytes
+    _FOOTER = struct.Struct("<Q8s")
+
+    # Index and local copy of the segmented blobs read so far, keyed by blob uri
+    _indices: typing.Dict[str, typing.List[typing.Tuple[int, int]]] = {}
+    _local_copies: typing.Dict[str, str] = {}
+    _read_lock = threading.Lock()
+
+    def __init__(self, ctx: NebulaContext):
+        self._ctx = ctx
+        self._uri = ctx.file_access.get_random_remote_path("pickles.seg")
+        self._buffer = io.BytesIO()
+        self._segments: typing.List[typing.Tuple[int, int]] = []
+        # The same object added twice is stored once. Objects are kept referenced so their ids are not reused.
+        self._by_identity: typing.Dict[int, typing.Tuple[typing.Any, str]] = {}
+        self._lock = threading.Lock()
+
+    def add(self, python_val: typing.Any) -> str:
+        payload = cloudpickle.dumps(python_val)
+        with self._lock:
+            if id(python_val) in self._by_identity:
+                return self._by_identity[id(python_val)][1]
+            self._segments.append((self._buffer.tell(), len(payload)))
+            self._buffer.write(payload)
+            uri = f"{self._uri}{SEGMENT_URI_SEPARATOR}{len(self._segments) - 1}"
+            self._by_identity[id(python_val)] = (python_val, uri)
+            return uri
+
+    def flush(self):
+        """
+        Writes the index and uploads the blob, if any object was added.
+        """
+        if not self._segments:
+            return
+        index = cloudpickle.dumps(self._segments)
+        index_offset = self._buffer.tell()
+        self._buffer.write(index)
+        self._buffer.write(self._FOOTER.pack(index_offset, self._MAGIC))
+        local_path = self._ctx.file_access.get_random_local_path("pickles.seg")
+        os.makedirs(os.path.dirname(local_path), exist_ok=True)
+        with open(local_path, "wb") as outfile:
+            outfile.write(self._buffer.getbuffer())
+        self._ctx.file_access.put_data(local_path, self._uri)
+        with PickleStore._read_lock:
+            PickleStore._local_copies[self._uri] = local_path
+        self._buffer = io.BytesIO()
+        self._segments = []
+        self._by_identity = {}
+
+    @classmethod
+    @contextlib.contextmanager
+    def batch(cls) -> typing.Generator[typing.Optional["PickleStore"], None, None]:
+        """
+        Packs the objects pickled within this context into a single segmented blob. Nested batches join the outermost
+        one. This is a no-op unless ``DataConfig.pack_pickles`` is set, and for local executions, which keep pickled
+        objects in memory instead, see :py:class:`LocalPickleCache`.
+        """
+        store = _active_pickle_store.get()
+        ctx = NebulaContextManager.current_context()
+        if store is not None or not ctx.file_access.data_config.pack_pickles or LocalPickleCache.is_enabled(ctx):
+            yield store
+            return
+        store = PickleStore(ctx)
+        token = _active_pickle_store.set(store)
+        try:
+            yield store
+        finally:
+            _active_pickle_store.reset(token)
+        store.flush()
+
+    @classmethod
+    def read(cls, ctx: NebulaContext, uri: str) -> bytes:
+        """
+        Returns the pickled object referenced by ``<blob uri>#segment=<index>``. Remote blobs are downloaded once and
+        reused for all their segments.
+        """
+        blob_uri, segment = uri.rsplit(SEGMENT_URI_SEPARATOR, 1)
+        with cls._read_lock:
+            local_path = cls._local_copies.get(blob_uri)
+            if local_path is None:
+                local_path = blob_uri
+                if ctx.file_access.is_remote(blob_uri):
+                    local_path = ctx.file_access.get_random_local_path("pickles.seg")
+                    ctx.file_access.get_data(blob_uri, local_path, False)
+                cls._local_copies[blob_uri] = local_path
+        with open(local_path, "rb") as infile:
+            index = cls._indices.get(blob_uri)
+            if index is None:
+                infile.seek(-cls._FOOTER.size, os.SEEK_END)
+                index_offset, magic = cls._FOOTER.unpack(infile.read(cls._FOOTER.size))
+                if magic != cls._MAGIC:
+                    raise ValueError(f"{blob_uri} is not a segmented pickle blob")
+                infile.seek(index_offset)
+                index = cloudpickle.loads(infile.read())
+                cls._indices[blob_uri] = index
+            offset, length = index[int(segment)]
+            infile.seek(offset)
+            return infile.read(length)
+
+
+_active_pickle_store: ContextVar[typing.Optional[PickleStore]] = ContextVar("active_pickle_store", default=None)
+
+
+class LocalPickleCache(object):
+    """
+    In local executions, objects pickled by :py:class:`NebulaPickle` are kept in memory, keyed by the local path they
+    would have been written to, instead of being written to the local sandbox and read back. Once the cache holds more
+    than ``MAX_BYTES``, objects are written to disk as usual. Paths that must outlive the process, e.g. outputs stored
+    in the local task cache, are written to disk with :py:meth:`LocalPickleCache.persist`. The cache is emptied when
+    the outermost local executions return, and disabled when local executions run in a process pool, whose workers
+    hand their outputs back to the parent process.
+    """
+
+    MAX_BYTES = 256 * 1024 * 1024
+
+    _payloads: typing.Dict[str, bytes] = {}
+    _size = 0
+    _executions = 0
+    _lock = threading.Lock()
+
+    @staticmethod
+    def is_enabled(ctx: NebulaContext) -> bool:
+        from nebulakit.core.local_executor import LocalExecutor
+
+        return (
+            ctx.execution_state is not None
+            and ctx.execution_state.is_local_execution()
+            and LocalExecutor.config().executor != "process"
+        )
+
+    @classmethod
+    def put(cls, ctx: NebulaContext, payload: bytes) -> typing.Optional[str]:
+        """
+        Returns the path the payload is cached under, or None if the cache is full.
+        """
+        with cls._lock:
+            if cls._size + len(payload) > cls.MAX_BYTES:
+                return None
+            uri = ctx.file_access.get_random_local_path()
+            cls._payloads[uri] = payload
+            cls._size += len(payload)
+            return uri
+
+    @classmethod
+    def get(cls, uri: str) -> typing.Optional[bytes]:
+        return cls._payloads.get(uri)
+
+    @classmethod
+    def persist(cls, literal: Literal):
+        """
+        Writes the objects referenced by the literal that are only held in memory to their path.
+        """
+        if literal.collection is not None:
+            for lit in literal.collection.literals:
+                cls.persist(lit)
+        elif literal.map is not None:
+            for lit in literal.map.literals.values():
+                cls.persist(lit)
+        elif literal.scalar is not None:
+            if literal.scalar.union is not None:
+                cls.persist(literal.scalar.union.value)
+            elif literal.scalar.blob is not None:
+                uri = literal.scalar.blob.uri
+                with cls._lock:
+                    payload = cls._payloads.pop(uri, None)
+                    if payload is not None:
+                        cls._size -= len(payload)
+                if payload is not None:
+                    os.makedirs(os.path.dirname(uri), exist_ok=True)
+                    with open(uri, "wb") as outfile:
+                        outfile.write(payload)
+
+    @classmethod
+    @contextlib.contextmanager
+    def execution(cls) -> typing.Generator[None, None, None]:
+        """
+        Marks a local execution, the cache is emptied once no local execution is running anymore.
+        """
+        with cls._lock:
+            cls._executions += 1
+        try:
+            yield
+        finally:
+            with cls._lock:
+                cls._executions -= 1
+                if cls._executions == 0:
+                    cls._payloads = {}
+                    cls._size = 0
+
+
 class NebulaPickle(typing.Generic[T]):
     """
     This type is only used by nebulakit internally. User should not use this type.
@@ -54,6 +263,14 @@ class NebulaPickle(typing.Generic[T]):
     @classmethod
     def to_pickle(cls, python_val: typing.Any) -> str:
         ctx = NebulaContextManager.current_context()
+        if LocalPickleCache.is_enabled(ctx):
+            uri = LocalPickleCache.put(ctx, cloudpickle.dumps(python_val))
+            if uri is not None:
+                return uri
+        store = _active_pickle_store.get()
+        if store is not None:
+            return store.add(python_val)
+
         local_dir = ctx.file_access.get_random_local_directory()
         os.makedirs(local_dir, exist_ok=True)
         local_path = ctx.file_access.get_random_local_path()
@@ -66,6 +283,11 @@ class NebulaPickle(typing.Generic[T]):
     @classmethod
     def from_pickle(cls, uri: str) -> typing.Any:
         ctx = NebulaContextManager.current_context()
+        payload = LocalPickleCache.get(uri)
+        if payload is not None:
+            return cloudpickle.loads(payload)
+        if SEGMENT_URI_SEPARATOR in uri:
+            return cloudpickle.loads(PickleStore.read(ctx, uri))
         # Deserialize the pickle, and return data in the pickle,
         # and download pickle file to local first if file is not in the local file systems.
         if ctx.file_access.is_remote(uri):
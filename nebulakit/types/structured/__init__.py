@@ -8,6 +8,8 @@ Nebulakit StructuredDataset
    :toctree: generated/
 
    StructuredDataset
+   ParquetWriteOptions
+   ArrowIPCWriteOptions
    StructuredDatasetEncoder
    StructuredDatasetDecoder
 """
@@ -17,6 +19,8 @@ from nebulakit.deck.renderer import ArrowRenderer, TopFrameRenderer
 from nebulakit.loggers import logger
 
 from .structured_dataset import (
+    ArrowIPCWriteOptions,
+    ParquetWriteOptions,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
@@ -34,20 +38,34 @@ def register_csv_handlers():
 def register_pandas_handlers():
     import pandas as pd
 
-    from .basic_dfs import PandasToParquetEncodingHandler, ParquetToPandasDecodingHandler
+    from .basic_dfs import (
+        ArrowIPCToPandasDecodingHandler,
+        PandasToArrowIPCEncodingHandler,
+        PandasToParquetEncodingHandler,
+        ParquetToPandasDecodingHandler,
+    )
 
     StructuredDatasetTransformerEngine.register(PandasToParquetEncodingHandler(), default_format_for_type=True)
     StructuredDatasetTransformerEngine.register(ParquetToPandasDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(PandasToArrowIPCEncodingHandler())
+    StructuredDatasetTransformerEngine.register(ArrowIPCToPandasDecodingHandler())
     StructuredDatasetTransformerEngine.register_renderer(pd.DataFrame, TopFrameRenderer())
 
 
 def register_arrow_handlers():
     import pyarrow as pa
 
-    from .basic_dfs import ArrowToParquetEncodingHandler, ParquetToArrowDecodingHandler
+    from .basic_dfs import (
+        ArrowIPCToArrowDecodingHandler,
+        ArrowToArrowIPCEncodingHandler,
+        ArrowToParquetEncodingHandler,
+        ParquetToArrowDecodingHandler,
+    )
 
     StructuredDatasetTransformerEngine.register(ArrowToParquetEncodingHandler(), default_format_for_type=True)
     StructuredDatasetTransformerEngine.register(ParquetToArrowDecodingHandler(), default_format_for_type=True)
+    StructuredDatasetTransformerEngine.register(ArrowToArrowIPCEncodingHandler())
+    StructuredDatasetTransformerEngine.register(ArrowIPCToArrowDecodingHandler())
     StructuredDatasetTransformerEngine.register_renderer(pa.Table, ArrowRenderer())
 
 
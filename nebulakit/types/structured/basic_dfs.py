@@ -1,10 +1,18 @@
+import collections
+import itertools
+import json
 import os
 import typing
+import urllib.parse
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 from typing import TypeVar
 
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.feather as feather
 import pyarrow.parquet as pq
 from botocore.exceptions import NoCredentialsError
 from fsspec.core import split_protocol, strip_protocol
@@ -17,11 +25,17 @@ from nebulakit.models import literals
 from nebulakit.models.literals import StructuredDatasetMetadata
 from nebulakit.models.types import StructuredDatasetType
 from nebulakit.types.structured.structured_dataset import (
+    ARROW_IPC,
+    COMMON_METADATA_FILE,
     CSV,
     PARQUET,
+    PARTITIONING_METADATA_KEY,
+    ArrowIPCWriteOptions,
+    ParquetWriteOptions,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
+    hive_partitioning,
 )
 
 T = TypeVar("T")
@@ -37,6 +51,166 @@ def get_pandas_storage_options(
     return None
 
 
+def _dataframes(dataframe: typing.Any) -> typing.Iterable[typing.Any]:
+    """
+    Returns the dataframes to write, the items of an iterator of dataframes or the single dataframe given.
+    """
+    return dataframe if isinstance(dataframe, collections.abc.Iterator) else [dataframe]
+
+
+def _iter_parquet_batches(
+    ctx: NebulaContext, uri: str, columns: typing.Optional[typing.List[str]], batch_size: typing.Optional[int]
+) -> typing.Generator[pa.RecordBatch, None, None]:
+    """
+    Reads the parquet files under uri one record batch of at most batch_size rows at a time.
+    """
+    _, path = split_protocol(uri)
+    fs = ctx.file_access.get_filesystem_for_path(uri)
+    dataset = ds.dataset(path, format="parquet", filesystem=fs, partitioning=hive_partitioning(fs, path))
+    kwargs = {"batch_size": batch_size} if batch_size else {}
+    yield from dataset.to_batches(columns=columns, **kwargs)
+
+
+def _columns(current_task_metadata: StructuredDatasetMetadata) -> typing.Optional[typing.List[str]]:
+    if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+        return [c.name for c in current_task_metadata.structured_dataset_type.columns]
+    return None
+
+
+# Directory name of the rows whose partition column is null, the default of hive and pyarrow
+_HIVE_NULL_PARTITION = "__HIVE_DEFAULT_PARTITION__"
+
+
+def _partitions(
+    table: pa.Table, partition_cols: typing.List[str]
+) -> typing.Generator[typing.Tuple[str, pa.Table], None, None]:
+    """
+    Splits table by the values of partition_cols, yielding the hive-style directory of each partition, e.g.
+    ``date=2023-01-01/``, with its rows without the partition columns.
+    """
+    if not partition_cols:
+        yield "", table
+        return
+    data_cols = [c for c in table.column_names if c not in partition_cols]
+    for key in table.select(partition_cols).group_by(partition_cols).aggregate([]).to_pylist():
+        mask = None
+        directory = ""
+        for c in partition_cols:
+            v = key[c]
+            if v is None:
+                matches = pc.is_null(table[c])
+            else:
+                matches = pc.equal(table[c], pa.scalar(v, table.schema.field(c).type))
+            mask = matches if mask is None else pc.and_(mask, matches)
+            directory += f"{c}={_HIVE_NULL_PARTITION if v is None else urllib.parse.quote(str(v), safe='')}/"
+        yield directory, table.filter(mask).select(data_cols)
+
+
+def _split_rows(table: pa.Table, options: ParquetWriteOptions) -> typing.Generator[pa.Table, None, None]:
+    """
+    Slices table into parts of at most options.max_rows_per_file rows and about options.max_bytes_per_file bytes.
+    """
+    rows_per_file = options.max_rows_per_file or table.num_rows
+    if options.max_bytes_per_file and table.num_rows:
+        row_bytes = max(1, table.nbytes // table.num_rows)
+        rows_per_file = min(rows_per_file, options.max_bytes_per_file // row_bytes)
+    rows_per_file = max(1, rows_per_file)
+    for start in range(0, table.num_rows, rows_per_file):
+        yield table.slice(start, rows_per_file)
+
+
+def _write_parquet(
+    ctx: NebulaContext, uri: str, tables: typing.Iterable[pa.Table], options: ParquetWriteOptions, **kwargs
+):
+    """
+    Writes tables as part files under uri, laid out as described by options, with up to options.max_workers part
+    files written at a time. The schema and partition columns of partitioned datasets are recorded in
+    ``COMMON_METADATA_FILE``, for readers to prune partitions by typed partition values.
+    """
+    fs = ctx.file_access.get_filesystem_for_path(uri)
+    root = strip_protocol(uri).rstrip("/")
+    is_local = not ctx.file_access.is_remote(uri)
+    workers = max(1, options.max_workers or ctx.file_access.data_config.max_concurrent_transfers)
+    write_kwargs = dict(
+        compression=options.compression,
+        use_dictionary=options.use_dictionary,
+        row_group_size=options.row_group_size,
+        **kwargs,
+    )
+
+    def _write_part(part: pa.Table, path: str):
+        pq.write_table(part, path, filesystem=fs, **write_kwargs)
+
+    schema = None
+    part_ids = itertools.count()
+    # Only submit up to the number of workers at a time, so that at most that many parts are held in memory
+    pending: typing.Deque[Future] = collections.deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for table in tables:
+            schema = schema or table.schema
+            for directory, partition in _partitions(table, options.partition_cols):
+                if is_local:
+                    os.makedirs(f"{root}/{directory}", exist_ok=True)
+                for part in _split_rows(partition, options):
+                    while len(pending) >= workers:
+                        pending.popleft().result()
+                    pending.append(executor.submit(_write_part, part, f"{root}/{directory}{next(part_ids):05}"))
+        while pending:
+            pending.popleft().result()
+
+    if schema is not None and next(part_ids) == 0:
+        # Empty datasets still get a file, so that readers find their schema
+        _write_part(schema.empty_table(), f"{root}/{0:05}")
+    if schema is not None and options.partition_cols:
+        metadata = dict(schema.metadata or {})
+        metadata[PARTITIONING_METADATA_KEY] = json.dumps(options.partition_cols).encode("utf-8")
+        with fs.open(f"{root}/{COMMON_METADATA_FILE}", "wb") as f:
+            pq.write_metadata(schema.with_metadata(metadata), f)
+
+
+def write_arrow_ipc(
+    ctx: NebulaContext, uri: str, tables: typing.Iterable[typing.Any], structured_dataset: StructuredDataset
+):
+    """
+    Writes each table, a pyarrow Table or a pandas DataFrame, as an Arrow IPC part file under uri, compressed as set by
+    the ArrowIPCWriteOptions of structured_dataset.
+    """
+    options = structured_dataset.write_options
+    compression = options.compression if isinstance(options, ArrowIPCWriteOptions) else None
+    fs = ctx.file_access.get_filesystem_for_path(uri)
+    root = strip_protocol(uri).rstrip("/")
+    if not ctx.file_access.is_remote(uri):
+        os.makedirs(root, exist_ok=True)
+    for i, table in enumerate(tables):
+        with fs.open(f"{root}/{i:05}", "wb") as f:
+            feather.write_feather(table, f, compression=compression or "uncompressed")
+
+
+def read_arrow_ipc(
+    ctx: NebulaContext, uri: str, columns: typing.Optional[typing.List[str]]
+) -> typing.Generator[pa.Table, None, None]:
+    """
+    Reads the Arrow IPC part files under uri one table at a time. Local files, and remote ones served from the shared
+    blob cache, are memory mapped, so uncompressed files are read without copying.
+    """
+    local_path = uri if not ctx.file_access.is_remote(uri) else ctx.file_access.get_cached_copy(uri, is_multipart=True)
+    fs = ctx.file_access.local_access if local_path is not None else ctx.file_access.get_filesystem_for_path(uri)
+    root = strip_protocol(local_path or uri).rstrip("/")
+    for path in sorted(fs.find(root)):
+        if os.path.basename(path).startswith(("_", ".")):
+            continue
+        if local_path is not None:
+            yield feather.read_table(path, columns=columns, memory_map=True)
+        else:
+            with fs.open(path, "rb") as f:
+                yield feather.read_table(f, columns=columns)
+
+
+def _concat_tables(tables: typing.Iterable[pa.Table]) -> pa.Table:
+    tables = list(tables)
+    return tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+
 class PandasToCSVEncodingHandler(StructuredDatasetEncoder):
     def __init__(self):
         super().__init__(pd.DataFrame, None, CSV)
@@ -51,7 +225,12 @@ class PandasToCSVEncodingHandler(StructuredDatasetEncoder):
         if not ctx.file_access.is_remote(uri):
             Path(uri).mkdir(parents=True, exist_ok=True)
         path = os.path.join(uri, ".csv")
-        df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
+        df: pd.DataFrame
+        if isinstance(structured_dataset.dataframe, collections.abc.Iterator):
+            # The dataset is a single csv file
+            df = pd.concat(list(structured_dataset.dataframe), ignore_index=True)
+        else:
+            df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
         df.to_csv(
             path,
             index=False,
@@ -100,14 +279,26 @@ class PandasToParquetEncodingHandler(StructuredDatasetEncoder):
         )
         if not ctx.file_access.is_remote(uri):
             Path(uri).mkdir(parents=True, exist_ok=True)
-        path = os.path.join(uri, f"{0:05}")
-        df = typing.cast(pd.DataFrame, structured_dataset.dataframe)
-        df.to_parquet(
-            path,
-            coerce_timestamps="us",
-            allow_truncated_timestamps=False,
-            storage_options=get_pandas_storage_options(uri=path, data_config=ctx.file_access.data_config),
-        )
+        if isinstance(structured_dataset.write_options, ParquetWriteOptions):
+            _write_parquet(
+                ctx,
+                uri,
+                (pa.Table.from_pandas(df) for df in _dataframes(structured_dataset.dataframe)),
+                structured_dataset.write_options,
+                coerce_timestamps="us",
+                allow_truncated_timestamps=False,
+            )
+            structured_dataset_type.format = PARQUET
+            return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+        # Iterators of dataframes are written one part file per dataframe, so that only one is in memory at a time
+        for i, df in enumerate(_dataframes(structured_dataset.dataframe)):
+            path = os.path.join(uri, f"{i:05}")
+            typing.cast(pd.DataFrame, df).to_parquet(
+                path,
+                coerce_timestamps="us",
+                allow_truncated_timestamps=False,
+                storage_options=get_pandas_storage_options(uri=path, data_config=ctx.file_access.data_config),
+            )
         structured_dataset_type.format = PARQUET
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
 
@@ -127,12 +318,29 @@ class ParquetToPandasDecodingHandler(StructuredDatasetDecoder):
         kwargs = get_pandas_storage_options(uri=uri, data_config=ctx.file_access.data_config)
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        local_copy = ctx.file_access.get_cached_copy(uri, is_multipart=True)
+        if local_copy is not None:
+            partitioning = hive_partitioning(ctx.file_access.local_access, local_copy)
+            return pd.read_parquet(local_copy, columns=columns, partitioning=partitioning)
+        _, path = split_protocol(uri)
         try:
-            return pd.read_parquet(uri, columns=columns, storage_options=kwargs)
+            partitioning = hive_partitioning(ctx.file_access.get_filesystem_for_path(uri), path)
+            return pd.read_parquet(uri, columns=columns, storage_options=kwargs, partitioning=partitioning)
         except NoCredentialsError:
             logger.debug("S3 source detected, attempting anonymous S3 access")
             kwargs = get_pandas_storage_options(uri=uri, data_config=ctx.file_access.data_config, anonymous=True)
-            return pd.read_parquet(uri, columns=columns, storage_options=kwargs)
+            partitioning = hive_partitioning(ctx.file_access.get_filesystem_for_path(uri, anonymous=True), path)
+            return pd.read_parquet(uri, columns=columns, storage_options=kwargs, partitioning=partitioning)
+
+    def iter_decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+    ) -> typing.Generator[pd.DataFrame, None, None]:
+        for batch in _iter_parquet_batches(ctx, nebula_value.uri, _columns(current_task_metadata), batch_size):
+            yield batch.to_pandas()
 
 
 class ArrowToParquetEncodingHandler(StructuredDatasetEncoder):
@@ -150,9 +358,14 @@ class ArrowToParquetEncodingHandler(StructuredDatasetEncoder):
         )
         if not ctx.file_access.is_remote(uri):
             Path(uri).mkdir(parents=True, exist_ok=True)
-        path = os.path.join(uri, f"{0:05}")
-        filesystem = ctx.file_access.get_filesystem_for_path(path)
-        pq.write_table(structured_dataset.dataframe, strip_protocol(path), filesystem=filesystem)
+        if isinstance(structured_dataset.write_options, ParquetWriteOptions):
+            _write_parquet(ctx, uri, _dataframes(structured_dataset.dataframe), structured_dataset.write_options)
+            return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+        filesystem = ctx.file_access.get_filesystem_for_path(uri)
+        # Iterators of tables are written one part file per table, so that only one is in memory at a time
+        for i, table in enumerate(_dataframes(structured_dataset.dataframe)):
+            path = os.path.join(uri, f"{i:05}")
+            pq.write_table(table, strip_protocol(path), filesystem=filesystem)
         return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
 
 
@@ -174,11 +387,110 @@ class ParquetToArrowDecodingHandler(StructuredDatasetDecoder):
         columns = None
         if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
             columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        local_copy = ctx.file_access.get_cached_copy(uri, is_multipart=True)
+        if local_copy is not None:
+            partitioning = hive_partitioning(ctx.file_access.local_access, local_copy)
+            return pq.read_table(local_copy, columns=columns, partitioning=partitioning)
         try:
-            return pq.read_table(path, columns=columns)
+            fs = ctx.file_access.get_filesystem_for_path(uri)
+            return pq.read_table(path, filesystem=fs, columns=columns, partitioning=hive_partitioning(fs, path))
         except NoCredentialsError as e:
             logger.debug("S3 source detected, attempting anonymous S3 access")
             fs = ctx.file_access.get_filesystem_for_path(uri, anonymous=True)
             if fs is not None:
-                return pq.read_table(path, filesystem=fs, columns=columns)
+                return pq.read_table(path, filesystem=fs, columns=columns, partitioning=hive_partitioning(fs, path))
             raise e
+
+    def iter_decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+    ) -> typing.Generator[pa.Table, None, None]:
+        for batch in _iter_parquet_batches(ctx, nebula_value.uri, _columns(current_task_metadata), batch_size):
+            yield pa.Table.from_batches([batch])
+
+
+class PandasToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: NebulaContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        uri = typing.cast(str, structured_dataset.uri) or ctx.file_access.join(
+            ctx.file_access.raw_output_prefix, ctx.file_access.get_random_string()
+        )
+        write_arrow_ipc(ctx, uri, _dataframes(structured_dataset.dataframe), structured_dataset)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToPandasDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pd.DataFrame, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pd.DataFrame:
+        return _concat_tables(read_arrow_ipc(ctx, nebula_value.uri, _columns(current_task_metadata))).to_pandas()
+
+    def iter_decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+    ) -> typing.Generator[pd.DataFrame, None, None]:
+        for table in read_arrow_ipc(ctx, nebula_value.uri, _columns(current_task_metadata)):
+            for batch in table.to_batches(max_chunksize=batch_size):
+                yield batch.to_pandas()
+
+
+class ArrowToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pa.Table, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: NebulaContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        uri = typing.cast(str, structured_dataset.uri) or ctx.file_access.join(
+            ctx.file_access.raw_output_prefix, ctx.file_access.get_random_string()
+        )
+        write_arrow_ipc(ctx, uri, _dataframes(structured_dataset.dataframe), structured_dataset)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToArrowDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pa.Table, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pa.Table:
+        return _concat_tables(read_arrow_ipc(ctx, nebula_value.uri, _columns(current_task_metadata)))
+
+    def iter_decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: typing.Optional[int] = None,
+    ) -> typing.Generator[pa.Table, None, None]:
+        for table in read_arrow_ipc(ctx, nebula_value.uri, _columns(current_task_metadata)):
+            for batch in table.to_batches(max_chunksize=batch_size):
+                yield pa.Table.from_batches([batch])
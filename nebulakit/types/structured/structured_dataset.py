@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import collections
+import itertools
+import json
 import types
 import typing
 from abc import ABC, abstractmethod
@@ -9,6 +11,7 @@ from typing import Dict, Generator, Optional, Type, Union
 
 import _datetime
 from dataclasses_json import config
+from fsspec.core import split_protocol
 from fsspec.utils import get_protocol
 from marshmallow import fields
 from mashumaro.mixins.json import DataClassJSONMixin
@@ -26,7 +29,9 @@ from nebulakit.models.types import LiteralType, SchemaType, StructuredDatasetTyp
 
 if typing.TYPE_CHECKING:
     import pandas as pd
+    import pyarrow
     import pyarrow as pa
+    import pyarrow.compute as pc
 else:
     pd = lazy_module("pandas")
     pa = lazy_module("pyarrow")
@@ -40,9 +45,88 @@ StructuredDatasetFormat: TypeAlias = str
 # Storage formats
 PARQUET: StructuredDatasetFormat = "parquet"
 CSV: StructuredDatasetFormat = "csv"
+# Arrow IPC files, a.k.a. Feather v2. Cheap to write and read, and memory mapped when read from local paths, for
+# dataframes that are only handed off to the next task
+ARROW_IPC: StructuredDatasetFormat = "arrow_ipc"
 GENERIC_FORMAT: StructuredDatasetFormat = ""
 GENERIC_PROTOCOL: str = "generic protocol"
 
+# File written next to the part files of partitioned parquet datasets, holding their schema and partition columns
+COMMON_METADATA_FILE = "_common_metadata"
+# Key of the partition columns in the schema metadata of COMMON_METADATA_FILE
+PARTITIONING_METADATA_KEY = b"nebula.partitioning"
+
+
+@dataclass
+class ParquetWriteOptions(object):
+    """
+    Layout of the parquet files written by the built-in parquet encoders. Use it as an annotation of the dataframe or
+    StructuredDataset type, e.g. ``Annotated[pd.DataFrame, ParquetWriteOptions(partition_cols=["date"])]``, or pass
+    it to a StructuredDataset with ``write_options``.
+
+    Rows are split into hive-style directories, ``col=value/``, by the values of ``partition_cols``, and each
+    directory into part files of at most ``max_rows_per_file`` rows and about ``max_bytes_per_file`` bytes of Arrow
+    data (files are smaller once compressed). Part files are written concurrently by ``max_workers`` threads, by
+    default ``DataConfig.max_concurrent_transfers``. ``row_group_size``, ``compression`` and ``use_dictionary`` are
+    passed on to the parquet writer.
+    """
+
+    partition_cols: typing.List[str] = field(default_factory=list)
+    max_rows_per_file: typing.Optional[int] = None
+    max_bytes_per_file: typing.Optional[int] = None
+    row_group_size: typing.Optional[int] = None
+    compression: typing.Optional[str] = "snappy"
+    use_dictionary: typing.Union[bool, typing.List[str]] = True
+    max_workers: typing.Optional[int] = None
+
+
+@dataclass
+class ArrowIPCWriteOptions(object):
+    """
+    Options of the Arrow IPC files written by the built-in ``ARROW_IPC`` encoders, used like
+    :py:class:`ParquetWriteOptions`. ``compression`` is ``"lz4"`` or ``"zstd"``, or None for uncompressed files,
+    which can be read without any copy when memory mapped.
+    """
+
+    compression: typing.Optional[str] = None
+
+
+WriteOptions = Union[ParquetWriteOptions, ArrowIPCWriteOptions]
+
+
+def get_write_options(t: typing.Any) -> Optional[WriteOptions]:
+    if get_origin(t) is Annotated:
+        for aa in get_args(t)[1:]:
+            if isinstance(aa, (ParquetWriteOptions, ArrowIPCWriteOptions)):
+                return aa
+    return None
+
+
+def hive_partitioning(fs: typing.Any, path: str) -> typing.Union[str, "pyarrow.dataset.Partitioning"]:
+    """
+    Returns the partitioning of the parquet dataset at path, typed by the schema recorded in its
+    ``COMMON_METADATA_FILE`` if it has one, or "hive" to infer it from the directory names otherwise. The file is only
+    read if the listing of the dataset shows it, so that datasets without one are not probed for it.
+    """
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    root = path.rstrip("/")
+    try:
+        names = {p.rstrip("/").rsplit("/", 1)[-1] for p in fs.ls(root, detail=False)}
+        if COMMON_METADATA_FILE not in names:
+            return "hive"
+        with fs.open(f"{root}/{COMMON_METADATA_FILE}", "rb") as f:
+            schema = pq.read_schema(f)
+    except Exception as e:
+        # Backends raise their own errors for missing or unreadable objects, and pyarrow for invalid metadata
+        logger.debug(f"Failed to read the partitioning of {path}, inferring it from the directory names: {e}")
+        return "hive"
+    partition_cols = json.loads((schema.metadata or {}).get(PARTITIONING_METADATA_KEY, b"[]"))
+    if not partition_cols:
+        return "hive"
+    return ds.partitioning(pa.schema([schema.field(c) for c in partition_cols]), flavor="hive")
+
 
 @dataclass
 class StructuredDataset(DataClassJSONMixin):
@@ -67,6 +151,7 @@ class StructuredDataset(DataClassJSONMixin):
         dataframe: typing.Optional[typing.Any] = None,
         uri: typing.Optional[str] = None,
         metadata: typing.Optional[literals.StructuredDatasetMetadata] = None,
+        write_options: typing.Optional[WriteOptions] = None,
         **kwargs,
     ):
         self._dataframe = dataframe
@@ -82,11 +167,17 @@ class StructuredDataset(DataClassJSONMixin):
         # Not meant for users to set, will be set by an open() call
         self._dataframe_type: Optional[DF] = None  # type: ignore
         self._already_uploaded = False
+        # How encoders that support it lay out the files they write, from the argument or the type annotation
+        self._write_options = write_options
 
     @property
     def dataframe(self) -> Optional[DF]:
         return self._dataframe
 
+    @property
+    def write_options(self) -> Optional[WriteOptions]:
+        return self._write_options
+
     @property
     def metadata(self) -> Optional[StructuredDatasetMetadata]:
         return self._metadata
@@ -105,14 +196,123 @@ class StructuredDataset(DataClassJSONMixin):
         ctx = NebulaContextManager.current_context()
         return nebula_dataset_transformer.open_as(ctx, self.literal, self._dataframe_type, self.metadata)
 
-    def iter(self) -> Generator[DF, None, None]:
+    def iter(self, batch_size: Optional[int] = None) -> Generator[DF, None, None]:
+        """
+        Yields the dataset one dataframe at a time. Decoders that read in record batches, like the built-in parquet
+        ones, yield dataframes of at most batch_size rows.
+        """
         if self._dataframe_type is None:
             raise ValueError("No dataframe type set. Use open() to set the local dataframe type you want to use.")
         ctx = NebulaContextManager.current_context()
         return nebula_dataset_transformer.iter_as(
-            ctx, self.literal, self._dataframe_type, updated_metadata=self.metadata
+            ctx, self.literal, self._dataframe_type, updated_metadata=self.metadata, batch_size=batch_size
         )
 
+    def scan(self) -> StructuredDatasetScan:
+        """
+        Returns a lazy handle to the rows of this dataset, that column projections, row filters and row limits can be
+        attached to before anything is read.
+        """
+        return StructuredDatasetScan(self)
+
+
+class StructuredDatasetScan(object):
+    """
+    Lazy handle to the rows of a StructuredDataset, returned by :py:meth:`StructuredDataset.scan`. Column projections,
+    row filters and row limits are pushed down to a pyarrow dataset scan of the parquet files, so that only the columns
+    and the row groups whose statistics can match the filter are read. Datasets in other formats are decoded to an
+    arrow table first and then filtered in memory.
+
+    .. code-block:: python
+
+        @task
+        def t1(sd: StructuredDataset) -> pd.DataFrame:
+            return sd.scan().select(["id", "score"]).filter(pc.field("score") > 0.9).limit(1000).to_pandas()
+
+    Columns default to the ones of the type annotation of the dataset, if any.
+    """
+
+    def __init__(self, sd: StructuredDataset):
+        self._sd = sd
+        self._columns: Optional[typing.List[str]] = None
+        self._filter: Optional["pc.Expression"] = None
+        self._limit: Optional[int] = None
+
+    def select(self, columns: typing.List[str]) -> StructuredDatasetScan:
+        self._columns = list(columns)
+        return self
+
+    def filter(self, expression: typing.Union["pc.Expression", typing.List]) -> StructuredDatasetScan:
+        """
+        :param expression: A ``pyarrow.compute.Expression``, or filters in the disjunctive normal form accepted by
+            ``pyarrow.parquet.read_table``, e.g. ``[("score", ">", 0.9)]``. Filters of repeated calls are combined
+            with a logical and.
+        """
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        if not isinstance(expression, pc.Expression):
+            filters_to_expression = getattr(pq, "filters_to_expression", None) or pq._filters_to_expression
+            expression = filters_to_expression(expression)
+        self._filter = expression if self._filter is None else self._filter & expression
+        return self
+
+    def limit(self, n: int) -> StructuredDatasetScan:
+        self._limit = n
+        return self
+
+    def _dataset(self) -> "pyarrow.dataset.Dataset":
+        import pyarrow.dataset as ds
+
+        if self._sd.dataframe is not None:
+            df = self._sd.dataframe
+            return ds.dataset(df if isinstance(df, pa.Table) else pa.Table.from_pandas(df, preserve_index=False))
+
+        literal = self._sd.literal
+        uri = literal.uri if literal is not None else self._sd.uri
+        if uri is None:
+            raise ValueError("Cannot scan a StructuredDataset that has neither a dataframe nor a uri")
+        file_format = literal.metadata.structured_dataset_type.format if literal is not None else self._sd.file_format
+        ctx = NebulaContextManager.current_context()
+        if file_format in (PARQUET, GENERIC_FORMAT):
+            _, path = split_protocol(uri)
+            fs = ctx.file_access.get_filesystem_for_path(uri)
+            return ds.dataset(path, format="parquet", filesystem=fs, partitioning=hive_partitioning(fs, path))
+        if file_format == ARROW_IPC:
+            _, path = split_protocol(uri)
+            return ds.dataset(path, format="ipc", filesystem=ctx.file_access.get_filesystem_for_path(uri))
+        if literal is None:
+            raise ValueError(f"Cannot scan {uri} in format {file_format}")
+        return ds.dataset(nebula_dataset_transformer.open_as(ctx, literal, pa.Table, self._sd.metadata))
+
+    def _scanner(self) -> "pyarrow.dataset.Scanner":
+        columns = self._columns
+        sdt = self._sd.metadata.structured_dataset_type if self._sd.metadata else None
+        if columns is None and sdt and sdt.columns:
+            columns = [c.name for c in sdt.columns]
+        return self._dataset().scanner(columns=columns, filter=self._filter)
+
+    def to_arrow(self) -> "pa.Table":
+        scanner = self._scanner()
+        # head() stops reading as soon as enough rows were found
+        return scanner.head(self._limit) if self._limit is not None else scanner.to_table()
+
+    def to_pandas(self) -> "pd.DataFrame":
+        return self.to_arrow().to_pandas()
+
+    def to_batches(self) -> Generator["pa.RecordBatch", None, None]:
+        """
+        Yields the matching rows one record batch at a time, without holding the whole result in memory.
+        """
+        remaining = self._limit
+        for batch in self._scanner().to_batches():
+            if remaining is not None:
+                if remaining <= 0:
+                    return
+                batch = batch.slice(0, remaining)
+                remaining -= batch.num_rows
+            yield batch
+
 
 def extract_cols_and_format(
     t: typing.Any,
@@ -277,6 +477,25 @@ class StructuredDatasetDecoder(ABC):
         """
         raise NotImplementedError
 
+    def iter_decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+        batch_size: Optional[int] = None,
+    ) -> typing.Iterator[DF]:
+        """
+        This is called by the dataset transformer engine when the dataset is iterated over instead of being opened
+        whole. Decoders that can stream the dataset override this to yield dataframes of at most batch_size rows. By
+        default, decode is expected to return an iterator.
+
+        :param batch_size: Maximum number of rows of the yielded dataframes, if the decoder supports it.
+        """
+        result: Union[DF, typing.Iterator[DF]] = self.decode(ctx, nebula_value, current_task_metadata)
+        if not isinstance(result, types.GeneratorType):
+            raise ValueError(f"Decoder {self} didn't return iterator {result} but should have from {nebula_value}")
+        return result
+
 
 def convert_schema_type_to_structured_dataset_type(
     column_type: int,
@@ -531,6 +750,7 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
     ) -> Literal:
         # Make a copy in case we need to hand off to encoders, since we can't be sure of mutations.
         # Check first to see if it's even an SD type. For backwards compatibility, we may be getting a NebulaSchema
+        write_options = get_write_options(python_type)
         python_type, *attrs = extract_cols_and_format(python_type)
         # In case it's a NebulaSchema
         sdt = StructuredDatasetType(format=self.DEFAULT_FORMATS.get(python_type, GENERIC_FORMAT))
@@ -585,24 +805,56 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
             # 3. This is the third and probably most common case. The python StructuredDataset object wraps a dataframe
             # that we will need to invoke an encoder for. Figure out which encoder to call and invoke it.
             df_type = type(python_val.dataframe)
+            if isinstance(python_val.dataframe, collections.abc.Iterator):
+                # An iterator of dataframes, that encoders write one at a time. The encoder is picked from the type of
+                # the first dataframe.
+                first = next(python_val.dataframe, None)
+                if first is None:
+                    raise ValueError(f"The iterator of dataframes of {python_val} is empty")
+                python_val._dataframe = itertools.chain([first], python_val.dataframe)
+                df_type = type(first)
+            if python_val.write_options is None:
+                python_val._write_options = write_options
             protocol = self._protocol_from_type_or_prefix(ctx, df_type, python_val.uri)
             return self.encode(
                 ctx,
                 python_val,
                 df_type,
                 protocol,
-                sdt.format,
+                sdt.format or self._default_format(ctx, df_type, protocol),
                 sdt,
             )
 
         # Otherwise assume it's a dataframe instance. Wrap it with some defaults
-        fmt = self.DEFAULT_FORMATS.get(python_type, "")
         protocol = self._protocol_from_type_or_prefix(ctx, python_type)
+        if sdt.format and self._has_encoder(python_type, protocol, sdt.format):
+            fmt = sdt.format
+        else:
+            fmt = self._default_format(ctx, python_type, protocol)
         meta = StructuredDatasetMetadata(structured_dataset_type=expected.structured_dataset_type if expected else None)
 
-        sd = StructuredDataset(dataframe=python_val, metadata=meta)
+        sd = StructuredDataset(dataframe=python_val, metadata=meta, write_options=write_options)
         return self.encode(ctx, sd, python_type, protocol, fmt, sdt)
 
+    def _has_encoder(self, df_type: Type, protocol: str, fmt: str) -> bool:
+        try:
+            return self.get_encoder(df_type, protocol, fmt).supported_format == fmt
+        except ValueError:
+            return False
+
+    def _default_format(self, ctx: NebulaContext, df_type: Type, protocol: str) -> str:
+        """
+        Returns the format to write dataframes of df_type in when their type does not specify one:
+        ``DataConfig.structured_dataset_format`` if df_type has an encoder for it, the default format of df_type
+        otherwise.
+        """
+        fmt = ctx.file_access.data_config.structured_dataset_format
+        if fmt:
+            if self._has_encoder(df_type, protocol, fmt):
+                return fmt
+            logger.debug(f"No encoder for {df_type} in format {fmt}, using the default format of the type")
+        return self.DEFAULT_FORMATS.get(df_type, GENERIC_FORMAT)
+
     def _protocol_from_type_or_prefix(self, ctx: NebulaContext, df_type: Type, uri: Optional[str] = None) -> str:
         """
         Get the protocol from the default, if missing, then look it up from the uri if provided, if not then look
@@ -761,10 +1013,11 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
 
     def to_html(self, ctx: NebulaContext, python_val: typing.Any, expected_python_type: Type[T]) -> str:
         if isinstance(python_val, StructuredDataset):
-            if python_val.dataframe is not None:
+            if python_val.dataframe is not None and not isinstance(python_val.dataframe, collections.abc.Iterator):
                 df = python_val.dataframe
             else:
-                # Here we only render column information by default instead of opening the structured dataset.
+                # Here we only render column information by default instead of opening the structured dataset, or
+                # consuming its iterator of dataframes.
                 col = typing.cast(StructuredDataset, python_val).columns()
                 df = pd.DataFrame(col, ["column type"])
                 return df.to_html()  # type: ignore
@@ -803,13 +1056,11 @@ class StructuredDatasetTransformerEngine(TypeTransformer[StructuredDataset]):
         sd: literals.StructuredDataset,
         df_type: Type[DF],
         updated_metadata: StructuredDatasetMetadata,
+        batch_size: Optional[int] = None,
     ) -> typing.Iterator[DF]:
         protocol = get_protocol(sd.uri)
-        decoder = self.DECODERS[df_type][protocol][sd.metadata.structured_dataset_type.format]
-        result: Union[DF, typing.Iterator[DF]] = decoder.decode(ctx, sd, updated_metadata)
-        if not isinstance(result, types.GeneratorType):
-            raise ValueError(f"Decoder {decoder} didn't return iterator {result} but should have from {sd}")
-        return result
+        decoder = self.get_decoder(df_type, protocol, sd.metadata.structured_dataset_type.format)
+        return decoder.iter_decode(ctx, sd, updated_metadata, batch_size=batch_size)
 
     def _get_dataset_column_literal_type(self, t: Type) -> type_models.LiteralType:
         if t in get_supported_types():
@@ -9,6 +9,13 @@ This package contains things that are useful when extending Nebulakit.
 
    PolarsDataFrameToParquetEncodingHandler
    ParquetToPolarsDataFrameDecodingHandler
+   PolarsDataFrameToArrowIPCEncodingHandler
+   ArrowIPCToPolarsDataFrameDecodingHandler
 """
 
-from .sd_transformers import ParquetToPolarsDataFrameDecodingHandler, PolarsDataFrameToParquetEncodingHandler
+from .sd_transformers import (
+    ArrowIPCToPolarsDataFrameDecodingHandler,
+    ParquetToPolarsDataFrameDecodingHandler,
+    PolarsDataFrameToArrowIPCEncodingHandler,
+    PolarsDataFrameToParquetEncodingHandler,
+)
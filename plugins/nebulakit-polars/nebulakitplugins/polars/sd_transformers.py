@@ -10,7 +10,9 @@ from nebulakit.core.data_persistence import get_fsspec_storage_options
 from nebulakit.models import literals
 from nebulakit.models.literals import StructuredDatasetMetadata
 from nebulakit.models.types import StructuredDatasetType
+from nebulakit.types.structured.basic_dfs import read_arrow_ipc, write_arrow_ipc
 from nebulakit.types.structured.structured_dataset import (
+    ARROW_IPC,
     PARQUET,
     StructuredDataset,
     StructuredDatasetDecoder,
@@ -79,6 +81,43 @@ class ParquetToPolarsDataFrameDecodingHandler(StructuredDatasetDecoder):
         return pl.read_parquet(uri, use_pyarrow=True, storage_options=kwargs)
 
 
-StructuredDatasetTransformerEngine.register(PolarsDataFrameToParquetEncodingHandler())
-StructuredDatasetTransformerEngine.register(ParquetToPolarsDataFrameDecodingHandler())
+class PolarsDataFrameToArrowIPCEncodingHandler(StructuredDatasetEncoder):
+    def __init__(self):
+        super().__init__(pl.DataFrame, None, ARROW_IPC)
+
+    def encode(
+        self,
+        ctx: NebulaContext,
+        structured_dataset: StructuredDataset,
+        structured_dataset_type: StructuredDatasetType,
+    ) -> literals.StructuredDataset:
+        df = typing.cast(pl.DataFrame, structured_dataset.dataframe)
+        uri = typing.cast(str, structured_dataset.uri) or ctx.file_access.join(
+            ctx.file_access.raw_output_prefix, ctx.file_access.get_random_string()
+        )
+        write_arrow_ipc(ctx, uri, [df.to_arrow()], structured_dataset)
+        structured_dataset_type.format = ARROW_IPC
+        return literals.StructuredDataset(uri=uri, metadata=StructuredDatasetMetadata(structured_dataset_type))
+
+
+class ArrowIPCToPolarsDataFrameDecodingHandler(StructuredDatasetDecoder):
+    def __init__(self):
+        super().__init__(pl.DataFrame, None, ARROW_IPC)
+
+    def decode(
+        self,
+        ctx: NebulaContext,
+        nebula_value: literals.StructuredDataset,
+        current_task_metadata: StructuredDatasetMetadata,
+    ) -> pl.DataFrame:
+        columns = None
+        if current_task_metadata.structured_dataset_type and current_task_metadata.structured_dataset_type.columns:
+            columns = [c.name for c in current_task_metadata.structured_dataset_type.columns]
+        return pl.concat([pl.from_arrow(t) for t in read_arrow_ipc(ctx, nebula_value.uri, columns)])
+
+
+StructuredDatasetTransformerEngine.register(PolarsDataFrameToParquetEncodingHandler(), default_format_for_type=True)
+StructuredDatasetTransformerEngine.register(ParquetToPolarsDataFrameDecodingHandler(), default_format_for_type=True)
+StructuredDatasetTransformerEngine.register(PolarsDataFrameToArrowIPCEncodingHandler())
+StructuredDatasetTransformerEngine.register(ArrowIPCToPolarsDataFrameDecodingHandler())
 StructuredDatasetTransformerEngine.register_renderer(pl.DataFrame, PolarsDataFrameRenderer())
@@ -6,7 +6,7 @@ from nebulakitplugins.polars.sd_transformers import PolarsDataFrameRenderer
 from typing_extensions import Annotated
 
 from nebulakit import kwtypes, task, workflow
-from nebulakit.types.structured.structured_dataset import PARQUET, StructuredDataset
+from nebulakit.types.structured.structured_dataset import ARROW_IPC, PARQUET, ArrowIPCWriteOptions, StructuredDataset
 
 subset_schema = Annotated[StructuredDataset, kwtypes(col2=str), PARQUET]
 full_schema = Annotated[StructuredDataset, PARQUET]
@@ -98,3 +98,20 @@ def test_parquet_to_polars():
 
     sd = StructuredDataset(uri=tmp)
     assert t2(sd=sd).open(pl.DataFrame).all().frame_equal(polars_df)
+
+
+def test_arrow_ipc_polars():
+    @task
+    def generate() -> Annotated[StructuredDataset, ARROW_IPC, ArrowIPCWriteOptions(compression="zstd")]:
+        return StructuredDataset(dataframe=pl.DataFrame({"col1": [1, 3, 2], "col2": list("abc")}))
+
+    @task
+    def consume(sd: Annotated[StructuredDataset, kwtypes(col2=str)]) -> pl.DataFrame:
+        assert sd.file_format == ARROW_IPC
+        return sd.open(pl.DataFrame).all()
+
+    @workflow
+    def wf() -> pl.DataFrame:
+        return consume(sd=generate())
+
+    assert wf().frame_equal(pl.DataFrame({"col2": list("abc")}))
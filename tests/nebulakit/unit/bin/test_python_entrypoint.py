@@ -372,3 +372,57 @@ def test_env_reading(mock_os):
         assert ctx.execution_state.user_space_params.task_id.name == "task_name"
         assert ctx.execution_state.user_space_params.task_id.version == "task_ver"
         assert ctx.execution_state.user_space_params.execution_id.name == "exec_name"
+
+
+@mock.patch("nebulakit.core.utils.load_proto_from_file")
+@mock.patch("nebulakit.core.data_persistence.FileAccessProvider.get_data")
+@mock.patch("nebulakit.core.data_persistence.FileAccessProvider.put_data")
+@mock.patch("nebulakit.core.utils.write_proto_to_file")
+def test_dispatch_execute_map_chunk(mock_write_to_file, mock_upload_dir, mock_get_data, mock_load_proto):
+    from nebulakit.bin.entrypoint import _dispatch_execute_map_chunk
+    from nebulakit.core.map_task import map_task
+
+    mock_get_data.return_value = True
+    mock_upload_dir.return_value = True
+
+    @task
+    def t1(a: int) -> str:
+        return f"string is: {a}"
+
+    mt = map_task(t1, chunk_size=2)
+    ctx = context_manager.NebulaContext.current_context()
+    with context_manager.NebulaContextManager.with_context(
+        ctx.with_execution_state(
+            ctx.execution_state.with_params(mode=context_manager.ExecutionState.Mode.TASK_EXECUTION)
+        )
+    ) as ctx:
+        input_literal_map = TypeEngine.dict_to_literal_map(ctx, {"a": [0, 1, 2, 3, 4]}, {"a": typing.List[int]})
+        mock_load_proto.return_value = input_literal_map.to_nebula_idl()
+
+        files = OrderedDict()
+        mock_write_to_file.side_effect = get_output_collector(files)
+        system_entry_point(_dispatch_execute_map_chunk)(ctx, mt, "inputs path", "outputs prefix", 1)
+
+        # The second chunk holds the elements 2 and 3, each written to its own prefix
+        prefixes = sorted(c.args[1] for c in mock_upload_dir.call_args_list)
+        assert prefixes == [os.path.join("outputs prefix", "2"), os.path.join("outputs prefix", "3")]
+        outputs = sorted(
+            _literal_models.LiteralMap.from_nebula_idl(v).literals["o0"].scalar.primitive.string_value
+            for k, v in files.items()
+            if "outputs.pb" in k
+        )
+        assert outputs == ["string is: 2", "string is: 3"]
+
+
+def test_offloaded_outputs():
+    from nebulakit.core.base_task import _is_offloaded
+    from nebulakit.types.file import NebulaFile
+    from nebulakit.types.structured import StructuredDataset
+
+    # Only outputs that are uploaded when converted to literals are converted concurrently
+    assert not _is_offloaded(TypeEngine.to_literal_type(int))
+    assert not _is_offloaded(TypeEngine.to_literal_type(typing.Dict[str, typing.List[str]]))
+    assert _is_offloaded(TypeEngine.to_literal_type(NebulaFile))
+    assert _is_offloaded(TypeEngine.to_literal_type(typing.List[NebulaFile]))
+    assert _is_offloaded(TypeEngine.to_literal_type(typing.Optional[NebulaFile]))
+    assert _is_offloaded(TypeEngine.to_literal_type(StructuredDataset))
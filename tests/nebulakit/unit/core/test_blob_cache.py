@@ -0,0 +1,52 @@
+import os
+
+import mock
+
+from nebulakit.core.blob_cache import SharedBlobCache
+from nebulakit.core.data_persistence import FileAccessProvider
+
+
+def test_shared_blob_cache(tmp_path):
+    fp = FileAccessProvider(str(tmp_path / "sandbox"), str(tmp_path / "raw"))
+    cache = SharedBlobCache(str(tmp_path / "cache"), size_limit=0)
+    src = tmp_path / "src.txt"
+    src.write_text("hello")
+
+    with mock.patch.object(fp, "get", wraps=fp.get) as get:
+        assert cache.get(fp, str(src), str(tmp_path / "a.txt"))
+        assert cache.get(fp, str(src), os.path.join(tmp_path, "b", ""))
+        assert get.call_count == 1
+    assert (tmp_path / "a.txt").read_text() == "hello"
+    assert (tmp_path / "b" / "src.txt").read_text() == "hello"
+    # Files are handed out as copies, that the task can modify without touching the cache
+    assert os.stat(tmp_path / "a.txt").st_nlink == 1
+    (tmp_path / "a.txt").write_text("changed")
+    assert cache.get(fp, str(src), str(tmp_path / "e.txt"))
+    assert (tmp_path / "e.txt").read_text() == "hello"
+
+    # A new version of the file is a new entry
+    src.write_text("world")
+    os.utime(src, (1, 1))
+    assert cache.get(fp, str(src), str(tmp_path / "c.txt"))
+    assert (tmp_path / "c.txt").read_text() == "world"
+    assert len(os.listdir(tmp_path / "cache" / "entries")) == 2
+
+    src_dir = tmp_path / "src_dir"
+    (src_dir / "nested").mkdir(parents=True)
+    (src_dir / "nested" / "x").write_text("x")
+    (src_dir / "y").write_text("y")
+    assert cache.get(fp, str(src_dir), str(tmp_path / "d"), is_multipart=True)
+    assert (tmp_path / "d" / "nested" / "x").read_text() == "x"
+    assert (tmp_path / "d" / "y").read_text() == "y"
+
+
+def test_shared_blob_cache_eviction(tmp_path):
+    fp = FileAccessProvider(str(tmp_path / "sandbox"), str(tmp_path / "raw"))
+    cache = SharedBlobCache(str(tmp_path / "cache"), size_limit=15)
+    for i, name in enumerate(["a", "b", "c"]):
+        src = tmp_path / name
+        src.write_text("0123456789")
+        assert cache.get(fp, str(src), str(tmp_path / f"{name}.out"))
+        # Only the most recently used entry fits
+        assert len(os.listdir(tmp_path / "cache" / "entries")) == 1
+    assert (tmp_path / "a.out").read_text() == "0123456789"
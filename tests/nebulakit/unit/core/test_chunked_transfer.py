@@ -0,0 +1,194 @@
+import os
+import threading
+import time
+import typing
+
+import pytest
+from fsspec.implementations.memory import MemoryFileSystem
+
+from nebulakit.configuration import DataConfig
+from nebulakit.core.chunked_transfer import ChunkedTransfer
+
+
+class FakeS3FileSystem(MemoryFileSystem):
+    protocol = ("s3", "s3a")
+    root_marker = ""
+    store: typing.Dict[str, typing.Any] = {}
+    pseudo_dirs = [""]
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        for protocol in cls.protocol:
+            if path.startswith(f"{protocol}://"):
+                path = path[len(protocol) + 3 :]
+        return path.rstrip("/")
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fail_parts = set()
+        self.interrupt_parts = set()
+        self.deny_parts = set()
+        self.parts_fetched = []
+        self.parts_uploaded = []
+        self.uploads = {}
+        self.upload_kwargs = {}
+
+    def cat_file(self, path, start=None, end=None, **kwargs):
+        if start in self.fail_parts:
+            self.fail_parts.remove(start)
+            raise OSError("connection reset")
+        self.parts_fetched.append(start)
+        return super().cat_file(path, start=start, end=end, **kwargs)
+
+    def split_path(self, path):
+        bucket, _, key = self._strip_protocol(path).partition("/")
+        return bucket, key, None
+
+    def call_s3(self, method, **kwargs):
+        if method == "create_multipart_upload":
+            upload_id = str(len(self.upload_kwargs))
+            self.uploads[upload_id] = {}
+            self.upload_kwargs[upload_id] = {k: v for k, v in kwargs.items() if k not in ("Bucket", "Key")}
+            return {"UploadId": upload_id}
+        if method == "abort_multipart_upload":
+            del self.uploads[kwargs["UploadId"]]
+            return {}
+        if method == "list_parts":
+            return {"Parts": list(self.uploads[kwargs["UploadId"]])}
+        if method == "upload_part":
+            if kwargs["PartNumber"] in self.fail_parts:
+                self.fail_parts.remove(kwargs["PartNumber"])
+                raise OSError("connection reset")
+            if kwargs["PartNumber"] in self.interrupt_parts:
+                self.interrupt_parts.remove(kwargs["PartNumber"])
+                raise KeyboardInterrupt()
+            if kwargs["PartNumber"] in self.deny_parts:
+                raise PermissionError("access denied")
+            self.parts_uploaded.append(kwargs["PartNumber"])
+            self.uploads[kwargs["UploadId"]][kwargs["PartNumber"]] = kwargs["Body"]
+            return {"ETag": f"etag-{kwargs['PartNumber']}"}
+        if method == "complete_multipart_upload":
+            parts = self.uploads.pop(kwargs["UploadId"])
+            numbers = [p["PartNumber"] for p in kwargs["MultipartUpload"]["Parts"]]
+            self.pipe_file(f"{kwargs['Bucket']}/{kwargs['Key']}", b"".join(parts[n] for n in numbers))
+            return {}
+        raise ValueError(method)
+
+
+@pytest.fixture(autouse=True)
+def state_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr("nebulakit.core.chunked_transfer._STATE_DIR", str(tmp_path / "transfers"))
+
+
+@pytest.fixture
+def fake_s3():
+    fs = FakeS3FileSystem(skip_instance_cache=True)
+    yield fs
+    FakeS3FileSystem.store.clear()
+
+
+def test_chunked_get(fake_s3, tmp_path):
+    data = os.urandom(1000)
+    fake_s3.pipe_file("bucket/data.bin", data)
+    transfer = ChunkedTransfer(DataConfig(part_size=300, max_parts_in_flight=2))
+    to_path = str(tmp_path / "data.bin")
+
+    # The transfer fails on the third part, a retry only downloads the parts that are missing, even to another path
+    fake_s3.fail_parts = {600}
+    with pytest.raises(OSError):
+        transfer.get(fake_s3, "s3://bucket/data.bin", str(tmp_path / "failed.bin"))
+    fetched = set(fake_s3.parts_fetched)
+    fake_s3.parts_fetched = []
+    assert transfer.get(fake_s3, "s3://bucket/data.bin", to_path)
+    assert not (tmp_path / "failed.bin").exists()
+    assert set(fake_s3.parts_fetched) == {0, 300, 600, 900} - fetched
+    assert open(to_path, "rb").read() == data
+
+    # Files that fit in one part are left to fsspec
+    fake_s3.pipe_file("bucket/small.bin", b"small")
+    assert not transfer.get(fake_s3, "s3://bucket/small.bin", str(tmp_path / "small.bin"))
+
+
+def test_chunked_put(fake_s3, tmp_path, monkeypatch):
+    monkeypatch.setattr("nebulakit.core.chunked_transfer._S3_MIN_PART_SIZE", 100)
+    data = os.urandom(1000)
+    from_path = tmp_path / "data.bin"
+    from_path.write_bytes(data)
+    transfer = ChunkedTransfer(DataConfig(part_size=300, max_parts_in_flight=1))
+
+    # An upload that cannot succeed is aborted
+    fake_s3.deny_parts = {3}
+    with pytest.raises(PermissionError):
+        transfer.put(fake_s3, str(from_path), "s3://bucket/denied.bin")
+    assert fake_s3.uploads == {}
+    fake_s3.deny_parts = set()
+
+    # A failed upload is resumed by the next put, only the missing parts are sent
+    fake_s3.fail_parts = {3}
+    with pytest.raises(OSError):
+        transfer.put(fake_s3, str(from_path), "s3://bucket/failed.bin")
+    assert list(fake_s3.uploads["1"]) == [1, 2]
+    fake_s3.parts_uploaded = []
+    assert transfer.put(fake_s3, str(from_path), "s3://bucket/failed.bin")
+    assert fake_s3.parts_uploaded == [3, 4]
+    assert fake_s3.uploads == {}
+    assert fake_s3.cat_file("bucket/failed.bin") == data
+
+    # An interrupted upload is resumed, even to another destination, and kwargs are passed to the upload
+    fake_s3.interrupt_parts = {3}
+    with pytest.raises(KeyboardInterrupt):
+        transfer.put(fake_s3, str(from_path), "s3://bucket/interrupted.bin", ContentType="application/octet-stream")
+    assert list(fake_s3.uploads["2"]) == [1, 2]
+    assert transfer.put(fake_s3, str(from_path), "s3://bucket/uploaded.bin")
+    assert fake_s3.uploads == {}
+    assert fake_s3.upload_kwargs["2"] == {"ContentType": "application/octet-stream"}
+    assert fake_s3.cat_file("bucket/uploaded.bin") == data
+    assert not fake_s3.exists("bucket/interrupted.bin")
+
+
+def test_chunked_put_discards_stale_uploads(fake_s3, tmp_path, monkeypatch):
+    monkeypatch.setattr("nebulakit.core.chunked_transfer._S3_MIN_PART_SIZE", 100)
+    from_path = tmp_path / "data.bin"
+    from_path.write_bytes(os.urandom(1000))
+    transfer = ChunkedTransfer(DataConfig(part_size=300, max_parts_in_flight=1))
+
+    # The upload of a source that changed since is aborted
+    fake_s3.fail_parts = {3}
+    with pytest.raises(OSError):
+        transfer.put(fake_s3, str(from_path), "s3://bucket/data.bin")
+    from_path.write_bytes(os.urandom(1200))
+    assert transfer.put(fake_s3, str(from_path), "s3://bucket/data.bin")
+    assert fake_s3.uploads == {}
+
+    # So are uploads that were not resumed in time
+    other_path = tmp_path / "other.bin"
+    other_path.write_bytes(os.urandom(1000))
+    fake_s3.fail_parts = {3}
+    with pytest.raises(OSError):
+        transfer.put(fake_s3, str(other_path), "s3://bucket/other.bin")
+    assert list(fake_s3.uploads) == ["2"]
+    monkeypatch.setattr("nebulakit.core.chunked_transfer._STATE_TTL_SECONDS", -1)
+    assert transfer.put(fake_s3, str(from_path), "s3://bucket/data.bin")
+    assert fake_s3.uploads == {}
+
+
+def test_parts_in_flight_across_files():
+    transfer = ChunkedTransfer(DataConfig(part_size=300, max_parts_in_flight=2))
+    lock = threading.Lock()
+    in_flight = [0, 0]
+
+    def _move_part(part):
+        with lock:
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.01)
+        with lock:
+            in_flight[0] -= 1
+
+    # Several files moved at once share the bound on the parts in flight
+    files = [threading.Thread(target=transfer._run_parts, args=(_move_part, range(4))) for _ in range(3)]
+    for t in files:
+        t.start()
+    for t in files:
+        t.join()
+    assert in_flight == [0, 2]
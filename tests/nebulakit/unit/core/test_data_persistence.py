@@ -5,6 +5,8 @@ import random
 import string
 import tempfile
 
+import fsspec
+import fsspec.implementations.memory
 import mock
 import pandas as pd
 from azure.identity import ClientSecretCredential, DefaultAzureCredential
@@ -143,3 +145,95 @@ def test_initialise_azure_file_provider_with_default_credential():
         fp = FileAccessProvider("/tmp", "abfs://container/path/within/container")
         assert fp.get_filesystem().account_name == "accountname"
         assert isinstance(fp.get_filesystem().sync_credential, DefaultAzureCredential)
+
+
+def test_prefetch_is_reused_by_get_data():
+    source = tempfile.mkdtemp()
+    with open(os.path.join(source, "a.txt"), "w") as f:
+        f.write("a")
+    pathlib.Path(source, "sub").mkdir()
+    with open(os.path.join(source, "sub", "b.txt"), "w") as f:
+        f.write("b")
+
+    fp = FileAccessProvider(tempfile.mkdtemp(), tempfile.mkdtemp())
+    file_path = os.path.join(source, "a.txt")
+    dir_path = os.path.join(source, "sub")
+    fp.prefetch({file_path: False, dir_path: True, os.path.join(source, "missing.txt"): False}, max_workers=2)
+    assert set(fp._prefetched) == {file_path, dir_path}
+
+    with mock.patch.object(FileAccessProvider, "get") as mock_get:
+        local_file = fp.get_random_local_path(file_path)
+        fp.get_data(file_path, local_file)
+        local_dir = fp.get_random_local_directory()
+        fp.get_data(dir_path, local_dir, is_multipart=True)
+        mock_get.assert_not_called()
+
+    assert open(local_file).read() == "a"
+    assert open(os.path.join(local_dir, "b.txt")).read() == "b"
+    assert fp._prefetched == {}
+
+
+def test_collect_remote_paths():
+    from nebulakit.models.core.types import BlobType
+    from nebulakit.models.literals import Blob, BlobMetadata, Literal, LiteralCollection, Scalar
+
+    def blob(uri, dimensionality):
+        return Literal(scalar=Scalar(blob=Blob(metadata=BlobMetadata(type=BlobType("", dimensionality)), uri=uri)))
+
+    single = BlobType.BlobDimensionality.SINGLE
+    multipart = BlobType.BlobDimensionality.MULTIPART
+    lit = Literal(
+        collection=LiteralCollection(
+            literals=[blob("s3://bucket/a.txt", single), blob("s3://bucket/dir", multipart), blob("/tmp/local", single)]
+        )
+    )
+    paths = {}
+    FileAccessProvider.collect_remote_paths(lit, paths)
+    assert paths == {"s3://bucket/a.txt": False, "s3://bucket/dir": True}
+
+
+def test_filesystem_reuse():
+    fp = FileAccessProvider("/tmp", "s3://my-bucket")
+    other_fp = FileAccessProvider("/tmp", "s3://my-bucket")
+    # File systems are shared across providers, per protocol and credentials
+    assert fp.get_filesystem("s3") is other_fp.get_filesystem("s3")
+    assert fp.get_filesystem("s3") is not fp.get_filesystem("s3", anonymous=True)
+    assert fp.get_filesystem("file") is other_fp.get_filesystem_for_path("/tmp/a")
+
+    # Registering another implementation for a protocol takes effect, as NebulaRemote does for nebula://
+    class FirstFS(fsspec.implementations.memory.MemoryFileSystem):
+        protocol = "reusetest"
+
+    class SecondFS(fsspec.implementations.memory.MemoryFileSystem):
+        protocol = "reusetest"
+
+    fsspec.register_implementation("reusetest", FirstFS, clobber=True)
+    assert isinstance(fp.get_filesystem("reusetest"), FirstFS)
+    fsspec.register_implementation("reusetest", SecondFS, clobber=True)
+    assert isinstance(fp.get_filesystem("reusetest"), SecondFS)
+
+
+def test_s3_max_pool_connections():
+    from nebulakit.configuration import S3Config
+    from nebulakit.core.data_persistence import s3_setup_args
+
+    assert "config_kwargs" not in s3_setup_args(S3Config())
+    assert s3_setup_args(S3Config(max_pool_connections=64))["config_kwargs"] == {"max_pool_connections": 64}
+
+
+def test_put_data_to_nebula_fs_is_left_to_the_file_system(tmp_path):
+    from nebulakit.remote.remote_fs import NebulaFS
+
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "a.txt").write_text("a")
+    nebula_fs = mock.MagicMock(spec=NebulaFS)
+    nebula_fs.protocol = "nebula"
+    nebula_fs.put.return_value = "s3://bucket/prefix/source"
+    fp = FileAccessProvider(local_sandbox_dir=str(tmp_path / "sandbox"), raw_output_prefix=str(tmp_path / "raw"))
+    with mock.patch.object(fp, "get_filesystem_for_path", return_value=nebula_fs):
+        assert fp.put_data(str(source), "nebula://data", is_multipart=True) == "s3://bucket/prefix/source"
+        assert fp.put_data(str(source / "a.txt"), "nebula://data", is_multipart=True) == "s3://bucket/prefix/source"
+    assert nebula_fs.put.call_count == 2
+    nebula_fs.find.assert_not_called()
+    nebula_fs.put_file.assert_not_called()
@@ -0,0 +1,117 @@
+import hashlib
+import os
+import threading
+import typing
+
+import fsspec
+import pytest
+from fsspec.implementations.memory import MemoryFileSystem
+
+from nebulakit.configuration import DataConfig
+from nebulakit.core import directory_transfer
+from nebulakit.core.directory_transfer import DirectoryTransfer
+
+
+class FakeBucketFileSystem(MemoryFileSystem):
+    """
+    In-memory object store reporting the md5 of objects as their ETag, and recording the files it moves.
+    """
+
+    protocol = "fakebucket"
+    store: typing.Dict[str, typing.Any] = {}
+    pseudo_dirs = [""]
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        if path.startswith("fakebucket://"):
+            path = path[len("fakebucket://") :]
+        return super()._strip_protocol(path)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.moved = []
+
+    def ls(self, path, detail=True, **kwargs):
+        files = super().ls(path, detail=detail, **kwargs)
+        if detail:
+            for info in files:
+                if info["type"] == "file":
+                    info["ETag"] = f'"{hashlib.md5(self.cat_file(info["name"])).hexdigest()}"'
+        return files
+
+    def get_file(self, rpath, lpath, **kwargs):
+        self.moved.append(self._strip_protocol(rpath))
+        return super().get_file(rpath, lpath, **kwargs)
+
+    def put_file(self, lpath, rpath, **kwargs):
+        self.moved.append(self._strip_protocol(rpath))
+        return super().put_file(lpath, rpath, **kwargs)
+
+
+@pytest.fixture
+def fake_bucket():
+    fs = FakeBucketFileSystem(skip_instance_cache=True)
+    yield fs
+    FakeBucketFileSystem.store.clear()
+
+
+def test_directory_put_and_get(fake_bucket, tmp_path):
+    source = tmp_path / "source"
+    (source / "nested").mkdir(parents=True)
+    for i in range(20):
+        (source / f"{i}.txt").write_text(f"file {i}")
+    (source / "nested" / "large.bin").write_bytes(os.urandom(1000))
+    transfer = DirectoryTransfer(DataConfig(part_size=500, directory_batch_size=4))
+
+    assert transfer.put(fake_bucket, str(source), "fakebucket://bucket/dir/")
+    assert len(fake_bucket.moved) == 21
+    assert fake_bucket.cat_file("/bucket/dir/nested/large.bin") == (source / "nested" / "large.bin").read_bytes()
+
+    # Files that did not change are skipped
+    fake_bucket.moved = []
+    (source / "0.txt").write_text("changed")
+    assert transfer.put(fake_bucket, str(source), "fakebucket://bucket/dir/", batch_size=2)
+    assert fake_bucket.moved == ["/bucket/dir/0.txt"]
+
+    target = tmp_path / "target"
+    fake_bucket.moved = []
+    assert transfer.get(fake_bucket, "fakebucket://bucket/dir/", str(target))
+    assert len(fake_bucket.moved) == 21
+    assert (target / "0.txt").read_text() == "changed"
+    assert (target / "nested" / "large.bin").read_bytes() == (source / "nested" / "large.bin").read_bytes()
+
+    fake_bucket.moved = []
+    (target / "1.txt").write_text("stale")
+    assert transfer.get(fake_bucket, "fakebucket://bucket/dir/", str(target))
+    assert fake_bucket.moved == ["/bucket/dir/1.txt"]
+    assert (target / "1.txt").read_text() == "file 1"
+
+
+def test_directory_transfer_checks_files_in_workers(fake_bucket, tmp_path, monkeypatch):
+    source = tmp_path / "source"
+    source.mkdir()
+    for i in range(8):
+        (source / f"{i}.bin").write_bytes(os.urandom(1000 if i % 2 else 10))
+    transfer = DirectoryTransfer(DataConfig(part_size=500, directory_batch_size=4))
+    assert transfer.put(fake_bucket, str(source), "fakebucket://bucket/dir/")
+
+    threads = set()
+    is_up_to_date = directory_transfer._is_up_to_date
+
+    def _is_up_to_date(local_path, remote_info):
+        threads.add(threading.get_ident())
+        return is_up_to_date(local_path, remote_info)
+
+    monkeypatch.setattr(directory_transfer, "_is_up_to_date", _is_up_to_date)
+    fake_bucket.moved = []
+    (source / "1.bin").write_bytes(os.urandom(1000))
+    assert transfer.put(fake_bucket, str(source), "fakebucket://bucket/dir/")
+    # Large files go through the pool too, and the checksums are computed there
+    assert fake_bucket.moved == ["/bucket/dir/1.bin"]
+    assert threads and threading.get_ident() not in threads
+
+
+def test_directory_transfer_skips_local_file_systems(tmp_path):
+    transfer = DirectoryTransfer(DataConfig())
+    assert not transfer.put(fsspec.filesystem("file"), str(tmp_path), str(tmp_path / "other"))
+    assert not transfer.get(fsspec.filesystem("file"), str(tmp_path), str(tmp_path / "other"))
@@ -1,4 +1,5 @@
 import datetime
+import pickle
 import typing
 from dataclasses import dataclass
 from typing import Dict, List
@@ -10,18 +11,27 @@ from dataclasses_json import DataClassJsonMixin
 from pytest import fixture
 from typing_extensions import Annotated
 
+from nebulakit.configuration import LocalCacheConfig
 from nebulakit.core.base_sql_task import SQLTask
 from nebulakit.core.base_task import kwtypes
 from nebulakit.core.context_manager import NebulaContextManager
 from nebulakit.core.dynamic_workflow_task import dynamic
 from nebulakit.core.hash import HashMethod
-from nebulakit.core.local_cache import LocalTaskCache, _calculate_cache_key, _recursive_hash_placement
+from nebulakit.core.local_cache import (
+    InMemoryCache,
+    LocalCacheStats,
+    LocalTaskCache,
+    _calculate_cache_key,
+    _recursive_hash_placement,
+)
 from nebulakit.core.task import TaskMetadata, task
 from nebulakit.core.testing import task_mock
 from nebulakit.core.type_engine import TypeEngine
 from nebulakit.core.workflow import workflow
-from nebulakit.models.literals import Literal, LiteralCollection, LiteralMap, Primitive, Scalar
+from nebulakit.models.core.types import BlobType
+from nebulakit.models.literals import Blob, BlobMetadata, Literal, LiteralCollection, LiteralMap, Primitive, Scalar
 from nebulakit.models.types import LiteralType, SimpleType
+from nebulakit.types.file import NebulaFile
 from nebulakit.types.schema import NebulaSchema
 
 # Global counter used to validate number of calls to cache
@@ -496,3 +506,133 @@ def test_literal_hash_placement():
 
     assert litmap.hash == _recursive_hash_placement(litmap).hash
     assert litcoll.hash == _recursive_hash_placement(litcoll).hash
+
+
+def _int_literal_map(n: int) -> LiteralMap:
+    return LiteralMap(literals={"n": Literal(scalar=Scalar(primitive=Primitive(integer=n)))})
+
+
+def test_in_memory_backend_stats_and_version_pruning():
+    LocalTaskCache.initialize(LocalCacheConfig(backend="memory"))
+
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(1)) is None
+    LocalTaskCache.set("t", "v1", _int_literal_map(1), _int_literal_map(2))
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(1)) == _int_literal_map(2)
+    stats = LocalTaskCache.stats()
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.size_bytes > 0
+
+    # Caching a new version of the task drops the entries of the previous one
+    LocalTaskCache.set("t", "v2", _int_literal_map(1), _int_literal_map(3))
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(1)) is None
+    assert LocalTaskCache.get("t", "v2", _int_literal_map(1)) == _int_literal_map(3)
+
+    LocalTaskCache.clear()
+    assert LocalTaskCache.stats() == LocalCacheStats()
+
+
+def test_disk_backend_stats_and_version_pruning(tmp_path):
+    config = LocalCacheConfig(backend="disk", location=str(tmp_path / "cache"), max_size_bytes=2**20)
+    LocalTaskCache.initialize(config)
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(1)) is None
+    LocalTaskCache.set("t", "v1", _int_literal_map(1), _int_literal_map(2))
+
+    # Hits and misses are recorded in the cache directory, so they are shared by the processes using it
+    LocalTaskCache.initialize(config)
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(1)) == _int_literal_map(2)
+    stats = LocalTaskCache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (1, 1, 1)
+
+    # The versions recorded are not cache entries, and are not evicted with them
+    LocalTaskCache._cache.clear()
+    LocalTaskCache.set("t", "v1", _int_literal_map(3), _int_literal_map(4))
+    LocalTaskCache.set("t", "v2", _int_literal_map(1), _int_literal_map(5))
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(3)) is None
+    assert LocalTaskCache.stats().entries == 1
+
+    LocalTaskCache.clear()
+    # The volume of the disk backend includes its database, even when it is empty
+    stats = LocalTaskCache.stats()
+    assert (stats.hits, stats.misses, stats.entries) == (0, 0, 0)
+    LocalTaskCache.initialize()
+
+
+def test_in_memory_backend_keeps_old_versions():
+    LocalTaskCache.initialize(LocalCacheConfig(backend="memory", prune_old_versions=False))
+    LocalTaskCache.set("t", "v1", _int_literal_map(1), _int_literal_map(2))
+    LocalTaskCache.set("t", "v2", _int_literal_map(1), _int_literal_map(3))
+    assert LocalTaskCache.get("t", "v1", _int_literal_map(1)) == _int_literal_map(2)
+
+
+@pytest.mark.parametrize(
+    "eviction_policy,evicted",
+    [("least-recently-stored", "a"), ("least-recently-used", "b"), ("least-frequently-used", "b")],
+)
+def test_in_memory_cache_eviction(eviction_policy, evicted):
+    entry_size = len(pickle.dumps(0))
+    cache = InMemoryCache(size_limit=2 * entry_size, eviction_policy=eviction_policy)
+    cache.set("a", 0)
+    cache.set("b", 0)
+    assert cache.get("a") == 0
+    assert cache.get("a") == 0
+    cache.set("c", 0)
+    assert len(cache) == 2
+    assert cache.volume() == 2 * entry_size
+    assert cache.get(evicted) is None
+
+
+def test_in_memory_cache_expiry():
+    cache = InMemoryCache(size_limit=2**20, eviction_policy="none")
+    assert cache.add("a", 1, expire=-1)
+    assert cache.get("a") is None
+    assert cache.add("a", 2)
+    assert not cache.add("a", 3)
+    assert cache.get("a") == 2
+
+
+def test_content_addressed_cache_key(tmp_path):
+    def blob_literal_map(path: str) -> LiteralMap:
+        blob_type = BlobType(format="", dimensionality=BlobType.BlobDimensionality.SINGLE)
+        blob = Blob(metadata=BlobMetadata(type=blob_type), uri=path)
+        return LiteralMap(literals={"f": Literal(scalar=Scalar(blob=blob))})
+
+    p1, p2, p3 = tmp_path / "a.txt", tmp_path / "b.txt", tmp_path / "c.txt"
+    p1.write_text("same content")
+    p2.write_text("same content")
+    p3.write_text("other content")
+
+    # By default the uri is part of the key
+    assert _calculate_cache_key("t", "v1", blob_literal_map(str(p1))) != _calculate_cache_key(
+        "t", "v1", blob_literal_map(str(p2))
+    )
+
+    k1 = _calculate_cache_key("t", "v1", blob_literal_map(str(p1)), content_addressed=True)
+    assert k1 == _calculate_cache_key("t", "v1", blob_literal_map(str(p2)), content_addressed=True)
+    assert k1 != _calculate_cache_key("t", "v1", blob_literal_map(str(p3)), content_addressed=True)
+
+    # Directories are digested file by file
+    d1, d2 = tmp_path / "d1", tmp_path / "d2"
+    for d in (d1, d2):
+        d.mkdir()
+        (d / "x").write_text("x")
+    assert _calculate_cache_key("t", "v1", blob_literal_map(str(d1)), content_addressed=True) == _calculate_cache_key(
+        "t", "v1", blob_literal_map(str(d2)), content_addressed=True
+    )
+
+
+def test_content_addressed_local_cache(tmp_path):
+    LocalTaskCache.initialize(LocalCacheConfig(backend="memory", content_addressed=True))
+
+    @task(cache=True, cache_version="v1")
+    def count_lines(f: NebulaFile) -> int:
+        global n_cached_task_calls
+        n_cached_task_calls += 1
+        with open(f) as fh:
+            return len(fh.readlines())
+
+    for name in ("a.txt", "b.txt"):
+        p = tmp_path / name
+        p.write_text("1\n2\n")
+        assert count_lines(f=NebulaFile(str(p))) == 2
+    assert n_cached_task_calls == 1
@@ -6,8 +6,9 @@ import pytest
 
 import nebulakit.configuration
 from nebulakit import LaunchPlan, Resources, map_task
-from nebulakit.configuration import Image, ImageConfig
-from nebulakit.core.map_task import MapPythonTask, MapTaskResolver
+from nebulakit.configuration import Image, ImageConfig, LocalExecutionConfig
+from nebulakit.core.local_executor import LocalExecutor
+from nebulakit.core.map_task import MapPythonTask, MapTaskResolver, map_element
 from nebulakit.core.task import TaskMetadata, task
 from nebulakit.core.workflow import workflow
 from nebulakit.tools.translator import get_serializable
@@ -348,3 +349,47 @@ def test_map_task_override(serialization_settings):
         map_task(my_mappable_task)(a=x).with_overrides(container_image="random:image")
 
     assert wf.nodes[0].nebula_entity.run_task.container_image == "random:image"
+
+
+def test_map_task_chunking(serialization_settings):
+    with pytest.raises(ValueError):
+        map_task(t1, chunk_size=0)
+    with pytest.raises(ValueError):
+        map_task(t1, chunk_size=2, chunk_executor="fiber")
+
+    mt = map_task(t1, chunk_size=10, chunk_executor="process")
+    args = mt.get_command(serialization_settings)
+    assert args[args.index("--chunk-size") + 1] == "10"
+    assert args[args.index("--chunk-executor") + 1] == "process"
+    assert args.index("--chunk-size") < args.index("--resolver")
+    # The array plugin would still launch one job per element
+    with pytest.raises(ValueError, match="chunked"):
+        get_serializable(OrderedDict(), serialization_settings, mt)
+
+    mtr = MapTaskResolver(chunk_size=10, chunk_executor="process")
+    t = mtr.load_task(loader_args=mtr.loader_args(serialization_settings, mt))
+    assert t.chunk_size == 10
+    assert t.chunk_executor == "process"
+
+    with map_element(3):
+        assert MapPythonTask._compute_array_job_index() == 3
+    assert MapPythonTask._compute_array_job_index() == 0
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_map_task_local_executor(executor):
+    @task
+    def some_task1(inputs: int) -> int:
+        if inputs == 2:
+            raise ValueError("Unexpected inputs: 2")
+        return inputs * 2
+
+    @workflow
+    def my_wf1() -> typing.List[typing.Optional[int]]:
+        return map_task(some_task1, min_success_ratio=0.5)(inputs=[1, 2, 3, 4])
+
+    LocalExecutor.initialize(LocalExecutionConfig(executor=executor, max_workers=4))
+    try:
+        assert my_wf1() == [2, None, 6, 8]
+    finally:
+        LocalExecutor.initialize(LocalExecutionConfig())
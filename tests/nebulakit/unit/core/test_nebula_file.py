@@ -19,7 +19,7 @@ from nebulakit.core.type_engine import TypeEngine
 from nebulakit.core.workflow import workflow
 from nebulakit.models.core.types import BlobType
 from nebulakit.models.literals import LiteralMap
-from nebulakit.types.file.file import NebulaFile, NebulaFilePathTransformer
+from nebulakit.types.file.file import NebulaFile, NebulaFilePathTransformer, Streaming
 
 
 # Fixture that ensures a dummy local file
@@ -412,6 +412,47 @@ def test_download_caching():
     assert mock_downloader.call_count == 1
 
 
+def test_streaming_open():
+    ctx = NebulaContextManager.current_context()
+    lv = TypeEngine.to_literal(
+        ctx,
+        "s3://my-s3-bucket/data.bin",
+        NebulaFile,
+        TypeEngine.to_literal_type(NebulaFile),
+    )
+    mock_fs = MagicMock()
+    with patch.object(FileAccessProvider, "get_filesystem_for_path", return_value=mock_fs):
+        ff = TypeEngine.to_python_value(ctx, lv, Annotated[NebulaFile, Streaming(block_size=1024)])
+        with ff.open("rb"):
+            pass
+        mock_fs.open.assert_called_with(
+            "s3://my-s3-bucket/data.bin", "rb", cache_type="readahead", cache_options=None, block_size=1024
+        )
+
+        with ff.open("rb", cache_type="blockcache", block_size=2048):
+            pass
+        mock_fs.open.assert_called_with(
+            "s3://my-s3-bucket/data.bin", "rb", cache_type="blockcache", cache_options=None, block_size=2048
+        )
+        assert not ff.downloaded
+
+        # Without the annotation, the file is opened with the fsspec defaults unless streaming is asked for
+        ff = TypeEngine.to_python_value(ctx, lv, NebulaFile)
+        with ff.open("rb"):
+            pass
+        mock_fs.open.assert_called_with("s3://my-s3-bucket/data.bin", "rb", cache_type=None, cache_options=None)
+        with ff.open("rb", streaming=True):
+            pass
+        mock_fs.open.assert_called_with(
+            "s3://my-s3-bucket/data.bin",
+            "rb",
+            cache_type="readahead",
+            cache_options=None,
+            block_size=ctx.file_access.data_config.streaming_block_size,
+        )
+        assert not ff.downloaded
+
+
 def test_returning_a_pathlib_path(local_dummy_file):
     @task
     def t1() -> NebulaFile:
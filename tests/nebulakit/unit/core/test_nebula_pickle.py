@@ -1,3 +1,5 @@
+import os
+import tempfile
 from collections import OrderedDict
 from collections.abc import Sequence
 from typing import Dict, List, Union
@@ -7,14 +9,22 @@ import pandas as pd
 from typing_extensions import Annotated
 
 import nebulakit.configuration
-from nebulakit.configuration import Image, ImageConfig
+from nebulakit.configuration import DataConfig, Image, ImageConfig, LocalExecutionConfig
 from nebulakit.core import context_manager
+from nebulakit.core.data_persistence import SEGMENT_URI_SEPARATOR, FileAccessProvider
+from nebulakit.core.local_executor import LocalExecutor
 from nebulakit.core.task import task
 from nebulakit.models.core.types import BlobType
 from nebulakit.models.literals import BlobMetadata
 from nebulakit.models.types import LiteralType
 from nebulakit.tools.translator import get_serializable
-from nebulakit.types.pickle.pickle import BatchSize, NebulaPickle, NebulaPickleTransformer
+from nebulakit.types.pickle.pickle import (
+    BatchSize,
+    LocalPickleCache,
+    NebulaPickle,
+    NebulaPickleTransformer,
+    PickleStore,
+)
 
 default_img = Image(name="default", fqn="test", tag="tag")
 serialization_settings = nebulakit.configuration.SerializationSettings(
@@ -104,3 +114,73 @@ def test_union():
     assert variants[0].blob.format == "NumpyArray"
     assert variants[1].structured_dataset_type.format == ""
     assert variants[2].blob.format == NebulaPickleTransformer.PYTHON_PICKLE_FORMAT
+
+
+def test_pickle_store_batch():
+    ctx = context_manager.NebulaContext.current_context()
+    tf = NebulaPickleTransformer()
+    lt = tf.get_literal_type(NebulaPickle)
+    shared = {"a": 1}
+
+    # Packing is opt-in
+    with PickleStore.batch():
+        lv = tf.to_literal(ctx, shared, dict, lt)
+    assert SEGMENT_URI_SEPARATOR not in lv.scalar.blob.uri
+
+    sandbox = tempfile.mkdtemp()
+    file_access = FileAccessProvider(
+        local_sandbox_dir=sandbox,
+        raw_output_prefix=os.path.join(sandbox, "raw"),
+        data_config=DataConfig(pack_pickles=True),
+    )
+    with context_manager.NebulaContextManager.with_context(ctx.with_file_access(file_access)) as ctx:
+        with PickleStore.batch():
+            lvs = [tf.to_literal(ctx, v, dict, lt) for v in [{"b": 2}, shared, shared, {"c": 3}]]
+        uris = [lv.scalar.blob.uri for lv in lvs]
+        blob_uris = {uri.split(SEGMENT_URI_SEPARATOR)[0] for uri in uris}
+        assert len(blob_uris) == 1
+        # The same object is only stored once
+        assert uris[1] == uris[2]
+        assert [tf.to_python_value(ctx, lv, dict) for lv in reversed(lvs)] == [{"c": 3}, shared, shared, {"b": 2}]
+
+
+def test_local_pickle_cache():
+    ctx = context_manager.NebulaContext.current_context()
+    tf = NebulaPickleTransformer()
+    lt = tf.get_literal_type(NebulaPickle)
+    local_ctx = ctx.with_execution_state(
+        ctx.execution_state.with_params(mode=context_manager.ExecutionState.Mode.LOCAL_WORKFLOW_EXECUTION)
+    )
+    with context_manager.NebulaContextManager.with_context(local_ctx) as ctx:
+        lv = tf.to_literal(ctx, {"a": 1}, dict, lt)
+        uri = lv.scalar.blob.uri
+        assert not os.path.exists(uri)
+        assert tf.to_python_value(ctx, lv, dict) == {"a": 1}
+
+        LocalPickleCache.persist(lv)
+        assert os.path.exists(uri)
+        assert LocalPickleCache.get(uri) is None
+        assert tf.to_python_value(ctx, lv, dict) == {"a": 1}
+
+
+def test_local_pickle_cache_lifetime():
+    @task
+    def make() -> Dict[str, object]:
+        return {"a": object()}
+
+    make()
+    # The objects pickled in memory are released once the execution returns
+    assert LocalPickleCache._payloads == {}
+
+    ctx = context_manager.NebulaContext.current_context()
+    local_ctx = ctx.with_execution_state(
+        ctx.execution_state.with_params(mode=context_manager.ExecutionState.Mode.LOCAL_WORKFLOW_EXECUTION)
+    )
+    assert LocalPickleCache.is_enabled(local_ctx)
+    config = LocalExecutor.config()
+    LocalExecutor.initialize(LocalExecutionConfig(executor="process"))
+    try:
+        # Workers of process pools hand their outputs to the parent process, so objects are written to disk
+        assert not LocalPickleCache.is_enabled(local_ctx)
+    finally:
+        LocalExecutor.initialize(config)
@@ -2,8 +2,10 @@ import os
 import tempfile
 import typing
 
+import mock
 import pandas as pd
 import pyarrow as pa
+import pyarrow.compute as pc
 import pytest
 from fsspec.utils import get_protocol
 from typing_extensions import Annotated
@@ -20,13 +22,17 @@ from nebulakit.models import literals
 from nebulakit.models.literals import StructuredDatasetMetadata
 from nebulakit.models.types import SchemaType, SimpleType, StructuredDatasetType
 from nebulakit.types.structured.structured_dataset import (
+    ARROW_IPC,
     PARQUET,
+    ArrowIPCWriteOptions,
+    ParquetWriteOptions,
     StructuredDataset,
     StructuredDatasetDecoder,
     StructuredDatasetEncoder,
     StructuredDatasetTransformerEngine,
     convert_schema_type_to_structured_dataset_type,
     extract_cols_and_format,
+    hive_partitioning,
 )
 
 my_cols = kwtypes(w=typing.Dict[str, typing.Dict[str, int]], x=typing.List[typing.List[int]], y=int, z=str)
@@ -507,3 +513,157 @@ def test_list_of_annotated():
     @task
     def no_op(data: WineDataset) -> typing.List[WineDataset]:
         return [data]
+
+
+def test_scan():
+    @task
+    def make_df() -> pd.DataFrame:
+        return pd.DataFrame({"id": range(100), "score": [i / 100 for i in range(100)], "name": ["x"] * 100})
+
+    @task
+    def top_scores(sd: StructuredDataset) -> pd.DataFrame:
+        return sd.scan().select(["id", "score"]).filter(pc.field("score") >= 0.9).limit(5).to_pandas()
+
+    @task
+    def annotated_scan(sd: Annotated[StructuredDataset, kwtypes(id=int)]) -> int:
+        batches = list(sd.scan().filter([("id", "<", 10)]).to_batches())
+        assert all(b.schema.names == ["id"] for b in batches)
+        return sum(b.num_rows for b in batches)
+
+    @workflow
+    def wf() -> typing.Tuple[pd.DataFrame, int]:
+        df = make_df()
+        return top_scores(sd=df), annotated_scan(sd=df)
+
+    top, count = wf()
+    assert list(top.columns) == ["id", "score"]
+    assert list(top["id"]) == [90, 91, 92, 93, 94]
+    assert count == 10
+
+    in_memory = StructuredDataset(dataframe=pd.DataFrame({"id": [1, 2, 3]}))
+    assert in_memory.scan().filter(pc.field("id") > 1).to_arrow().num_rows == 2
+
+
+def test_streaming_iter():
+    @task
+    def produce() -> StructuredDataset:
+        return StructuredDataset(dataframe=(pd.DataFrame({"id": range(i * 10, (i + 1) * 10)}) for i in range(3)))
+
+    @task
+    def consume_pandas(sd: StructuredDataset) -> typing.List[int]:
+        sizes = []
+        for df in sd.open(pd.DataFrame).iter(batch_size=4):
+            assert isinstance(df, pd.DataFrame)
+            sizes.append(len(df))
+        return sizes
+
+    @task
+    def consume_arrow(sd: StructuredDataset) -> int:
+        return sum(t.num_rows for t in sd.open(pa.Table).iter())
+
+    @workflow
+    def wf() -> typing.Tuple[typing.List[int], int]:
+        sd = produce()
+        return consume_pandas(sd=sd), consume_arrow(sd=sd)
+
+    sizes, rows = wf()
+    assert sum(sizes) == 30 and max(sizes) <= 4
+    assert rows == 30
+
+    ctx = NebulaContextManager.current_context()
+    lit = StructuredDatasetTransformerEngine().to_literal(
+        ctx,
+        StructuredDataset(dataframe=iter([pa.table({"id": [1]}), pa.table({"id": [2]})])),
+        StructuredDataset,
+        TypeEngine.to_literal_type(StructuredDataset),
+    )
+    assert sorted(os.listdir(lit.scalar.structured_dataset.uri)) == ["00000", "00001"]
+
+
+def test_partitioned_write():
+    options = ParquetWriteOptions(partition_cols=["region"], max_rows_per_file=4, compression="zstd", max_workers=3)
+
+    @task
+    def produce() -> Annotated[pd.DataFrame, options]:
+        return pd.DataFrame({"region": ["eu", "us", "eu/west"] * 5, "amount": range(15)})
+
+    @task
+    def consume(sd: StructuredDataset) -> pd.DataFrame:
+        return sd.scan().filter(pc.field("region") == "eu").to_pandas()
+
+    @workflow
+    def wf() -> pd.DataFrame:
+        return consume(sd=produce())
+
+    eu = wf()
+    assert eu["amount"].tolist() == [0, 3, 6, 9, 12]
+    assert set(eu["region"]) == {"eu"}
+
+    ctx = NebulaContextManager.current_context()
+    lit = StructuredDatasetTransformerEngine().to_literal(
+        ctx,
+        StructuredDataset(
+            dataframe=pa.table({"region": ["eu", None, "us"] * 10, "amount": range(30)}), write_options=options
+        ),
+        StructuredDataset,
+        TypeEngine.to_literal_type(StructuredDataset),
+    )
+    uri = lit.scalar.structured_dataset.uri
+    assert sorted(os.listdir(uri)) == [
+        "_common_metadata",
+        "region=__HIVE_DEFAULT_PARTITION__",
+        "region=eu",
+        "region=us",
+    ]
+    assert len(os.listdir(os.path.join(uri, "region=eu"))) == 3
+    sd = StructuredDatasetTransformerEngine().to_python_value(ctx, lit, StructuredDataset)
+    assert sd.open(pa.Table).all().num_rows == 30
+    assert sd.scan().filter(pc.field("region").is_null()).to_arrow().num_rows == 10
+
+
+def test_hive_partitioning_probe():
+    fs = mock.MagicMock()
+    # Datasets whose listing has no common metadata file are not probed for it
+    fs.ls.return_value = ["bucket/sd/00000", "bucket/sd/00001"]
+    assert hive_partitioning(fs, "bucket/sd/") == "hive"
+    fs.ls.assert_called_once_with("bucket/sd", detail=False)
+    fs.open.assert_not_called()
+
+    # Errors of the backend fall back to inferring the partitioning from the directory names
+    fs.ls.return_value = ["bucket/sd/_common_metadata", "bucket/sd/region=eu/"]
+    fs.open.side_effect = PermissionError("access denied")
+    assert hive_partitioning(fs, "bucket/sd") == "hive"
+    fs.ls.side_effect = OSError("throttled")
+    assert hive_partitioning(fs, "bucket/sd") == "hive"
+
+
+def test_arrow_ipc():
+    @task
+    def produce() -> Annotated[pd.DataFrame, ARROW_IPC, ArrowIPCWriteOptions(compression="lz4")]:
+        return pd.DataFrame({"id": range(10), "name": list("abcdefghij")})
+
+    @task
+    def consume(sd: Annotated[StructuredDataset, kwtypes(id=int)]) -> typing.Tuple[int, int]:
+        assert sd.file_format == ARROW_IPC
+        table = sd.open(pa.Table).all()
+        assert table.column_names == ["id"]
+        return table.num_rows, len(list(sd.open(pd.DataFrame).iter(batch_size=3)))
+
+    @workflow
+    def wf() -> typing.Tuple[int, int]:
+        return consume(sd=produce())
+
+    assert wf() == (10, 4)
+
+    ctx = NebulaContextManager.current_context()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        fa = FileAccessProvider(
+            local_sandbox_dir=tmp_dir,
+            raw_output_prefix=tmp_dir,
+            data_config=nebulakit.configuration.DataConfig(structured_dataset_format=ARROW_IPC),
+        )
+        with NebulaContextManager.with_context(ctx.with_file_access(fa)) as ctx2:
+            lt = TypeEngine.to_literal_type(pa.Table)
+            lit = TypeEngine.to_literal(ctx2, pa.table({"a": [1, 2]}), pa.Table, lt)
+            assert lit.scalar.structured_dataset.metadata.structured_dataset_type.format == ARROW_IPC
+            assert TypeEngine.to_python_value(ctx2, lit, pa.Table).equals(pa.table({"a": [1, 2]}))
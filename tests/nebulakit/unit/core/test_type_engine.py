@@ -62,7 +62,7 @@ from nebulakit.types.pickle import NebulaPickle
 from nebulakit.types.pickle.pickle import BatchSize, NebulaPickleTransformer
 from nebulakit.types.schema import NebulaSchema
 from nebulakit.types.schema.types_pandas import PandasDataFrameTransformer
-from nebulakit.types.structured.structured_dataset import StructuredDataset
+from nebulakit.types.structured.structured_dataset import StructuredDataset, StructuredDatasetTransformerEngine
 
 T = typing.TypeVar("T")
 
@@ -101,6 +101,31 @@ def test_type_resolution():
     assert type(TypeEngine.get_transformer(typing.Any)) == NebulaPickleTransformer
 
 
+def test_type_resolution_cache():
+    class CachedFoo:
+        ...
+
+    t = TypeEngine.get_transformer(typing.List[CachedFoo])
+    assert TypeEngine._TRANSFORMER_CACHE[typing.List[CachedFoo]] is t
+    assert TypeEngine.get_transformer(typing.List[CachedFoo]) is t
+
+    # Falls back to the pickle transformer until a dedicated transformer is registered, which invalidates the cache.
+    assert type(TypeEngine.get_transformer(CachedFoo)) == NebulaPickleTransformer
+    foo_transformer = SimpleTransformer(
+        "CachedFoo", CachedFoo, LiteralType(simple=SimpleType.INTEGER), lambda x: None, lambda x: None
+    )
+    TypeEngine.register(foo_transformer)
+    assert CachedFoo not in TypeEngine._TRANSFORMER_CACHE
+    assert TypeEngine.get_transformer(CachedFoo) is foo_transformer
+    del TypeEngine._REGISTRY[CachedFoo]
+    TypeEngine.clear_transformer_cache()
+    assert type(TypeEngine.get_transformer(CachedFoo)) == NebulaPickleTransformer
+
+    # Unhashable annotations skip the cache but still resolve
+    unhashable = Annotated[StructuredDataset, kwtypes(a=int)]
+    assert type(TypeEngine.get_transformer(unhashable)) == StructuredDatasetTransformerEngine
+
+
 def test_file_formats_getting_literal_type():
     transformer = TypeEngine.get_transformer(NebulaFile)
 
@@ -523,6 +548,50 @@ def test_list_transformer():
     assert xx == [3, 4]
 
 
+@pytest.mark.parametrize(
+    "python_type,python_val",
+    [
+        (typing.List[int], [1, 2, 3]),
+        (typing.List[float], [1.5, -2.0, float("inf")]),
+        (typing.List[str], ["a", "", "c"]),
+        (typing.List[bool], [True, False]),
+    ],
+)
+def test_list_of_primitives_fast_path(python_type, python_val):
+    ctx = NebulaContext.current_context()
+    lt = TypeEngine.to_literal_type(python_type)
+    lv = TypeEngine.to_literal(ctx, python_val, python_type, lt)
+    sub_type = get_args(python_type)[0]
+    expected = [TypeEngine.to_literal(ctx, x, sub_type, lt.collection_type) for x in python_val]
+    assert lv.collection.literals == expected
+    assert TypeEngine.to_python_value(ctx, lv, python_type) == python_val
+
+
+def test_list_of_primitives_fast_path_errors():
+    ctx = NebulaContext.current_context()
+    lt = TypeEngine.to_literal_type(typing.List[int])
+    with pytest.raises(TypeTransformerFailedError, match="Expected value of type <class 'int'> but got 'True'"):
+        TypeEngine.to_literal(ctx, [1, True], typing.List[int], lt)
+
+    # Integers stored in a list of floats are still accepted on the way back
+    lv = Literal(collection=LiteralCollection(literals=[Literal(scalar=Scalar(primitive=Primitive(integer=3)))]))
+    assert TypeEngine.to_python_value(ctx, lv, typing.List[float]) == [3.0]
+    with pytest.raises(TypeTransformerFailedError):
+        TypeEngine.to_python_value(ctx, lv, typing.List[str])
+
+
+def test_list_of_primitives_from_numpy():
+    import numpy as np
+
+    ctx = NebulaContext.current_context()
+    lt = TypeEngine.to_literal_type(typing.List[float])
+    lv = TypeEngine.to_literal(ctx, np.array([1.0, 2.5]), typing.List[float], lt)
+    assert TypeEngine.to_python_value(ctx, lv, typing.List[float]) == [1.0, 2.5]
+
+    with pytest.raises(TypeTransformerFailedError, match="Expected a list"):
+        TypeEngine.to_literal(ctx, np.zeros((2, 2)), typing.List[float], lt)
+
+
 def test_protos():
     ctx = NebulaContext.current_context()
 
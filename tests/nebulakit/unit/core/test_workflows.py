@@ -9,9 +9,10 @@ from typing_extensions import Annotated  # type: ignore
 
 import nebulakit.configuration
 from nebulakit import NebulaContextManager, StructuredDataset, kwtypes
-from nebulakit.configuration import Image, ImageConfig
+from nebulakit.configuration import Image, ImageConfig, LocalExecutionConfig
 from nebulakit.core import context_manager
 from nebulakit.core.condition import conditional
+from nebulakit.core.local_executor import LocalExecutor
 from nebulakit.core.task import task
 from nebulakit.core.workflow import WorkflowFailurePolicy, WorkflowMetadata, WorkflowMetadataDefaults, workflow
 from nebulakit.exceptions.user import NebulaValidationException, NebulaValueException
@@ -428,3 +429,33 @@ def test_compile_wf_at_compile_time():
             t4()
 
         assert ctx.compilation_state is None
+
+
+def test_wf_local_executor():
+    @task
+    def t1(a: int) -> int:
+        return a + 2
+
+    @task
+    def t2(a: int, b: int) -> str:
+        return f"{a}-{b}"
+
+    @workflow
+    def sub_wf(a: int) -> int:
+        return t1(a=t1(a=a))
+
+    @workflow
+    def my_wf(a: int) -> typing.Tuple[str, int]:
+        x = t1(a=a)
+        y = sub_wf(a=a)
+        return t2(a=x, b=y), y
+
+    expected = my_wf(a=1)
+    assert expected == ("3-5", 5)
+
+    LocalExecutor.initialize(LocalExecutionConfig(executor="thread", max_workers=2))
+    try:
+        assert my_wf._node_dependencies() is not None
+        assert my_wf(a=1) == expected
+    finally:
+        LocalExecutor.initialize(LocalExecutionConfig())
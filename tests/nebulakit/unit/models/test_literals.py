@@ -2,6 +2,7 @@ from datetime import datetime, timedelta, timezone
 
 import pytest
 
+from nebulakit.configuration.feature_flags import FeatureFlags
 from nebulakit.models import literals
 from nebulakit.models import types as _types
 from tests.nebulakit.common import parameterizers
@@ -525,3 +526,57 @@ def test_literal_collection(literal_value_pair):
     assert obj == obj2
     assert all(ll == lit for ll in obj.literals)
     assert len(obj.literals) == 3
+
+
+def test_proto_backed_literals(monkeypatch):
+    monkeypatch.setattr(FeatureFlags, "NEBULA_PROTO_BACKED_LITERALS", True)
+    obj = literals.LiteralMap(
+        literals={
+            "a": literals.Literal(scalar=literals.Scalar(primitive=literals.Primitive(integer=1))),
+            "b": literals.Literal(
+                collection=literals.LiteralCollection(
+                    literals=[literals.Literal(scalar=literals.Scalar(primitive=literals.Primitive(string_value="x")))]
+                )
+            ),
+        }
+    )
+    pb = obj.to_nebula_idl()
+
+    view = literals.LiteralMap.from_nebula_idl(pb)
+    # Untouched views hand back the message they were parsed from
+    assert view.to_nebula_idl() is pb
+    assert hash(view) == hash(obj)
+    assert view == obj
+
+    # Reading a field decodes one level, children stay backed by their sub-messages
+    a = view.literals["a"]
+    assert a.to_nebula_idl() == pb.literals["a"]
+    assert a.scalar.primitive.integer == 1
+    assert view.literals["b"].collection.literals[0].scalar.primitive.string_value == "x"
+
+    # Decoded values can be mutated and are re-encoded
+    a.hash = "abc"
+    assert view.to_nebula_idl().literals["a"].hash == "abc"
+    assert pb.literals["a"].hash == ""
+
+
+def test_proto_backed_literals_concurrent_materialization(monkeypatch):
+    monkeypatch.setattr(FeatureFlags, "NEBULA_PROTO_BACKED_LITERALS", True)
+    pb = literals.Literal(scalar=literals.Scalar(primitive=literals.Primitive(integer=1))).to_nebula_idl()
+    view = literals.Literal.from_nebula_idl(pb)
+    decode = literals.Literal._fields_from_nebula_idl
+    mutated = []
+
+    def _decode_while_another_thread_mutates(cls, pb2_object):
+        fields = decode(pb2_object)
+        if not mutated:
+            # Another thread decodes the message first and mutates the entity before this decoding completes
+            mutated.append(True)
+            view.hash = "abc"
+        return fields
+
+    monkeypatch.setattr(literals.Literal, "_fields_from_nebula_idl", classmethod(_decode_while_another_thread_mutates))
+    # The late decoding is dropped instead of overwriting the mutation
+    assert view.scalar.primitive.integer == 1
+    assert view.hash == "abc"
+    assert view.to_nebula_idl().hash == "abc"
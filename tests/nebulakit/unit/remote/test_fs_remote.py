@@ -5,12 +5,13 @@ import tempfile
 from base64 import b64encode
 
 import fsspec
+import mock
 import pytest
 
 from nebulakit.configuration import Config
 from nebulakit.core.data_persistence import FileAccessProvider
 from nebulakit.remote.remote import NebulaRemote
-from nebulakit.remote.remote_fs import NebulaFS
+from nebulakit.remote.remote_fs import HttpFileWriter, NebulaFS, NebulaPathResolver
 
 local = fsspec.filesystem("file")
 
@@ -128,3 +129,28 @@ def test_hashing(sandbox_remote, source_folder):
     assert lengths == {0, 14}
     fr = fs.get_filename_root(s)
     assert fr == "GSEYDOSFXWFB5ABZB6AHZ2HK7Y======"
+
+
+@mock.patch("nebulakit.remote.remote_fs.requests")
+def test_http_file_writer_streams(mock_requests, sandbox_remote):
+    uploaded = []
+
+    def put(url, data, headers):
+        uploaded.append((url, data.read(), headers))
+        return mock.MagicMock(ok=True)
+
+    mock_requests.put.side_effect = put
+    remote = mock.MagicMock()
+    remote.client.get_upload_signed_url.return_value = mock.MagicMock(
+        signed_url="https://signed", native_url="s3://bucket/root/00000"
+    )
+    fs = NebulaFS(remote=sandbox_remote)
+    with HttpFileWriter(remote, "00000", fs=fs, path="nebula://data/root", mode="wb", block_size=5) as f:
+        for i in range(10):
+            f.write(b"0123456789")
+            # Blocks are moved out of the write buffer as they are written
+            assert len(f.buffer.getvalue()) < 20
+        assert not uploaded
+
+    assert uploaded == [("https://signed", b"0123456789" * 10, {"Content-Length": "100"})]
+    assert NebulaPathResolver.resolve_remote_path("nebula://data/root") == "s3://bucket/root/00000"
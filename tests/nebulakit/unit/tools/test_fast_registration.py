@@ -2,12 +2,18 @@ import os
 import subprocess
 import tarfile
 
+import mock
 import pytest
 
+from nebulakit.configuration import DataConfig
+from nebulakit.core.context_manager import NebulaContextManager
+from nebulakit.core.data_persistence import FileAccessProvider
+from nebulakit.tools import fast_registration
 from nebulakit.tools.fast_registration import (
     FAST_FILEENDING,
     FAST_PREFIX,
     compute_digest,
+    download_distribution,
     fast_package,
     get_additional_distribution_loc,
 )
@@ -64,6 +70,23 @@ def test_package(nebula_project, tmp_path):
     assert str(archive_fname).endswith(FAST_FILEENDING)
 
 
+def test_package_skips_own_archive(nebula_project):
+    # The archive is written into the directory being packaged, and is not packed into itself
+    archive_fname = fast_package(source=nebula_project, output_dir=nebula_project)
+    with tarfile.open(archive_fname) as tar:
+        assert os.path.basename(archive_fname) not in tar.getnames()
+        assert "keep.foo" in tar.getnames()
+
+
+def test_digest_skips_digest_cache(nebula_project, monkeypatch):
+    monkeypatch.setattr(fast_registration, "_DIGEST_CACHE_DIR", str(nebula_project / "digests"))
+    monkeypatch.setattr(fast_registration, "_RACY_WINDOW_NS", -(10**12))
+    ignore = IgnoreGroup(nebula_project, [GitIgnore, DockerIgnore, StandardIgnore])
+    digest = compute_digest(nebula_project, ignore.is_ignored)
+    assert os.listdir(nebula_project / "digests")
+    assert compute_digest(nebula_project, ignore.is_ignored) == digest
+
+
 def test_package_with_symlink(nebula_project, tmp_path):
     archive_fname = fast_package(source=nebula_project / "src", output_dir=tmp_path, deref_symlinks=True)
     with tarfile.open(archive_fname, dereference=True) as tar:
@@ -103,5 +126,61 @@ def test_digest_change(nebula_project):
     assert digest1 != digest2
 
 
+def test_digest_cache(nebula_project, monkeypatch, tmp_path_factory):
+    monkeypatch.setattr(fast_registration, "_DIGEST_CACHE_DIR", str(tmp_path_factory.mktemp("digests")))
+    monkeypatch.setattr(fast_registration, "_RACY_WINDOW_NS", -(10**12))
+    ignore = IgnoreGroup(nebula_project, [GitIgnore, DockerIgnore, StandardIgnore])
+    digest1 = compute_digest(nebula_project, ignore.is_ignored)
+
+    hashed = []
+    filehash_update = fast_registration._filehash_update
+    monkeypatch.setattr(
+        fast_registration, "_filehash_update", lambda path, hasher: (hashed.append(path), filehash_update(path, hasher))
+    )
+    assert compute_digest(nebula_project, ignore.is_ignored) == digest1
+    assert hashed == []
+
+    change_file = nebula_project / "src" / "workflows" / "hello_world.py"
+    change_file.write_text("print('I really do matter!')")
+    digest2 = compute_digest(nebula_project, ignore.is_ignored, max_workers=2)
+    assert hashed == [str(change_file)]
+    assert digest2 != digest1
+    assert digest2 == compute_digest(nebula_project, ignore.is_ignored, cache=False)
+
+
+def test_download_distribution_cache(nebula_project, tmp_path):
+    archive_fname = fast_package(source=nebula_project / "src", output_dir=tmp_path)
+    file_access = FileAccessProvider(
+        local_sandbox_dir=str(tmp_path / "sandbox"),
+        raw_output_prefix=str(tmp_path / "raw"),
+        data_config=DataConfig(shared_cache_dir=str(tmp_path / "cache")),
+    )
+    first, second = tmp_path / "first", tmp_path / "second"
+    (second / "workflows").mkdir(parents=True)
+    (second / "workflows" / "hello_world.py").write_text("print('stale')")
+    (second / "other.txt").write_text("untouched")
+    first.mkdir()
+
+    ctx = NebulaContextManager.current_context()
+    with NebulaContextManager.with_context(ctx.with_file_access(file_access)):
+        with mock.patch.object(
+            fast_registration, "_extract_distribution", wraps=fast_registration._extract_distribution
+        ) as extract:
+            download_distribution(archive_fname, str(first))
+            download_distribution(archive_fname, str(second))
+            # The distribution is extracted once, and copied out of the cache into both destinations
+            assert extract.call_count == 1
+
+    for destination in (first, second):
+        hello_world = destination / "workflows" / "hello_world.py"
+        assert not hello_world.is_symlink()
+        assert hello_world.read_text() == "print('Hello World!')"
+    # The copies are the task's own, changing one leaves the cache and the other copies alone
+    (first / "workflows" / "hello_world.py").write_text("print('changed')")
+    assert (second / "workflows" / "hello_world.py").read_text() == "print('Hello World!')"
+    assert len(os.listdir(tmp_path / "cache" / "entries")) == 1
+    assert (second / "other.txt").read_text() == "untouched"
+
+
 def test_get_additional_distribution_loc():
     assert get_additional_distribution_loc("s3://my-s3-bucket/dir", "123abc") == "s3://my-s3-bucket/dir/123abc.tar.gz"
@@ -1,13 +1,28 @@
+import collections
 import os
 import pathlib
 import tempfile
 
+import grpc
 import mock
 import pytest
 
 import nebulakit.configuration
+from nebulakit import LaunchPlan, task, workflow
 from nebulakit.configuration import DefaultImages, ImageConfig
-from nebulakit.tools.repo import find_common_root, load_packages_and_modules
+from nebulakit.exceptions.system import NebulaSystemException
+from nebulakit.models.core.identifier import ResourceType
+from nebulakit.tools.repo import (
+    _entity_id,
+    _is_transient,
+    find_common_root,
+    load_packages_and_modules,
+    register_entities,
+    registration_levels,
+)
+from nebulakit.tools.registration_manifest import RegistrationManifest
+from nebulakit.tools.serialize_helpers import _should_register_with_admin
+from nebulakit.tools.translator import get_serializable
 
 task_text = """
 from nebulakit import task
@@ -68,3 +83,129 @@ def test_module_loading(mock_entities, mock_entities_2):
 
         x = load_packages_and_modules(serialization_settings, pathlib.Path(root), [bottom_level])
         assert len(x) == 1
+
+
+@task
+def add_one(a: int) -> int:
+    return a + 1
+
+
+@workflow
+def inner(a: int) -> int:
+    return add_one(a=a)
+
+
+inner_lp = LaunchPlan.get_or_create(inner, "test_repo_inner_lp")
+
+
+@workflow
+def outer(a: int) -> int:
+    return inner_lp(a=add_one(a=a))
+
+
+def _registrable_entities(settings):
+    entities = collections.OrderedDict()
+    get_serializable(entities, settings, outer)
+    get_serializable(entities, settings, LaunchPlan.get_or_create(outer))
+    return [e for e in entities.values() if _should_register_with_admin(e)]
+
+
+@mock.patch("nebulakit.tools.repo._RETRY_BACKOFF", 0)
+def test_register_entities_by_level():
+    settings = nebulakit.configuration.SerializationSettings(
+        project="project",
+        domain="domain",
+        version="version",
+        env=None,
+        image_config=ImageConfig.auto(img_name=DefaultImages.default_image()),
+    )
+    entities = _registrable_entities(settings)
+    levels = [[_entity_id(e).resource_type for e in level] for level in registration_levels(entities)]
+    assert levels == [
+        [ResourceType.TASK],
+        [ResourceType.WORKFLOW],
+        [ResourceType.LAUNCH_PLAN],
+        [ResourceType.WORKFLOW],
+        [ResourceType.LAUNCH_PLAN],
+    ]
+
+    calls = collections.Counter()
+
+    def raw_register(cp_entity, settings, version, create_default_launchplan):
+        i = _entity_id(cp_entity)
+        calls[i.name] += 1
+        if i.name.endswith(".inner") and calls[i.name] == 1:
+            raise NebulaSystemException("unavailable") from _RpcError(grpc.StatusCode.UNAVAILABLE)
+        if i.name == "test_repo_inner_lp":
+            raise ValueError("invalid launch plan")
+        return i
+
+    remote = mock.MagicMock()
+    remote.raw_register.side_effect = raw_register
+    summary = register_entities(remote, entities, settings, "version", concurrency=4)
+    assert [i.resource_type for i in summary["registered"]] == [ResourceType.TASK, ResourceType.WORKFLOW]
+    assert [i.resource_type for i in summary["failed"]] == [
+        ResourceType.LAUNCH_PLAN,
+        ResourceType.WORKFLOW,
+        ResourceType.LAUNCH_PLAN,
+    ]
+    assert calls[summary["registered"][1].name] == 2
+    # Entities depending on a failed entity are not sent
+    assert sum(calls.values()) == 4
+
+
+class _RpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+def test_transient_registration_errors():
+    def _system_error(code):
+        try:
+            raise NebulaSystemException() from _RpcError(code)
+        except NebulaSystemException as e:
+            return e
+
+    assert _is_transient(_system_error(grpc.StatusCode.UNAVAILABLE))
+    assert _is_transient(_system_error(grpc.StatusCode.DEADLINE_EXCEEDED))
+    assert _is_transient(ConnectionResetError())
+    # Errors the backend would raise again are not retried
+    assert not _is_transient(_system_error(grpc.StatusCode.INTERNAL))
+    assert not _is_transient(_system_error(grpc.StatusCode.FAILED_PRECONDITION))
+    assert not _is_transient(NebulaSystemException())
+    assert not _is_transient(ValueError())
+
+
+def test_register_entities_skips_unchanged(tmp_path):
+    settings = nebulakit.configuration.SerializationSettings(
+        project="project",
+        domain="domain",
+        version="version",
+        env=None,
+        image_config=ImageConfig.auto(img_name=DefaultImages.default_image()),
+    )
+    entities = _registrable_entities(settings)
+    remote = mock.MagicMock()
+    remote.raw_register.side_effect = lambda cp_entity, *args, **kwargs: _entity_id(cp_entity)
+
+    manifest = RegistrationManifest("localhost:30080", settings, directory=str(tmp_path))
+    assert manifest.should_serialize(outer)
+    summary = register_entities(remote, entities, settings, "version", manifest=manifest)
+    assert len(summary["registered"]) == len(entities)
+    assert remote.raw_register.call_count == len(entities)
+
+    # The same specs are not sent again, and the module they come from is not serialized again
+    remote.raw_register.reset_mock()
+    manifest = RegistrationManifest("localhost:30080", settings, directory=str(tmp_path))
+    assert not manifest.should_serialize(outer)
+    summary = register_entities(remote, entities, settings, "version", manifest=manifest)
+    assert len(summary["skipped"]) == len(entities)
+    assert remote.raw_register.call_count == 0
+
+    # Other endpoints, projects, domains and versions have their own manifests
+    other = RegistrationManifest("localhost:30081", settings, directory=str(tmp_path))
+    assert other.should_serialize(outer)
+    assert not any(other.is_registered(e) for e in entities)
@@ -1,6 +1,14 @@
 import typing
 
-from nebulakit import task, workflow
+import mock
+import pytest
+
+from nebulakit import NebulaContextManager, task, workflow
+from nebulakit.core.data_persistence import FileAccessProvider
+from nebulakit.core.type_engine import TypeEngine
+from nebulakit.models.literals import Blob, BlobMetadata, Literal, LiteralCollection, Scalar
+from nebulakit.types.file import NebulaFile
+from nebulakit.types.iterator import NebulaIterator
 
 
 @task
@@ -21,3 +29,31 @@ def wf(a: int) -> typing.List[int]:
 
 def test_iterator():
     assert wf(a=4) == [0, 1, 2, 3]
+
+
+def test_iterator_read_ahead():
+    ctx = NebulaContextManager.current_context()
+    lt = TypeEngine.to_literal_type(NebulaFile)
+    lits = [
+        Literal(scalar=Scalar(blob=Blob(metadata=BlobMetadata(type=lt.blob), uri=f"s3://bucket/{i}.txt")))
+        for i in range(5)
+    ]
+    lv = Literal(collection=LiteralCollection(literals=lits))
+
+    with mock.patch.object(FileAccessProvider, "prefetch") as prefetch:
+        it = NebulaIterator(ctx, lv, typing.Iterator[NebulaFile], len(lits), read_ahead=2)
+        assert next(it).remote_source == "s3://bucket/0.txt"
+        # The next two elements are being downloaded in the background
+        assert sorted(it._prefetches.keys()) == [1, 2]
+        assert [next(it).remote_source for _ in range(4)] == [f"s3://bucket/{i}.txt" for i in range(1, 5)]
+        prefetched = sorted(list(c.args[0].keys())[0] for c in prefetch.call_args_list)
+        assert prefetched == [f"s3://bucket/{i}.txt" for i in range(5)]
+        with pytest.raises(StopIteration):
+            next(it)
+        assert it._executor is None
+
+        # Iterations that stop early release the read ahead when the iterator is closed
+        with NebulaIterator(ctx, lv, typing.Iterator[NebulaFile], len(lits), read_ahead=2) as it:
+            next(it)
+            assert it._executor is not None
+        assert it._executor is None and it._prefetches == {}
@@ -1,7 +1,12 @@
+import typing
+from unittest.mock import patch
+
+import fsspec
 import numpy as np
 from typing_extensions import Annotated
 
 from nebulakit import kwtypes, task, workflow
+from nebulakit.types.numpy.chunked import LazyArray, load_chunked, save_chunked
 
 
 @task
@@ -81,3 +86,80 @@ def wf():
 @workflow
 def test_wf():
     wf()
+
+
+def test_chunked_array(tmp_path):
+    arr = np.arange(1000, dtype=np.float32).reshape(100, 10)
+    for compression in (None, "zlib"):
+        path = str(tmp_path / f"arr-{compression}.npy")
+        save_chunked(path, arr, chunk_rows=16, compression=compression)
+        loaded = load_chunked(path, mmap_mode="r")
+        assert isinstance(loaded, np.memmap) == (compression is None)
+        np.testing.assert_array_equal(loaded, arr)
+
+        fs = fsspec.filesystem("file")
+        lazy = LazyArray(fs, path, max_cached_chunks=2)
+        assert lazy.shape == (100, 10) and lazy.dtype == np.float32 and len(lazy) == 100
+        with patch.object(fs, "cat_ranges", wraps=fs.cat_ranges) as cat_ranges:
+            np.testing.assert_array_equal(lazy[17], arr[17])
+            np.testing.assert_array_equal(lazy[20:40:3, 2], arr[20:40:3, 2])
+            # Only the blocks holding rows 16 to 47 were read
+            assert sum(len(c.args[0]) for c in cat_ranges.call_args_list) == 2
+            np.testing.assert_array_equal(lazy[-1], arr[-1])
+            np.testing.assert_array_equal(lazy[::-7], arr[::-7])
+            np.testing.assert_array_equal(lazy[[3, 99, 50, 3]], arr[[3, 99, 50, 3]])
+        np.testing.assert_array_equal(np.asarray(lazy), arr)
+
+    # Plain .npy files are read lazily too
+    path = str(tmp_path / "plain.npy")
+    np.save(path, arr)
+    np.testing.assert_array_equal(LazyArray(fsspec.filesystem("file"), path)[5:9], arr[5:9])
+    assert load_chunked(path) is None
+
+
+@task
+def generate_chunked() -> Annotated[np.ndarray, kwtypes(chunk_rows=4, compression="zlib")]:
+    return np.arange(30).reshape(10, 3)
+
+
+@task
+def sum_rows(array: Annotated[np.ndarray, kwtypes(lazy=True)]) -> int:
+    return int(array[2:5].sum())
+
+
+@workflow
+def chunked_wf() -> int:
+    return sum_rows(array=generate_chunked())
+
+
+def test_chunked_wf():
+    assert chunked_wf() == int(np.arange(30).reshape(10, 3)[2:5].sum())
+
+
+@task
+def generate_large() -> np.ndarray:
+    return np.arange(100)
+
+
+@task
+def read_copy(array: np.ndarray) -> int:
+    # Arrays are only memory mapped if requested, and can be modified without affecting the task's input
+    assert not isinstance(array, np.memmap)
+    array[0] = 100
+    return int(array.sum())
+
+
+@task
+def read_mmap(array: Annotated[np.ndarray, kwtypes(mmap_mode="r")]) -> int:
+    assert isinstance(array, np.memmap)
+    return int(array.sum())
+
+
+@workflow
+def mmap_wf() -> typing.Tuple[int, int]:
+    array = generate_large()
+    return read_copy(array=array), read_mmap(array=array)
+
+
+def test_mmap_mode():
+    assert mmap_wf() == (4950 + 100, 4950)